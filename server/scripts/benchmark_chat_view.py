@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark append cost and memory of the chat message view.
+
+Appends alternating user/assistant messages to the virtualized chat view
+(and optionally to the old single QTextEdit document) and reports, at a
+few message counts, the time per append (including the repaint) and the
+process's resident memory. Runs with the offscreen Qt platform unless
+another one is set.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QTextEdit
+from PyQt5.QtGui import QTextCursor
+from src.ui.chat_renderer import render_response
+from src.ui.widgets.chat_view import ChatMessageModel, ChatListView, ChatBubbleDelegate
+
+ANSWER = ("## Spaced repetition\n"
+          "Review material at **increasing intervals** so each review lands just before you forget.\n"
+          "- Day 1, 3, 7, 14\n- Use *active recall* instead of rereading\n"
+          "Message {n}.")
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def messages(count):
+    for n in range(count):
+        if n % 2 == 0:
+            yield ChatMessageModel.USER, f"How should I review chapter {n}?"
+        else:
+            yield ChatMessageModel.ASSISTANT, render_response(ANSWER.format(n=n))
+
+def run_view(app, total, checkpoints, window):
+    model = ChatMessageModel()
+    view = ChatListView()
+    delegate = ChatBubbleDelegate(view)
+    view.setItemDelegate(delegate)
+    view.setModel(model)
+    view.resize(700, 900)
+    view.show()
+    app.processEvents()
+
+    print(f"{'messages':>9} {'append ms':>10} {'rss MB':>8} {'docs':>6} {'doc MB':>7}")
+    source = messages(total + window)
+    for checkpoint in checkpoints:
+        # Fill up to the checkpoint, then time appends that each repaint
+        while model.rowCount() < checkpoint:
+            kind, html = next(source)
+            model.append_message(kind, html, "12:00")
+        app.processEvents()
+        start = time.perf_counter()
+        for _ in range(window):
+            kind, html = next(source)
+            model.append_message(kind, html, "12:00")
+            app.processEvents()
+        elapsed = (time.perf_counter() - start) / window * 1000
+        stats = delegate.documents.stats()
+        print(f"{checkpoint:>9} {elapsed:>10.3f} {rss_mb():>8.1f} {stats['entries']:>6} "
+              f"{stats['bytes'] / 1024 / 1024:>7.2f}")
+    view.close()
+
+def run_text_edit(app, total, checkpoints, window):
+    display = QTextEdit()
+    display.setReadOnly(True)
+    display.resize(700, 900)
+    display.show()
+    app.processEvents()
+
+    print(f"{'messages':>9} {'append ms':>10} {'rss MB':>8}")
+    source = messages(total + window)
+    count = 0
+
+    def append():
+        nonlocal count
+        _, html = next(source)
+        cursor = display.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertHtml(f"<div style='margin-bottom: 16px;'><div>{html}</div><div>12:00</div></div>")
+        display.verticalScrollBar().setValue(display.verticalScrollBar().maximum())
+        count += 1
+
+    for checkpoint in checkpoints:
+        while count < checkpoint:
+            append()
+        app.processEvents()
+        start = time.perf_counter()
+        for _ in range(window):
+            append()
+            app.processEvents()
+        elapsed = (time.perf_counter() - start) / window * 1000
+        print(f"{checkpoint:>9} {elapsed:>10.3f} {rss_mb():>8.1f}")
+    display.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the chat message view")
+    parser.add_argument('--messages', type=int, default=50000)
+    parser.add_argument('--window', type=int, default=100, help="Appends timed at each checkpoint")
+    parser.add_argument('--baseline', type=int, default=0,
+                        help="Also run the old QTextEdit display up to this many messages")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    checkpoints = [n for n in (10, 100, 1000, 10000, 50000) if n <= args.messages]
+
+    print(f"Virtualized chat view, {args.window} timed appends per checkpoint")
+    run_view(app, args.messages, checkpoints, args.window)
+
+    if args.baseline:
+        print(f"\nQTextEdit document (before)")
+        run_text_edit(app, args.baseline, [n for n in checkpoints if n <= args.baseline], args.window)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark build and query time of the notes index.
+
+Generates a synthetic corpus of notes with a Zipf-like vocabulary, then
+reports full build time, incremental update time and query latency
+percentiles with and without the latency budget.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.features.notes_index import NotesIndex
+
+def make_corpus(documents: int, words: int, vocabulary: int, seed: int):
+    rng = random.Random(seed)
+    terms = [f"term{i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    corpus = []
+    for i in range(documents):
+        paragraphs = []
+        remaining = words
+        while remaining > 0:
+            size = min(remaining, rng.randint(40, 90))
+            paragraphs.append(' '.join(rng.choices(terms, weights, k=size)))
+            remaining -= size
+        corpus.append((f"note-{i}.md", '\n\n'.join(paragraphs)))
+    return corpus, terms
+
+def percentile(samples, fraction):
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+def time_queries(index, queries, budget_ms):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, k=3, budget_ms=budget_ms)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the notes index")
+    parser.add_argument('--documents', type=int, default=10000)
+    parser.add_argument('--words', type=int, default=300, help="Words per document")
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--budget-ms', type=float, default=50)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    corpus, terms = make_corpus(args.documents, args.words, args.vocabulary, args.seed)
+    index = NotesIndex(notes_dir=os.devnull)
+
+    start = time.perf_counter()
+    for doc_id, text in corpus:
+        index.add_document(doc_id, text)
+    build_seconds = time.perf_counter() - start
+    stats = index.stats()
+    print(f"Built index over {stats['documents']} documents ({stats['passages']} passages, "
+          f"{stats['terms']} terms) in {build_seconds:.2f}s")
+
+    rng = random.Random(args.seed + 1)
+    samples = []
+    for doc_id, text in rng.sample(corpus, min(100, len(corpus))):
+        start = time.perf_counter()
+        index.add_document(doc_id, text + " edited")
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(f"Incremental update: p50={percentile(samples, 0.5):.2f} ms  p99={percentile(samples, 0.99):.2f} ms")
+
+    queries = [' '.join(rng.choices(terms[:2000], k=rng.randint(3, 12))) for _ in range(args.queries)]
+    for label, budget in (("unbudgeted", 1e9), (f"budget {args.budget_ms:g} ms", args.budget_ms)):
+        samples = time_queries(index, queries, budget)
+        print(f"Query ({label}): p50={percentile(samples, 0.5):.2f} ms  p99={percentile(samples, 0.99):.2f} ms  "
+              f"max={samples[-1]:.2f} ms")
+    print(f"Stats: {index.stats()}")
+
+if __name__ == "__main__":
+    main()
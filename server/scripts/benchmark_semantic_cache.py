@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark lookup latency and match quality of the semantic cache.
+
+Fills the cache with synthetic questions, then times lookups of rephrased
+questions (which should hit) and unrelated questions (which should miss),
+reporting latency percentiles, recall on rephrasings and false hits.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.semantic_cache import SemanticCache
+
+TEMPLATES = [
+    "what is {}",
+    "explain {} simply",
+    "can you explain {} please",
+    "tell me about {}",
+    "what's the meaning of {}",
+    "{} in simple terms",
+]
+
+def make_topic(rng, syllables):
+    return ' '.join(''.join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(rng.randint(1, 3)))
+
+def percentile(samples, fraction):
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+def time_lookups(cache, questions):
+    samples = []
+    hits = 0
+    for question in questions:
+        start = time.perf_counter()
+        if cache.get(question) is not None:
+            hits += 1
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples, hits
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the semantic cache")
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=2000)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    syllables = [a + b for a in "bcdfghklmnprstvz" for b in "aeiou"]
+    topics = list({make_topic(rng, syllables) for _ in range(args.entries * 2)})[:args.entries]
+    cache = SemanticCache(threshold=args.threshold, max_entries=args.entries)
+
+    start = time.perf_counter()
+    for topic in topics:
+        cache.set(rng.choice(TEMPLATES).format(topic), f"Answer about {topic}")
+    print(f"Inserted {len(cache)} entries in {time.perf_counter() - start:.2f}s")
+
+    rephrased = [rng.choice(TEMPLATES).format(topic) for topic in rng.sample(topics, args.lookups)]
+    known = set(topics)
+    fresh = (topic for topic in iter(lambda: make_topic(rng, syllables), None) if topic not in known)
+    unrelated = [rng.choice(TEMPLATES).format(next(fresh)) for _ in range(args.lookups)]
+
+    samples, hits = time_lookups(cache, rephrased)
+    print(f"Rephrased lookups: p50={percentile(samples, 0.5):.3f} ms  p99={percentile(samples, 0.99):.3f} ms  "
+          f"recall={hits / len(rephrased):.3f}")
+    samples, hits = time_lookups(cache, unrelated)
+    print(f"Unrelated lookups: p50={percentile(samples, 0.5):.3f} ms  p99={percentile(samples, 0.99):.3f} ms  "
+          f"false hits={hits}")
+    print(f"Stats: {cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory and reload cost of the chat session manager.
+
+Creates many sessions with full conversation histories, recorded through
+the same path as real exchanges (history plus on-disk transcript), then
+reports the traced memory per 1k resident sessions and the latency of
+spilling and lazily reloading a session. Shared singletons (transport,
+caches, health monitor) are created before tracing starts, so the figure
+covers per-session state only. All storage goes to a temporary directory.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+STORAGE_ROOT = tempfile.mkdtemp(prefix="sessions-")
+for setting in ('TRANSCRIPT_DIR', 'OFFLINE_STORAGE_DIR', 'RESPONSE_CACHE_DIR'):
+    os.environ.setdefault(setting, os.path.join(STORAGE_ROOT, setting.lower()))
+
+from src.features.chat_assistant import ChatAssistant
+from src.features.session_manager import ChatSessionManager
+
+QUESTION = "Can you explain how photosynthesis converts light energy into chemical energy? "
+ANSWER = "Photosynthesis happens in the chloroplasts. " * 12
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the chat session manager")
+    parser.add_argument('--sessions', type=int, default=5000)
+    parser.add_argument('--resident', type=int, default=1000)
+    parser.add_argument('--turns', type=int, default=30, help="Exchanges per session")
+    args = parser.parse_args()
+
+    storage_dir = os.path.join(STORAGE_ROOT, "sessions")
+    manager = ChatSessionManager(storage_dir=storage_dir, max_resident=args.resident, idle_timeout=3600)
+    # One-time setup of the shared singletons is not per-session memory
+    ChatAssistant("warm-up")
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for i in range(args.sessions):
+        assistant = manager.get(f"user-{i}")
+        for turn in range(args.turns):
+            assistant._record_exchange(f"{QUESTION}({turn})", ANSWER)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    resident = manager.stats()['resident']
+    per_thousand = (current - baseline) / max(resident, 1) * 1000 / (1024 * 1024)
+    print(f"Created {args.sessions} sessions x {args.turns} turns in {elapsed:.2f}s")
+    print(f"Resident sessions: {resident}  memory: {(current - baseline) / 1024 / 1024:.1f} MB "
+          f"({per_thousand:.1f} MB per 1k)  peak: {(peak - baseline) / 1024 / 1024:.1f} MB")
+
+    # Reload spilled sessions, which forces an equal number of spills
+    samples = []
+    for i in range(200):
+        start = time.perf_counter()
+        manager.get(f"user-{i}")
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(f"Lazy reload: p50={samples[len(samples) // 2]:.3f} ms  p99={samples[int(len(samples) * 0.99)]:.3f} ms")
+    print(f"Stats: {manager.stats()}")
+
+    shutil.rmtree(STORAGE_ROOT, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
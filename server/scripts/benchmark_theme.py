@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark theme switching and single-widget state changes.
+
+Builds the dashboard, scheduler, chat and settings pages in one window and
+times, per operation:
+
+* the old per-widget path: the window and every page rebuild their
+  stylesheets from the templates and call setStyleSheet() on themselves,
+  and a button state change re-applies its page's whole sheet;
+* the theme engine: one cached stylesheet applied to the window, and state
+  changes through set_state().
+
+Times include processing the resulting events. Runs with the offscreen Qt
+platform unless another one is set.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'src'))  # Some feature modules import from utils.*
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QStackedWidget
+from src.ui import theme
+from src.ui.styles import DARK_COLORS, LIGHT_COLORS, get_main_window_style
+from src.ui.widgets.dashboard import DashboardWidget
+from src.ui.widgets.scheduler import SchedulerWidget
+from src.ui.widgets.chat_assistant import ChatAssistantWidget
+from src.ui.widgets.settings import SettingsWidget
+import src.ui.widgets.dashboard as dashboard_module
+import src.ui.widgets.scheduler as scheduler_module
+import src.ui.widgets.chat_assistant as chat_module
+import src.ui.widgets.settings as settings_module
+
+def timed(app, operation, repeat):
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        operation(i)
+        app.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=20, help="Timed runs per operation")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    window = QWidget()
+    window.resize(1200, 800)
+    stack = QStackedWidget()
+    QVBoxLayout(window).addWidget(stack)
+    pages = [
+        (DashboardWidget(), dashboard_module.STYLESHEET),
+        (SchedulerWidget(), scheduler_module.STYLESHEET),
+        (ChatAssistantWidget(), chat_module.STYLESHEET),
+        (SettingsWidget(), settings_module.STYLESHEET)
+    ]
+    for page, _ in pages:
+        stack.addWidget(page)
+    stack.setCurrentIndex(2)
+    window.show()
+    app.processEvents()
+    button = pages[2][0].send_button
+    themes = ('light', 'dark')
+
+    # Old path: the window and every page format and set their own sheets
+    def legacy_toggle(i):
+        colors = DARK_COLORS if themes[i % 2] == 'dark' else LIGHT_COLORS
+        window.setStyleSheet(get_main_window_style(themes[i % 2]))
+        for page, template in pages:
+            page.setStyleSheet(template.format(**colors))
+    legacy_toggle_ms = timed(app, legacy_toggle, args.repeat)
+
+    def legacy_state(i):
+        button.setObjectName("sendButtonBusy" if i % 2 == 0 else "sendButton")
+        pages[2][0].setStyleSheet(chat_module.STYLESHEET.format(**DARK_COLORS))
+    legacy_state_ms = timed(app, legacy_state, args.repeat)
+    button.setObjectName("sendButton")
+
+    # Theme engine: one cached stylesheet on the window
+    for page, _ in pages:
+        page.setStyleSheet("")
+    theme.set_theme_root(window)
+    start = time.perf_counter()
+    for name in themes:
+        theme.compile_stylesheet(name)
+    compile_ms = (time.perf_counter() - start) * 1000 / len(themes)
+    engine_toggle_ms = timed(app, lambda i: theme.apply_theme(themes[i % 2]), args.repeat)
+    engine_state_ms = timed(app, lambda i: theme.set_state(button, 'busy', i % 2 == 0), args.repeat)
+
+    print(f"Median of {args.repeat} runs, {len(pages)} pages")
+    print(f"{'operation':<22}{'per-widget ms':>15}{'engine ms':>12}")
+    print(f"{'theme toggle':<22}{legacy_toggle_ms:>15.2f}{engine_toggle_ms:>12.2f}")
+    print(f"{'button state change':<22}{legacy_state_ms:>15.2f}{engine_state_ms:>12.2f}")
+    print(f"One-time compile per theme: {compile_ms:.2f} ms, "
+          f"{len(theme.compile_stylesheet('dark')):,} characters")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark chat-call latency with and without the pooled HTTP transport.
+
+Runs against the local mock API so numbers reflect connection handling
+rather than model latency. Prints p50/p99 for both modes.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import requests
+from scripts.mock_api import start_server
+from src.services.http_client import HTTPTransport
+
+PAYLOAD = {'message': 'What is spaced repetition?', 'context': {}, 'conversation_history': []}
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def run(label, post, url, iterations):
+    # Warm up so both modes start from the same state
+    for _ in range(5):
+        post(url, json=PAYLOAD, timeout=30)
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = post(url, json=PAYLOAD, timeout=30)
+        response.content
+        samples.append((time.perf_counter() - start) * 1000)
+
+    print(f"{label:<22} p50={percentile(samples, 50):7.3f} ms  "
+          f"p99={percentile(samples, 99):7.3f} ms  mean={statistics.mean(samples):7.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pooled HTTP transport")
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--url', help="Existing API base URL (defaults to an in-process mock)")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = start_server()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    chat_url = f"{base_url}/ai/chat"
+
+    print(f"Benchmarking {args.iterations} chat calls against {chat_url}")
+    run("requests.post (before)", requests.post, chat_url, args.iterations)
+
+    transport = HTTPTransport()
+    run("HTTPTransport (after)", transport.post, chat_url, args.iterations)
+    transport.close()
+
+    if server:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
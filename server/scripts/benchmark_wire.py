@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark upload bytes per chat turn for each wire mode.
+
+Plays a long conversation against the local mock API in every combination
+of compression and history deltas, and prints the request body size at a
+few turn counts. Plain JSON grows with the history until the history
+budget caps it; delta requests stay roughly constant.
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts.mock_api import start_server
+from src.features.conversation_history import ConversationHistory
+from src.services.chat_wire import ChatWireEncoder
+from src.services.http_client import HTTPTransport
+
+WORDS = ("memory recall practice interval review concept example problem chapter summary "
+         "definition theorem proof exercise formula method").split()
+
+MODES = [
+    ('json', '', False),
+    ('gzip', 'gzip', False),
+    ('delta', '', True),
+    ('gzip+delta', 'gzip', True),
+]
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def run(label, compression, delta, transport, chat_url, turns, checkpoints, seed):
+    rng = random.Random(seed)
+    history = ConversationHistory()
+    wire = ChatWireEncoder(compression=compression, compress_min_bytes=1024, delta=delta)
+    sizes = {}
+    for turn in range(1, turns + 1):
+        message = sentence(rng, 20)
+        payload = {'message': message, 'context': {}, 'conversation_history': history.to_payload()}
+        body, headers, revision = wire.encode(payload)
+        response = transport.post(chat_url, data=body, headers=headers, timeout=30)
+        if response.status_code == 409:
+            wire.reset()
+            body, headers, revision = wire.encode(payload, full=True)
+            response = transport.post(chat_url, data=body, headers=headers, timeout=30)
+        response.raise_for_status()
+        wire.acknowledge(revision, payload)
+        if turn in checkpoints:
+            sizes[turn] = len(body)
+        history.append(message, ' '.join(sentence(rng, 15) for _ in range(8)))
+
+    stats = wire.stats()
+    row = ''.join(f"{sizes[turn]:>9}" for turn in checkpoints)
+    print(f"{label:<12}{row}   total={stats['sent_bytes']:>8}  ratio={stats['ratio']:.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chat request upload size per wire mode")
+    parser.add_argument('--turns', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    server = start_server()
+    chat_url = f"http://127.0.0.1:{server.server_address[1]}/api/ai/chat"
+    transport = HTTPTransport()
+    checkpoints = sorted({1, 2, 5, 10, 20, args.turns} & set(range(1, args.turns + 1)))
+
+    print(f"Upload bytes per request over {args.turns} turns")
+    print(f"{'mode':<12}" + ''.join(f"{'turn ' + str(turn):>9}" for turn in checkpoints))
+    for label, compression, delta in MODES:
+        run(label, compression, delta, transport, chat_url, args.turns, checkpoints, args.seed)
+
+    transport.close()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
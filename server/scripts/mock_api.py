@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Next.js API used by benchmarks and manual testing.
+
+Implements GET /api/health and POST /api/ai/chat with the same response
+shape as the real routes, over HTTP/1.1 keep-alive. Chat requests with
+``"stream": true`` are answered as a chunked server-sent event stream.
+With a rate limit set, chat calls past it get HTTP 429 with Retry-After.
+
+Also implements the receiving side of the compact chat wire format (see
+``src/services/chat_wire.py``): gzip/deflate request bodies, and
+``conversation`` deltas rebuilt against the last few stored revisions of
+each conversation, with HTTP 409 for an unknown base revision.
+"""
+import argparse
+import gzip
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    """Request handler mimicking the Next.js API routes."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, the body
+    # waits for the client's delayed ACK (~40 ms) on a kept-alive connection
+    disable_nagle_algorithm = True
+    latency = 0.0
+    rate_limit = 0  # Chat calls allowed per second; 0 disables limiting
+    window = None  # [window start, calls in window, lock], set per server
+    conversations = None  # [OrderedDict of id -> {revision: (summary, turns)}, lock], set per server
+    max_conversations = 1000
+    revisions_kept = 8
+    summary_label = "Summary of earlier conversation"
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        encoding = (self.headers.get('Content-Encoding') or '').lower()
+        if raw and encoding == 'gzip':
+            raw = gzip.decompress(raw)
+        elif raw and encoding == 'deflate':
+            raw = zlib.decompress(raw)
+        return json.loads(raw.decode('utf-8')) if raw else {}
+
+    def _resolve_history(self, payload):
+        """Rebuild conversation_history from a conversation delta; None if the base is unknown."""
+        conversation = payload.pop('conversation', None)
+        if conversation is None:
+            return payload.get('conversation_history', [])
+
+        store, lock = self.conversations
+        with lock:
+            revisions = store.get(conversation['id'])
+            if conversation.get('base') is None:
+                summary, turns = [], []
+            elif revisions is not None and conversation['base'] in revisions:
+                summary, turns = revisions[conversation['base']]
+            else:
+                return None
+
+            summary_delta, turns_delta = conversation['summary'], conversation['turns']
+            summary = summary[summary_delta['drop']:] + summary_delta['append']
+            turns = turns[turns_delta['drop']:] + turns_delta['append']
+
+            if revisions is None:
+                revisions = store[conversation['id']] = OrderedDict()
+            store.move_to_end(conversation['id'])
+            revisions.pop(conversation['revision'], None)
+            revisions[conversation['revision']] = (summary, turns)
+            while len(revisions) > self.revisions_kept:
+                revisions.popitem(last=False)
+            while len(store) > self.max_conversations:
+                store.popitem(last=False)
+
+        history = list(turns)
+        if summary:
+            history.insert(0, {'human': self.summary_label, 'assistant': '\n'.join(summary)})
+        return history
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_event_stream(self, text):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        for index, word in enumerate(text.split(' ')):
+            event = json.dumps({'delta': word if index == 0 else ' ' + word})
+            self._write_chunk(f"data: {event}\n\n".encode('utf-8'))
+            if self.latency:
+                time.sleep(self.latency / 10)
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/api/health':
+            self._send_json(200, {'success': True, 'data': {'status': 'healthy'}})
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def _over_rate_limit(self):
+        if not self.rate_limit:
+            return False
+        with self.window[2]:
+            now = time.monotonic()
+            if now - self.window[0] >= 1:
+                self.window[0], self.window[1] = now, 0
+            self.window[1] += 1
+            return self.window[1] > self.rate_limit
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/api/ai/chat':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        if self._over_rate_limit():
+            self._read_json()
+            data = json.dumps({'success': False, 'error': 'Rate limit exceeded'}).encode('utf-8')
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Retry-After', '1')
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        payload = self._read_json()
+        history = self._resolve_history(payload)
+        if history is None:
+            self._send_json(409, {'success': False, 'error': 'Unknown conversation revision'})
+            return
+        payload['conversation_history'] = history
+
+        message = payload.get('message')
+        if not message:
+            self._send_json(400, {'error': 'Message is required'})
+            return
+
+        answer = f"Mock answer to: {message}"
+        if payload.get('stream'):
+            self._send_event_stream(answer)
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        self._send_json(200, {
+            'success': True,
+            'data': {
+                'message': answer,
+                'suggestions': ['Review your notes', 'Take a short break'],
+                'actionItems': [],
+                'confidence': 0.9,
+                'timestamp': datetime.now().isoformat()
+            }
+        })
+
+def start_server(host='127.0.0.1', port=0, latency=0.0, rate_limit=0):
+    """Start the mock API in a background thread and return the server."""
+    handler = type('ConfiguredMockAPIHandler', (MockAPIHandler,), {
+        'latency': latency,
+        'rate_limit': rate_limit,
+        'window': [time.monotonic(), 0, threading.Lock()],
+        'conversations': [OrderedDict(), threading.Lock()]
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the mock Study Helper API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3001)
+    parser.add_argument('--latency', type=float, default=0.0, help="Artificial delay per chat call (s)")
+    parser.add_argument('--rate-limit', type=int, default=0, help="Chat calls allowed per second (0 = unlimited)")
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, args.latency, args.rate_limit)
+    print(f"Mock API listening on http://{args.host}:{server.server_address[1]}/api")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,7 @@ class StudyHelperApp:
             from PyQt5.QtCore import Qt
             from ui.main_window import MainWindow
             from ui.auth_dialog import AuthDialog
+            from src.ui.stall_watchdog import get_stall_watchdog
             
             # Set High DPI scaling before creating QApplication
             QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
@@ -64,6 +65,10 @@ class StudyHelperApp:
             app.setApplicationName(self.config.APP_NAME)
             app.setApplicationVersion(self.config.VERSION)
             
+            # Watch the GUI thread for stalls from the login dialog onwards
+            if self.config.STALL_WATCHDOG_ENABLED:
+                get_stall_watchdog().start()
+            
             self.gui_app = app            # Show authentication dialog
             auth_dialog = AuthDialog()
             if auth_dialog.exec_() == auth_dialog.Accepted:
@@ -0,0 +1,220 @@
+"""
+Asyncio counterpart of the Chat Assistant.
+
+Wraps a ChatAssistant so many AI requests can be fanned out from one event
+loop. A semaphore bounds concurrent upstream calls, and every call runs on a
+small fixed worker pool sharing the pooled HTTP transport, instead of one
+thread per request.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, Awaitable, Callable, AsyncIterator, Iterable, Tuple, Union
+from src.features.chat_assistant import ChatAssistant
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class AsyncChatAssistant:
+    """Async chat assistant with bounded concurrency, cancellation and timeouts."""
+
+    def __init__(self, assistant: Optional[ChatAssistant] = None,
+                 max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize the async chat assistant.
+
+        Args:
+            assistant: ChatAssistant to wrap (a new one is created if omitted)
+            max_concurrency: Maximum number of upstream calls in flight
+            timeout: Default per-call timeout in seconds, counted from when the
+                call gets a concurrency slot
+        """
+        self.config = Config()
+        self.assistant = assistant or ChatAssistant()
+        self.max_concurrency = max_concurrency or self.config.AI_MAX_CONCURRENCY
+        self.timeout = timeout or self.config.API_TIMEOUT
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="ai-request"
+        )
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._loop = None
+        self._loop_thread = None
+
+        logger.info(f"Async Chat Assistant initialized (max_concurrency={self.max_concurrency})")
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _run(self, func: Callable, *args, timeout: Optional[float] = None,
+                   pass_deadline: bool = False, **kwargs) -> Any:
+        """
+        Run a blocking ChatAssistant call under the semaphore.
+
+        The timeout starts once the call has a slot, so calls queued behind
+        others are not timed out while waiting. With pass_deadline, func
+        also gets the matching deadline= so a call that times out stops
+        instead of running on in its worker. Cancelling the awaiting task
+        releases the slot immediately; the underlying HTTP call is still
+        bounded by the transport timeout. The call runs in a copy of the
+        caller's context, so a request priority set around the await
+        applies to it.
+        """
+        timeout = timeout or self.timeout
+        async with self._get_semaphore():
+            if pass_deadline:
+                kwargs['deadline'] = time.monotonic() + timeout
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(loop.run_in_executor(
+                self._executor, functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+            ), timeout)
+
+    async def get_response(self, message: str, context: Optional[Dict[str, Any]] = None,
+                           timeout: Optional[float] = None) -> str:
+        """
+        Get a response from the AI assistant.
+
+        The timeout is also passed on as the request deadline, so a call that
+        times out stops retrying and does not record its late reply.
+        """
+        return await self._run(self.assistant.get_response, message, context,
+                               timeout=timeout, pass_deadline=True)
+
+    async def get_detailed_response(self, message: str, context: Optional[Dict[str, Any]] = None,
+                                    timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Get a detailed response with suggestions and action items."""
+        return await self._run(self.assistant.get_detailed_response, message, context, timeout=timeout)
+
+    async def stream_response(self, message: str, context: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        Stream a response as text deltas without blocking the event loop.
+
+        If the consumer stops early or is cancelled, the worker closes the
+        upstream stream at the next chunk instead of reading it to the end.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def produce():
+            deltas = self.assistant.stream_response(message, context)
+            try:
+                for delta in deltas:
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, delta)
+            finally:
+                deltas.close()
+                if not stop.is_set():
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        async with self._get_semaphore():
+            producer = loop.run_in_executor(self._executor, contextvars.copy_context().run, produce)
+            try:
+                while True:
+                    delta = await queue.get()
+                    if delta is done:
+                        break
+                    yield delta
+                await producer
+            finally:
+                stop.set()
+
+    async def get_study_tips(self, subject: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        """Get study tips, optionally for a specific subject."""
+        return await self._run(self.assistant.get_study_tips, subject, timeout=timeout)
+
+    async def explain_concept(self, concept: str, subject: Optional[str] = None,
+                              timeout: Optional[float] = None) -> str:
+        """Explain a concept or topic."""
+        return await self._run(self.assistant.explain_concept, concept, subject, timeout=timeout)
+
+    async def generate_quiz_questions(self, topic: str, num_questions: int = 5,
+                                      timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Generate quiz questions on a topic."""
+        return await self._run(self.assistant.generate_quiz_questions, topic, num_questions, timeout=timeout)
+
+    async def generate_quiz_batch(self, topics: Iterable[Union[str, Tuple[str, int]]], num_questions: int = 5,
+                                  timeout: Optional[float] = None) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Generate quiz questions for many topics, yielding (topic, questions)
+        as each topic completes. Concurrency is bounded by the shared semaphore.
+        """
+        async def generate(topic, count):
+            try:
+                questions = await self._run(self.assistant._generate_validated_quiz, topic, count,
+                                            timeout=timeout, pass_deadline=True)
+            except Exception as e:
+                logger.error(f"Error generating quiz for {topic}: {e}")
+                questions = []
+            return topic, questions
+
+        jobs = [(topic, num_questions) if isinstance(topic, str) else tuple(topic) for topic in topics]
+        for next_done in asyncio.as_completed([generate(topic, count) for topic, count in jobs]):
+            yield await next_done
+
+    async def suggest_study_plan(self, subject: str, duration: str, level: str = "beginner",
+                                 timeout: Optional[float] = None) -> str:
+        """Suggest a study plan for a subject."""
+        return await self._run(self.assistant.suggest_study_plan, subject, duration, level, timeout=timeout)
+
+    async def get_motivation(self, current_mood: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        """Get motivational message for studying."""
+        return await self._run(self.assistant.get_motivation, current_mood, timeout=timeout)
+
+    async def ask_question(self, question: str, subject: Optional[str] = None,
+                           timeout: Optional[float] = None) -> str:
+        """Ask a general question to the AI."""
+        return await self._run(self.assistant.ask_question, question, subject, timeout=timeout)
+
+    async def get_history_summary(self, timeout: Optional[float] = None) -> str:
+        """Get a summary of the conversation history."""
+        return await self._run(self.assistant.get_history_summary, timeout=timeout)
+
+    def start(self):
+        """Start a dedicated event loop in a background thread for submit()."""
+        if self._loop is not None:
+            return
+
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="ai-event-loop", daemon=True
+        )
+        self._loop_thread.start()
+        logger.info("Async Chat Assistant event loop started")
+
+    def submit(self, coro: Awaitable) -> Future:
+        """
+        Schedule a coroutine on the background loop from any thread.
+
+        Returns a concurrent.futures.Future; call cancel() on it to cancel
+        the underlying task.
+        """
+        if self._loop is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def shutdown(self):
+        """Stop the background loop and the worker pool."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._loop_thread = None
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Async Chat Assistant shut down")
@@ -4,93 +4,476 @@ Uses Next.js AI API for all AI functionality.
 """
 import requests
 import json
-from typing import Optional, Dict, List, Any
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple, Union
+from src.features.conversation_history import ConversationHistory
+from src.features.notes_index import get_notes_index
+from src.features.offline_engine import get_offline_engine
+from src.features.quiz_parser import iter_streamed_questions, parse_quiz_questions
+from src.features.transcript_store import get_transcript_store
+from src.services.chat_wire import ChatWireEncoder
+from src.services.health_monitor import CircuitOpenError, get_health_monitor
+from src.services.http_client import get_transport
+from src.services.rate_limiter import DeadlineExceeded, get_rate_limiter
+from src.services.request_scheduler import BACKGROUND, RequestCancelled, get_request_scheduler
 from src.utils.config import Config
+from src.utils.prompt_budget import fit_prompt
+from src.utils.response_cache import ResponseCache, get_response_cache
+from src.utils.semantic_cache import get_semantic_cache
+from src.utils.single_flight import SingleFlight
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Identical chat requests in flight from any assistant share one upstream call
+chat_request_flights = SingleFlight()
+
 class ChatAssistant:
     """Chat assistant that uses the Next.js AI API."""
     
-    def __init__(self):
-        """Initialize the chat assistant."""
+    def __init__(self, session_id: Optional[str] = None):
+        """
+        Initialize the chat assistant.
+        
+        Args:
+            session_id: Optional id of the user/study session this assistant serves
+        """
         self.config = Config()
+        self.session_id = session_id
         self.api_base_url = getattr(self.config, 'NEXTJS_API_URL', 'http://localhost:3000/api')
-        self.conversation_history = []
-        self.max_history = 10  # Keep last 10 exchanges for context
+        self.history = ConversationHistory()
+        self.transport = get_transport()
+        self.wire = ChatWireEncoder()
+        self.rate_limiter = get_rate_limiter()
+        self.scheduler = get_request_scheduler()
+        self.response_cache = get_response_cache() if self.config.RESPONSE_CACHE_ENABLED else None
+        self.semantic_cache = get_semantic_cache() if self.config.SEMANTIC_CACHE_ENABLED else None
+        self.request_flights = chat_request_flights
+        self.health_monitor = get_health_monitor(self.api_base_url)
+        self.breaker = self.health_monitor.breaker
+        self.offline_engine = get_offline_engine(self.response_cache) if self.config.OFFLINE_FALLBACK_ENABLED else None
+        # Optional callable(message, context) -> Optional[str] used when the API is
+        # unreachable; None answers from the offline engine. Not set to a bound
+        # method by default, which would make every assistant a reference cycle.
+        self.fallback_handler = None
+        self.notes_index = get_notes_index() if self.config.NOTES_CONTEXT_ENABLED else None
+        self.transcript = None
+        if self.config.TRANSCRIPT_ENABLED:
+            self.transcript = get_transcript_store(session_id or 'default')
+            self._restore_history()
         
         logger.info("Chat Assistant initialized")
     
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """Exchanges currently kept verbatim, oldest first."""
+        return self.history.recent()
+    
     def is_available(self) -> bool:
-        """Check if the Next.js AI API is available."""
+        """Check if the Next.js AI API is available, using the cached health state."""
+        return self.health_monitor.is_healthy()
+    
+    def _post_chat(self, payload: Dict[str, Any], deadline: Optional[float] = None) -> requests.Response:
+        """
+        POST a chat payload to the Next.js AI API over the shared transport.
+        
+        Concurrent calls with the same payload, history included, share one
+        upstream request (and the deadline of whichever call started it).
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("AI backend circuit is open")
+        
+        flight_key = ResponseCache.make_key(
+            payload['message'], payload['context'], payload['conversation_history']
+        )
+        try:
+            return self.request_flights.do(flight_key, self._send_chat, payload, deadline)
+        finally:
+            self.breaker.release_trial()
+    
+    def _send_chat(self, payload: Dict[str, Any], deadline: Optional[float] = None) -> requests.Response:
+        """Send a chat payload upstream and read the body so waiters can share it."""
+        with self.scheduler.slot(deadline=deadline):
+            response = self._request_chat(payload, deadline)
+            response.content
+        return response
+    
+    def _request_chat(self, payload: Dict[str, Any], deadline: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        POST to the chat endpoint under the shared rate limit and feed the
+        outcome to the circuit breaker.
+        
+        Throttled responses (429/503) are retried with jittered backoff
+        until the retries or the deadline run out. The body is encoded by
+        self.wire, which may compress it or send only the history delta.
+        """
+        extra_headers = kwargs.pop('headers', {})
+        
+        def send(timeout, full=False):
+            body, headers, revision = self.wire.encode(payload, full=full)
+            response = self.transport.post(
+                f"{self.api_base_url}/ai/chat",
+                data=body,
+                headers={**headers, **extra_headers},
+                timeout=timeout,
+                **kwargs
+            )
+            if response.status_code == 409 and revision is not None and not full:
+                # The server lost our history; resend it whole
+                response.close()
+                self.wire.reset()
+                return send(timeout, full=True)
+            if response.status_code < 300:
+                self.wire.acknowledge(revision, payload)
+            return response
+        
         try:
-            response = requests.get(f"{self.api_base_url}/health", timeout=5)
-            return response.status_code == 200
-        except:
-            return True  # Assume available, will handle errors in requests
+            response = self.rate_limiter.call(send, deadline=deadline, timeout=30)
+        except DeadlineExceeded:
+            # Our own deadline, not a sign the backend is down
+            raise
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            self.breaker.record_failure()
+            raise
+        
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        elif response.status_code != 429:
+            # A 429 means the backend is up but busy; the rate limiter backs off
+            self.breaker.record_success()
+        return response
     
-    def get_response(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
+    def _unavailable_response(self, message: str, context: Optional[Dict[str, Any]] = None,
+                              default: str = "Sorry, my AI service is temporarily unavailable. Please try again in a moment.",
+                              record_history: bool = True) -> str:
+        """
+        Answer from the fallback handler, or explain that the AI is unavailable.
+        
+        Offline answers are not added to the history right away; the exchange
+        is queued and applied once the API answers again.
+        """
+        handler = self.fallback_handler
+        if handler is None and self.offline_engine is not None:
+            handler = self._offline_answer
+        if handler is not None:
+            try:
+                answer = handler(message, context)
+                if answer:
+                    if record_history and self.offline_engine is not None:
+                        self.offline_engine.queue(self.session_id, 'history', {'message': message, 'answer': answer})
+                    return answer
+            except Exception as e:
+                logger.error(f"Fallback handler error: {e}")
+        return default
+    
+    def _add_notes_context(self, message: str, context: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Add the notes passages most relevant to a message to the request context."""
+        if self.notes_index is None:
+            return context
+        try:
+            passages = self.notes_index.search(message)
+        except Exception as e:
+            logger.error(f"Error searching notes index: {e}")
+            return context
+        if not passages:
+            return context
+        
+        context = dict(context or {})
+        context['notes'] = [
+            {'source': os.path.basename(passage['source']), 'text': passage['text']}
+            for passage in passages
+        ]
+        return context
+    
+    def _build_payload(self, message: str, context: Optional[Dict[str, Any]] = None,
+                       include_history: bool = True) -> Dict[str, Any]:
+        """Build the request payload for the chat endpoint, trimmed to the prompt token budget."""
+        history = self.history.to_payload() if include_history else []
+        message, context, history, report = fit_prompt(message, context, history)
+        if report['dropped_notes'] or report['dropped_history'] or report['truncated_message']:
+            logger.info(f"Trimmed prompt to {report['tokens']}/{report['budget']} tokens: dropped "
+                        f"{report['dropped_history']} history entries, {report['dropped_notes']} notes"
+                        f"{', truncated message' if report['truncated_message'] else ''}")
+        return {
+            'message': message,
+            'context': context or {},
+            'conversation_history': history
+        }
+    
+    def _record_exchange(self, message: str, ai_response: str):
+        """Append an exchange to the conversation history, after any queued offline exchanges."""
+        if self.offline_engine is not None:
+            self._apply_offline_mutations()
+        self.history.append(message, ai_response)
+        if self.transcript is not None:
+            try:
+                self.transcript.append({'role': 'user', 'text': message})
+                self.transcript.append({'role': 'assistant', 'text': ai_response})
+            except OSError as e:
+                logger.error(f"Error writing chat transcript: {e}")
+    
+    def _restore_history(self):
+        """Seed the conversation history with the end of the saved transcript."""
+        records = self.transcript.tail(2 * self.history.max_turns)
+        pending_question = None
+        for record in records:
+            if record.get('role') == 'user':
+                pending_question = record.get('text', '')
+            elif record.get('role') == 'assistant' and pending_question is not None:
+                self.history.append(pending_question, record.get('text', ''))
+                pending_question = None
+    
+    def _apply_offline_mutations(self):
+        """Apply this session's mutations queued while the API was unreachable."""
+        for mutation in self.offline_engine.drain(self.session_id):
+            if mutation['kind'] == 'history':
+                self.history.append(mutation['data']['message'], mutation['data']['answer'])
+                if self.transcript is not None:
+                    self.transcript.append({'role': 'user', 'text': mutation['data']['message'],
+                                            'time': mutation['queued_at']})
+                    self.transcript.append({'role': 'assistant', 'text': mutation['data']['answer'],
+                                            'time': mutation['queued_at'], 'offline': True})
+    
+    def _remember_answer(self, message: str, ai_response: str, context: Optional[Dict[str, Any]] = None,
+                         shared: bool = False):
+        """
+        Keep an answer from the API so it can be served while offline.
+        
+        Answers given with this session's history are only served back to
+        it; shared ones (sent without history) may answer any session.
+        """
+        if self.offline_engine is not None:
+            self.offline_engine.record(message, ai_response, context,
+                                       None if shared else self.session_id or 'default')
+    
+    def _offline_answer(self, message: str, context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Answer from this session's and shared previous answers."""
+        return self.offline_engine.answer(message, context, self.session_id or 'default')
+    
+    def get_response(self, message: str, context: Optional[Dict[str, Any]] = None,
+                     use_cache: bool = False, record_history: bool = True,
+                     use_semantic_cache: bool = False, deadline: Optional[float] = None,
+                     include_history: bool = True) -> str:
         """
         Get a response from the AI assistant via Next.js API.
         
         Args:
             message: User's message
             context: Optional context information
+            use_cache: Serve and store the reply in the response cache. The
+                cache key leaves out history, so cached prompts are sent
+                without it and include_history is ignored.
+            record_history: Add the exchange to the conversation history
+            use_semantic_cache: Serve and store the reply in the near-duplicate
+                cache, so rephrasings of a question share one answer
+            deadline: Optional time.monotonic() value after which the request
+                is abandoned rather than queued or retried. A reply that only
+                arrives after it is returned but not recorded, since the
+                caller has given up on it.
+            include_history: Send the conversation history with the request
             
         Returns:
             AI response as string
         """
+        semantic_scope = None
+        if use_semantic_cache and self.semantic_cache is not None:
+            # Questions only match others asked with the same context
+            semantic_scope = ResponseCache.make_key('', context)
+            cached = self.semantic_cache.get(message, semantic_scope)
+            if cached is not None:
+                if record_history:
+                    self._record_exchange(message, cached)
+                logger.info(f"AI response served from semantic cache for message: {message[:50]}...")
+                return cached
+        
+        context = self._add_notes_context(message, context)
+        cache_key = None
+        if use_cache:
+            # A cached reply is shared by every session, so it must not see this one's history
+            include_history = False
+        if use_cache and self.response_cache is not None:
+            cache_key = ResponseCache.make_key(message, context)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                if record_history:
+                    self._record_exchange(message, cached)
+                logger.info(f"AI response served from cache for message: {message[:50]}...")
+                return cached
+        
         try:
             # Prepare the request payload
-            payload = {
-                'message': message,
-                'context': context or {},
-                'conversation_history': self.conversation_history[-self.max_history:]
-            }
+            payload = self._build_payload(message, context, include_history)
             
             # Make request to Next.js AI API
-            response = requests.post(
-                f"{self.api_base_url}/ai/chat",
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
+            response = self._post_chat(payload, deadline=deadline)
             
             if response.status_code == 200:
                 data = response.json()
                 if data.get('success'):
                     ai_response = data['data']['message']
                     
-                    # Update conversation history
-                    self.conversation_history.append({
-                        'human': message,
-                        'assistant': ai_response
-                    })
+                    # Update conversation history, unless the caller has gone
+                    if record_history and (deadline is None or time.monotonic() < deadline):
+                        self._record_exchange(message, ai_response)
                     
-                    # Keep history manageable
-                    if len(self.conversation_history) > self.max_history:
-                        self.conversation_history = self.conversation_history[-self.max_history:]
+                    if cache_key is not None:
+                        self.response_cache.set(cache_key, ai_response, prompt=message)
+                    if semantic_scope is not None:
+                        self.semantic_cache.set(message, ai_response, semantic_scope)
+                    self._remember_answer(message, ai_response, context, shared=not include_history)
                     
                     logger.info(f"AI response received for message: {message[:50]}...")
                     return ai_response
                 else:
                     logger.error(f"AI API error: {data.get('error', 'Unknown error')}")
                     return "Sorry, I encountered an error processing your request."
+            elif response.status_code == 429:
+                logger.error("AI API rate limit exceeded after retries")
+                return "Sorry, I'm receiving too many requests right now. Please try again in a moment."
             else:
                 logger.error(f"AI API returned status {response.status_code}: {response.text}")
                 return "Sorry, I'm having trouble connecting to my AI service. Please try again."
                 
+        except CircuitOpenError:
+            logger.warning("AI backend unavailable; failing fast")
+            return self._unavailable_response(message, context, record_history=record_history)
+        except RequestCancelled:
+            logger.info(f"AI request cancelled before sending: {message[:50]}...")
+            return ""
         except requests.exceptions.Timeout:
             logger.error("AI API request timeout")
-            return "Sorry, my response is taking too long. Please try a simpler question."
+            return self._unavailable_response(
+                message, context, "Sorry, my response is taking too long. Please try a simpler question.",
+                record_history and (deadline is None or time.monotonic() < deadline))
         except requests.exceptions.ConnectionError:
             logger.error("Cannot connect to AI API")
-            return "Sorry, I'm having trouble connecting to my AI service. Please check your internet connection."
+            return self._unavailable_response(
+                message, context,
+                "Sorry, I'm having trouble connecting to my AI service. Please check your internet connection.",
+                record_history)
         except Exception as e:
             logger.error(f"Error getting AI response: {e}")
             return "Sorry, I encountered an unexpected error. Please try again."
     
+    def stream_response(self, message: str, context: Optional[Dict[str, Any]] = None,
+                        deadline: Optional[float] = None) -> Iterator[str]:
+        """
+        Stream a response from the AI assistant as text deltas.
+        
+        Asks the API for a server-sent event stream. If the API answers with
+        a regular JSON body instead, the full message is yielded as one delta.
+        
+        Args:
+            message: User's message
+            context: Optional context information
+            deadline: Optional time.monotonic() value after which the request
+                is abandoned rather than queued or retried
+            
+        Yields:
+            Text deltas in arrival order
+        """
+        if not self.breaker.allow_request():
+            logger.warning("AI backend unavailable; failing fast")
+            yield self._unavailable_response(message, context)
+            return
+        
+        parts = []
+        try:
+            payload = self._build_payload(message, self._add_notes_context(message, context))
+            payload['stream'] = True
+            
+            # Hold the request slot until the stream is fully consumed
+            with self.scheduler.slot(deadline=deadline):
+                response = self._request_chat(
+                    payload,
+                    deadline,
+                    headers={'Accept': 'text/event-stream'},
+                    stream=True
+                )
+            
+                with response:
+                    if response.status_code != 200:
+                        logger.error(f"AI API returned status {response.status_code}: {response.text}")
+                        yield "Sorry, I'm having trouble connecting to my AI service. Please try again."
+                        return
+                
+                    content_type = response.headers.get('Content-Type', '')
+                    if 'text/event-stream' not in content_type:
+                        # Server does not stream; deliver the whole message at once
+                        data = response.json()
+                        if data.get('success'):
+                            ai_response = data['data']['message']
+                            yield ai_response
+                            # Record only once the consumer has taken the reply
+                            self._record_exchange(message, ai_response)
+                            self._remember_answer(message, ai_response, context)
+                        else:
+                            logger.error(f"AI API error: {data.get('error', 'Unknown error')}")
+                            yield "Sorry, I encountered an error processing your request."
+                        return
+                
+                    for event in self._iter_sse_events(response):
+                        if event.get('error'):
+                            logger.error(f"AI API stream error: {event['error']}")
+                            if not parts:
+                                yield "Sorry, I encountered an error processing your request."
+                            return
+                        delta = event.get('delta')
+                        if delta:
+                            parts.append(delta)
+                            yield delta
+                        if event.get('done'):
+                            break
+                
+                    self._record_exchange(message, ''.join(parts))
+                    self._remember_answer(message, ''.join(parts), context)
+                    logger.info(f"AI response streamed for message: {message[:50]}...")
+                
+        except requests.exceptions.Timeout:
+            logger.error("AI API request timeout")
+            apology = "Sorry, my response is taking too long. Please try a simpler question."
+            yield apology if parts else self._unavailable_response(message, context, apology)
+        except requests.exceptions.ConnectionError:
+            logger.error("Cannot connect to AI API")
+            apology = "Sorry, I'm having trouble connecting to my AI service. Please check your internet connection."
+            yield apology if parts else self._unavailable_response(message, context, apology)
+        except Exception as e:
+            logger.error(f"Error streaming AI response: {e}")
+            yield "Sorry, I encountered an unexpected error. Please try again."
+        finally:
+            self.breaker.release_trial()
+    
+    def _iter_sse_events(self, response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """Parse server-sent events into JSON objects."""
+        data_lines = []
+        for line in response.iter_lines(decode_unicode=True):
+            if line is None:
+                continue
+            if line.startswith('data:'):
+                data_lines.append(line[5:].lstrip())
+                continue
+            if line or not data_lines:
+                # Comments, event names and ids carry nothing we need
+                continue
+            
+            data = '\n'.join(data_lines)
+            data_lines = []
+            if data == '[DONE]':
+                return
+            try:
+                yield json.loads(data)
+            except json.JSONDecodeError:
+                # Plain-text events are treated as raw deltas
+                yield {'delta': data}
+        
+        if data_lines and data_lines != ['[DONE]']:
+            try:
+                yield json.loads('\n'.join(data_lines))
+            except json.JSONDecodeError:
+                yield {'delta': '\n'.join(data_lines)}
+    
     def get_detailed_response(self, message: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Get a detailed response with suggestions and action items.
@@ -103,18 +486,9 @@ class ChatAssistant:
             Dictionary with message, suggestions, action_items, etc.
         """
         try:
-            payload = {
-                'message': message,
-                'context': context or {},
-                'conversation_history': self.conversation_history[-self.max_history:]
-            }
+            payload = self._build_payload(message, context)
             
-            response = requests.post(
-                f"{self.api_base_url}/ai/chat",
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
+            response = self._post_chat(payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -122,13 +496,8 @@ class ChatAssistant:
                     ai_data = data['data']
                     
                     # Update conversation history
-                    self.conversation_history.append({
-                        'human': message,
-                        'assistant': ai_data['message']
-                    })
-                    
-                    if len(self.conversation_history) > self.max_history:
-                        self.conversation_history = self.conversation_history[-self.max_history:]
+                    self._record_exchange(message, ai_data['message'])
+                    self._remember_answer(message, ai_data['message'], context)
                     
                     return {
                         'message': ai_data.get('message', ''),
@@ -152,6 +521,14 @@ class ChatAssistant:
                     'confidence': 0.0
                 }
                 
+        except CircuitOpenError:
+            logger.warning("AI backend unavailable; failing fast")
+            return {
+                'message': self._unavailable_response(message, context),
+                'suggestions': [],
+                'action_items': [],
+                'confidence': 0.0
+            }
         except Exception as e:
             logger.error(f"Error getting detailed AI response: {e}")
             return {
@@ -161,56 +538,117 @@ class ChatAssistant:
                 'confidence': 0.0
             }
     
-    def get_study_tips(self, subject: Optional[str] = None) -> str:
-        """Get study tips, optionally for a specific subject."""
+    def get_study_tips(self, subject: Optional[str] = None, history_dependent: bool = False) -> str:
+        """
+        Get study tips, optionally for a specific subject.
+        
+        Replies are cached unless history_dependent is set, which forces a
+        fresh answer that can take the conversation into account.
+        """
         prompt = "Please provide 5 effective study tips"
         if subject:
             prompt += f" specifically for studying {subject}"
         prompt += ". Keep the response practical and actionable."
         
-        return self.get_response(prompt, {'request_type': 'study_tips', 'subject': subject})
+        return self.get_response(prompt, {'request_type': 'study_tips', 'subject': subject},
+                                 use_cache=not history_dependent)
     
-    def explain_concept(self, concept: str, subject: Optional[str] = None) -> str:
-        """Explain a concept or topic."""
+    def explain_concept(self, concept: str, subject: Optional[str] = None,
+                        history_dependent: bool = False) -> str:
+        """Explain a concept or topic (cached unless history_dependent)."""
         prompt = f"Please explain the concept of '{concept}' in simple terms"
         if subject:
             prompt += f" in the context of {subject}"
         prompt += ". Include key points and examples if helpful."
         
         context = {'request_type': 'concept_explanation', 'concept': concept, 'subject': subject}
-        return self.get_response(prompt, context)
+        return self.get_response(prompt, context, use_cache=not history_dependent)
     
-    def generate_quiz_questions(self, topic: str, num_questions: int = 5) -> List[Dict[str, Any]]:
-        """Generate quiz questions on a topic."""
+    def _quiz_request(self, topic: str, num_questions: int):
+        """Build the prompt and context for a quiz generation request."""
         prompt = f"Generate {num_questions} multiple choice questions about {topic}. " + \
                 "Return them in JSON format with this structure: " + \
                 '[{"question": "...", "options": ["A", "B", "C", "D"], "correct": 0, "explanation": "..."}]'
         
+        context = {
+            'request_type': 'quiz_generation',
+            'topic': topic,
+            'num_questions': num_questions
+        }
+        
+        return prompt, context
+    
+    def generate_quiz_questions(self, topic: str, num_questions: int = 5) -> List[Dict[str, Any]]:
+        """Generate quiz questions on a topic."""
         try:
-            response = self.get_response(prompt, {
-                'request_type': 'quiz_generation',
-                'topic': topic,
-                'num_questions': num_questions
-            })
+            response = self.get_response(*self._quiz_request(topic, num_questions))
             
-            # Try to parse JSON response
-            if response.startswith('[') and response.endswith(']'):
-                return json.loads(response)
-            else:
-                # Fallback: return raw response as a single question
-                return [{
-                    'question': response,
-                    'options': [],
-                    'correct': -1,
-                    'explanation': 'Raw AI response'
-                }]
+            questions = parse_quiz_questions(response)
+            if questions:
+                return questions
+            
+            # Fallback: return raw response as a single question
+            return [{
+                'question': response,
+                'options': [],
+                'correct': -1,
+                'explanation': 'Raw AI response'
+            }]
                 
         except Exception as e:
             logger.error(f"Error generating quiz: {e}")
             return []
     
-    def suggest_study_plan(self, subject: str, duration: str, level: str = "beginner") -> str:
-        """Suggest a study plan for a subject."""
+    def stream_quiz_questions(self, topic: str, num_questions: int = 5) -> Iterator[Dict[str, Any]]:
+        """
+        Stream quiz questions on a topic.
+        
+        Yields each validated question as soon as its JSON object is complete,
+        so the first question can be shown while the rest are generated.
+        """
+        return iter_streamed_questions(self.stream_response(*self._quiz_request(topic, num_questions)))
+    
+    def _generate_validated_quiz(self, topic: str, num_questions: int,
+                                 deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Generate validated questions for one batch topic, as background work without touching history."""
+        with self.scheduler.priority(BACKGROUND):
+            response = self.get_response(*self._quiz_request(topic, num_questions), record_history=False,
+                                         deadline=deadline)
+        return parse_quiz_questions(response)
+    
+    def generate_quiz_batch(self, topics: Iterable[Union[str, Tuple[str, int]]], num_questions: int = 5,
+                            max_concurrency: Optional[int] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Generate quiz questions for many topics concurrently.
+        
+        Args:
+            topics: Topic names, or (topic, num_questions) pairs
+            num_questions: Questions per topic when not given per topic
+            max_concurrency: Maximum requests in flight (defaults to AI_MAX_CONCURRENCY)
+            
+        Yields:
+            (topic, questions) as each topic completes, with only validated
+            questions. Batch requests are not added to the conversation history.
+        """
+        jobs = [(topic, num_questions) if isinstance(topic, str) else tuple(topic) for topic in topics]
+        if not jobs:
+            return
+        
+        workers = min(max_concurrency or self.config.AI_MAX_CONCURRENCY, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quiz-batch") as executor:
+            futures = {executor.submit(self._generate_validated_quiz, topic, count): topic for topic, count in jobs}
+            for future in as_completed(futures):
+                topic = futures[future]
+                try:
+                    questions = future.result()
+                except Exception as e:
+                    logger.error(f"Error generating quiz for {topic}: {e}")
+                    questions = []
+                logger.info(f"Quiz batch: {len(questions)} questions for {topic}")
+                yield topic, questions
+    
+    def _study_plan_request(self, subject: str, duration: str, level: str):
+        """Build the prompt and context for a study plan request."""
         prompt = f"Create a detailed study plan for learning {subject} over {duration}. " + \
                 f"The student is at {level} level. Include specific topics, time allocation, " + \
                 "and study strategies."
@@ -222,37 +660,138 @@ class ChatAssistant:
             'level': level
         }
         
-        return self.get_response(prompt, context)
+        return prompt, context
+    
+    def suggest_study_plan(self, subject: str, duration: str, level: str = "beginner",
+                           history_dependent: bool = False) -> str:
+        """Suggest a study plan for a subject (cached unless history_dependent)."""
+        return self.get_response(*self._study_plan_request(subject, duration, level),
+                                 use_cache=not history_dependent)
     
-    def get_motivation(self, current_mood: Optional[str] = None) -> str:
-        """Get motivational message for studying."""
+    def stream_study_plan(self, subject: str, duration: str, level: str = "beginner") -> Iterator[str]:
+        """Stream a study plan for a subject as text deltas."""
+        return self.stream_response(*self._study_plan_request(subject, duration, level))
+    
+    def get_motivation(self, current_mood: Optional[str] = None, history_dependent: bool = False) -> str:
+        """Get motivational message for studying (cached unless history_dependent)."""
         prompt = "Provide a short, encouraging message to motivate someone to study"
         if current_mood:
             prompt += f". The person is feeling {current_mood}"
         prompt += ". Make it personal and uplifting."
         
-        return self.get_response(prompt, {'request_type': 'motivation', 'mood': current_mood})
+        return self.get_response(prompt, {'request_type': 'motivation', 'mood': current_mood},
+                                 use_cache=not history_dependent)
+    
+    def prefetch_response(self, message: str, context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Fetch a reply speculatively as background work.
+        
+        The request is sent without the conversation history, so the reply
+        cannot go stale as the conversation moves on before it is shown.
+        Nothing is recorded; use accept_prefetched() if the reply is shown.
+        
+        Returns:
+            The reply, or None if the request failed
+        """
+        try:
+            with self.scheduler.priority(BACKGROUND):
+                payload = self._build_payload(message, self._add_notes_context(message, context),
+                                              include_history=False)
+                response = self._post_chat(payload)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('success'):
+                    return data['data']['message']
+        except RequestCancelled:
+            logger.info(f"Prefetch dropped for interactive work: {message[:50]}...")
+        except Exception as e:
+            logger.warning(f"Prefetch failed for message: {message[:50]}...: {e}")
+        return None
+    
+    def accept_prefetched(self, message: str, ai_response: str, context: Optional[Dict[str, Any]] = None):
+        """Record a prefetched reply that was shown to the user."""
+        self._record_exchange(message, ai_response)
+        self._remember_answer(message, ai_response, context, shared=True)
     
     def ask_question(self, question: str, subject: Optional[str] = None) -> str:
         """Ask a general question to the AI."""
         context = {'request_type': 'general_question', 'subject': subject}
-        return self.get_response(question, context)
+        return self.get_response(question, context, use_semantic_cache=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request metrics for the response caches, coalescing and backend health."""
+        return {
+            'cache': self.response_cache.stats() if self.response_cache is not None else None,
+            'semantic_cache': self.semantic_cache.stats() if self.semantic_cache is not None else None,
+            'offline': self.offline_engine.stats() if self.offline_engine is not None else None,
+            'rate_limit': self.rate_limiter.stats(),
+            'scheduler': self.scheduler.stats(),
+            'coalescing': self.request_flights.stats(),
+            'wire': self.wire.stats(),
+            'health': self.health_monitor.status()
+        }
+    
+    def export_state(self) -> Dict[str, Any]:
+        """Serialize per-session state so the assistant can be restored later."""
+        return {
+            'session_id': self.session_id,
+            'history': self.history.to_dict()
+        }
+    
+    def load_state(self, state: Dict[str, Any]):
+        """Restore per-session state produced by export_state()."""
+        self.session_id = state.get('session_id', self.session_id)
+        self.history.load_dict(state.get('history', {}))
     
     def clear_history(self):
-        """Clear conversation history."""
-        self.conversation_history = []
+        """Clear conversation history, its saved transcript and exchanges queued while offline."""
+        if self.offline_engine is not None:
+            self.offline_engine.drain(self.session_id)
+        self.history.clear()
+        self.clear_transcript()
         logger.info("Conversation history cleared")
     
+    def get_transcript(self, count: Optional[int] = None, before: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Read saved transcript messages, oldest first.
+        
+        Args:
+            count: Number of messages (defaults to TRANSCRIPT_RESTORE_MESSAGES)
+            before: Only messages with a lower sequence number, for scrolling back
+            
+        Returns:
+            Records with 'seq', 'role' ('user' or 'assistant'), 'text' and 'time'
+        """
+        if self.transcript is None:
+            return []
+        count = count or self.config.TRANSCRIPT_RESTORE_MESSAGES
+        if before is None:
+            return self.transcript.tail(count)
+        return self.transcript.read(before - count, before)
+    
+    def clear_transcript(self):
+        """Hide the saved transcript; its space is reclaimed in the background."""
+        if self.transcript is not None:
+            self.transcript.truncate()
+    
     def get_history_summary(self) -> str:
         """Get a summary of the conversation history."""
-        if not self.conversation_history:
+        if not self.history:
             return "No conversation history available."
         
-        summary_prompt = "Summarize the following conversation history in 2-3 sentences:\n"
-        for exchange in self.conversation_history:
-            summary_prompt += f"Human: {exchange['human']}\nAI: {exchange['assistant']}\n\n"
+        # The history goes in the prompt itself, newest exchanges first within the budget
+        instruction = "Summarize the following conversation history in 2-3 sentences:\n"
+        context = {'request_type': 'history_summary'}
+        _, _, exchanges, _ = fit_prompt(instruction, context, self.history.to_payload())
+        summary_prompt = instruction
+        for exchange in exchanges:
+            if exchange['human'] == self.history.SUMMARY_LABEL:
+                summary_prompt += f"Earlier conversation (condensed):\n{exchange['assistant']}\n\n"
+            else:
+                summary_prompt += f"Human: {exchange['human']}\nAI: {exchange['assistant']}\n\n"
         
-        return self.get_response(summary_prompt, {'request_type': 'history_summary'})
+        with self.scheduler.priority(BACKGROUND):
+            return self.get_response(summary_prompt, context, record_history=False, include_history=False)
 
 # Global instance
 chat_assistant = ChatAssistant()
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Token-budgeted conversation history for the Chat Assistant.
+
+Recent exchanges are kept verbatim in a bounded ring buffer. Once the buffer
+exceeds its turn limit or token budget, the oldest exchanges are folded into
+a rolling summary, so the history sent upstream stays the same size however
+long a study session runs.
+"""
+import re
+import threading
+from collections import deque
+from typing import Optional, Dict, List, Any, Callable
+from src.utils.config import Config
+from src.utils.token_estimator import estimate_tokens
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+def summarize_exchange(human: str, assistant: str, max_chars: int = 160) -> str:
+    """Condense one exchange into a single summary line without an API call."""
+    def first_sentence(text):
+        text = ' '.join(text.split())
+        sentence = _SENTENCE_END.split(text, 1)[0]
+        if len(sentence) > max_chars:
+            sentence = sentence[:max_chars - 3].rstrip() + '...'
+        return sentence
+
+    return f"Student asked: {first_sentence(human)} Assistant: {first_sentence(assistant)}"
+
+class ConversationHistory:
+    """Bounded ring buffer of exchanges plus an incrementally maintained summary."""
+
+    SUMMARY_LABEL = "Summary of earlier conversation"
+
+    def __init__(self, max_turns: Optional[int] = None, token_budget: Optional[int] = None,
+                 summary_token_budget: Optional[int] = None,
+                 summarizer: Optional[Callable[[str, str], str]] = None):
+        """
+        Initialize the conversation history.
+
+        Args:
+            max_turns: Maximum exchanges kept verbatim
+            token_budget: Maximum estimated tokens across verbatim exchanges
+            summary_token_budget: Maximum estimated tokens in the rolling summary
+            summarizer: Callable turning (human, assistant) into a summary line
+        """
+        config = Config()
+        self.max_turns = max_turns or config.HISTORY_MAX_TURNS
+        self.token_budget = token_budget or config.HISTORY_TOKEN_BUDGET
+        self.summary_token_budget = summary_token_budget or config.HISTORY_SUMMARY_TOKENS
+        self.summarizer = summarizer or summarize_exchange
+
+        self._turns = deque()
+        self._turn_tokens = 0
+        self._summary_lines = deque()
+        self._summary_tokens = 0
+        self.folded_turns = 0
+        self._lock = threading.RLock()
+
+    def append(self, human: str, assistant: str):
+        """Add an exchange, folding the oldest ones into the summary if over budget."""
+        tokens = estimate_tokens(human) + estimate_tokens(assistant)
+        with self._lock:
+            self._turns.append({'human': human, 'assistant': assistant, 'tokens': tokens})
+            self._turn_tokens += tokens
+
+            # Always keep the newest exchange verbatim
+            while len(self._turns) > 1 and (len(self._turns) > self.max_turns or
+                                            self._turn_tokens > self.token_budget):
+                self._fold(self._turns.popleft())
+
+    def _fold(self, turn: Dict[str, Any]):
+        """Fold one exchange into the rolling summary."""
+        self._turn_tokens -= turn['tokens']
+        line = self.summarizer(turn['human'], turn['assistant'])
+        line_tokens = estimate_tokens(line)
+        self._summary_lines.append((line, line_tokens))
+        self._summary_tokens += line_tokens
+        self.folded_turns += 1
+
+        # The summary is a rolling window too; drop its oldest lines first
+        while len(self._summary_lines) > 1 and self._summary_tokens > self.summary_token_budget:
+            _, dropped_tokens = self._summary_lines.popleft()
+            self._summary_tokens -= dropped_tokens
+
+    @property
+    def summary(self) -> str:
+        """Rolling summary of exchanges no longer kept verbatim."""
+        with self._lock:
+            return '\n'.join(line for line, _ in self._summary_lines)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """Get the most recent verbatim exchanges, oldest first."""
+        with self._lock:
+            turns = list(self._turns)
+        if limit is not None:
+            turns = turns[-limit:] if limit > 0 else []
+        return [{'human': turn['human'], 'assistant': turn['assistant']} for turn in turns]
+
+    def to_payload(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Get the history to send upstream.
+
+        The rolling summary, if any, is sent as a leading synthetic exchange so
+        the existing API contract (a list of human/assistant pairs) still holds.
+        """
+        with self._lock:
+            summary = self.summary
+            history = self.recent(limit)
+        if summary:
+            history.insert(0, {'human': self.SUMMARY_LABEL, 'assistant': summary})
+        return history
+
+    def estimated_tokens(self) -> int:
+        """Estimated tokens of everything to_payload() would send."""
+        with self._lock:
+            return self._turn_tokens + self._summary_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the history for persistence."""
+        with self._lock:
+            return {
+                'turns': self.recent(),
+                'summary': [line for line, _ in self._summary_lines],
+                'folded_turns': self.folded_turns
+            }
+
+    def load_dict(self, data: Dict[str, Any]):
+        """Replace the history with previously serialized state."""
+        with self._lock:
+            self.clear()
+            for line in data.get('summary', []):
+                line_tokens = estimate_tokens(line)
+                self._summary_lines.append((line, line_tokens))
+                self._summary_tokens += line_tokens
+            for turn in data.get('turns', []):
+                self.append(turn['human'], turn['assistant'])
+            self.folded_turns = data.get('folded_turns', self.folded_turns)
+
+    def clear(self):
+        """Remove all exchanges and the summary."""
+        with self._lock:
+            self._turns.clear()
+            self._turn_tokens = 0
+            self._summary_lines.clear()
+            self._summary_tokens = 0
+            self.folded_turns = 0
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def __bool__(self) -> bool:
+        return bool(self._turns) or bool(self._summary_lines)
@@ -0,0 +1,308 @@
+"""
+Local notes index for retrieval-augmented chat context.
+
+Notes (plain text, Markdown and PDF text) are split into short passages and
+indexed in an in-memory inverted index scored with BM25. The index updates
+incrementally: only files whose size or modification time changed are
+re-read, and deleted files are dropped. Queries return the top-k passages
+within a latency budget so the chat assistant can send targeted snippets
+instead of whole documents.
+"""
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Optional, Dict, List, Any, Iterable
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+logger = get_logger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have how i if in into is it its
+me my of on or so than that the their them then there these they this to was we were
+what when where which who why will with you your
+""".split())
+
+TEXT_EXTENSIONS = ('.txt', '.md', '.markdown')
+PDF_EXTENSIONS = ('.pdf',)
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into indexable terms, dropping stopwords."""
+    return [term for term in _TOKEN.findall(text.lower()) if term not in STOPWORDS]
+
+def split_passages(text: str, passage_words: int) -> List[str]:
+    """
+    Split text into passages of roughly passage_words words.
+
+    Paragraphs are kept together where possible; paragraphs longer than a
+    passage are split on word boundaries.
+    """
+    passages = []
+    current = []
+    current_words = 0
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        words = paragraph.split()
+        if not words:
+            continue
+        if current_words and current_words + len(words) > passage_words:
+            passages.append(' '.join(current))
+            current, current_words = [], 0
+        while len(words) > passage_words:
+            passages.append(' '.join(words[:passage_words]))
+            words = words[passage_words:]
+        current.extend(words)
+        current_words += len(words)
+    if current:
+        passages.append(' '.join(current))
+    return passages
+
+def read_note(path: str) -> Optional[str]:
+    """Read the text of a notes file, or None if it cannot be read."""
+    try:
+        if path.lower().endswith(PDF_EXTENSIONS):
+            if PdfReader is None:
+                logger.warning(f"pypdf is not installed; skipping {path}")
+                return None
+            reader = PdfReader(path)
+            return '\n\n'.join(page.extract_text() or '' for page in reader.pages)
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+    except Exception as e:
+        logger.error(f"Error reading note {path}: {e}")
+        return None
+
+class NotesIndex:
+    """Incrementally updated BM25 index over note passages."""
+
+    def __init__(self, notes_dir: Optional[str] = None, passage_words: Optional[int] = None,
+                 k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize the notes index.
+
+        Args:
+            notes_dir: Directory scanned by sync()
+            passage_words: Approximate words per indexed passage
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.config = Config()
+        self.notes_dir = notes_dir or self.config.NOTES_DIR
+        self.passage_words = passage_words or self.config.NOTES_PASSAGE_WORDS
+        self.k1 = k1
+        self.b = b
+
+        self._postings = {}  # term -> {passage_id: term frequency}
+        self._passages = {}  # passage_id -> (doc_id, text, length)
+        self._documents = {}  # doc_id -> (signature, [passage_id, ...])
+        self._total_length = 0
+        self._next_id = 0
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._stats = {
+            'queries': 0,
+            'budget_exceeded': 0,
+            'documents_indexed': 0
+        }
+
+    def add_document(self, doc_id: str, text: str, signature: Any = None):
+        """Index a document, replacing any previous version with the same id."""
+        passages = [(passage, Counter(tokenize(passage))) for passage in split_passages(text, self.passage_words)]
+        with self._lock:
+            self._remove(doc_id)
+            passage_ids = []
+            for passage, counts in passages:
+                passage_id = self._next_id
+                self._next_id += 1
+                length = sum(counts.values())
+                self._passages[passage_id] = (doc_id, passage, length)
+                self._total_length += length
+                for term, count in counts.items():
+                    self._postings.setdefault(term, {})[passage_id] = count
+                passage_ids.append(passage_id)
+            self._documents[doc_id] = (signature, passage_ids)
+            self._stats['documents_indexed'] += 1
+
+    def remove_document(self, doc_id: str):
+        """Drop a document and its passages from the index."""
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        entry = self._documents.pop(doc_id, None)
+        if entry is None:
+            return
+        for passage_id in entry[1]:
+            _, passage, length = self._passages.pop(passage_id)
+            self._total_length -= length
+            for term in set(tokenize(passage)):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(passage_id, None)
+                    if not postings:
+                        del self._postings[term]
+
+    def sync(self, notes_dir: Optional[str] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with the notes directory.
+
+        Only new or changed files are re-read; files that disappeared are
+        removed.
+
+        Returns:
+            Counts of added/updated and removed documents
+        """
+        root = notes_dir or self.notes_dir
+        seen = set()
+        updated = 0
+        for path in self._iter_note_files(root):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            seen.add(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            with self._lock:
+                entry = self._documents.get(path)
+            if entry is not None and entry[0] == signature:
+                continue
+            text = read_note(path)
+            if text is not None:
+                self.add_document(path, text, signature)
+                updated += 1
+
+        with self._lock:
+            removed = [doc_id for doc_id in self._documents if doc_id.startswith(root) and doc_id not in seen]
+            for doc_id in removed:
+                self._remove(doc_id)
+
+        if updated or removed:
+            logger.info(f"Notes index synced: {updated} updated, {len(removed)} removed")
+        return {'updated': updated, 'removed': len(removed)}
+
+    def _iter_note_files(self, root: str) -> Iterable[str]:
+        if not os.path.isdir(root):
+            return
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+            for filename in filenames:
+                if filename.lower().endswith(TEXT_EXTENSIONS + PDF_EXTENSIONS):
+                    yield os.path.join(dirpath, filename)
+
+    def search(self, query: str, k: Optional[int] = None,
+               budget_ms: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Find the passages most relevant to a query.
+
+        Terms are scored rarest first; if the latency budget runs out, the
+        remaining common terms are skipped and the best passages found so
+        far are returned.
+
+        Args:
+            query: Search text, e.g. the user's chat message
+            k: Number of passages to return
+            budget_ms: Latency budget in milliseconds
+
+        Returns:
+            Passages with their source document and BM25 score, best first
+        """
+        k = k or self.config.NOTES_TOP_K
+        budget_ms = budget_ms if budget_ms is not None else self.config.NOTES_QUERY_BUDGET_MS
+        deadline = time.perf_counter() + budget_ms / 1000
+        terms = set(tokenize(query))
+
+        with self._lock:
+            self._stats['queries'] += 1
+            count = len(self._passages)
+            if not count or not terms:
+                return []
+            average_length = self._total_length / count
+
+            weighted = []
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings:
+                    df = len(postings)
+                    weighted.append((math.log(1 + (count - df + 0.5) / (df + 0.5)), postings))
+            weighted.sort(key=lambda item: item[0], reverse=True)
+
+            scores = {}
+            for idf, postings in weighted:
+                if time.perf_counter() > deadline:
+                    self._stats['budget_exceeded'] += 1
+                    break
+                for passage_id, tf in postings.items():
+                    length = self._passages[passage_id][2]
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                    scores[passage_id] = scores.get(passage_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [
+                {
+                    'source': self._passages[passage_id][0],
+                    'text': self._passages[passage_id][1],
+                    'score': round(score, 4)
+                }
+                for passage_id, score in best
+            ]
+
+    def _run(self, interval: float):
+        while not self._stop_event.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f"Error syncing notes index: {e}")
+            self._stop_event.wait(interval)
+
+    def start(self, interval: Optional[float] = None):
+        """Sync now and keep re-syncing changed files in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval or self.config.NOTES_SCAN_INTERVAL,),
+                                        name="notes-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop background syncing."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index size and query counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['documents'] = len(self._documents)
+            stats['passages'] = len(self._passages)
+            stats['terms'] = len(self._postings)
+        return stats
+
+_notes_index = None
+_notes_index_lock = threading.Lock()
+
+def get_notes_index() -> NotesIndex:
+    """Get the shared notes index, starting background sync on first use."""
+    global _notes_index
+    if _notes_index is None:
+        with _notes_index_lock:
+            if _notes_index is None:
+                _notes_index = NotesIndex()
+                _notes_index.start()
+    return _notes_index
@@ -0,0 +1,253 @@
+"""
+Offline answer engine for when the AI API is unreachable.
+
+Every answer received from the API is kept in a local log and indexed with
+the same BM25 index used for notes. When the API cannot be reached, the
+closest previous answer (from that log or the on-disk response cache) is
+served in milliseconds, clearly marked as offline. Answers given with a
+session's conversation history are only served back to that session;
+history-independent answers, like response cache entries, are shared. Changes that would
+normally happen alongside an answer, such as adding the exchange to the
+conversation history, are queued and applied once the API is back.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, List, Any
+from src.features.notes_index import NotesIndex, tokenize
+from src.utils.config import Config
+from src.utils.logger import get_logger
+from src.utils.response_cache import ResponseCache
+from src.utils.semantic_cache import normalize_question
+
+logger = get_logger(__name__)
+
+OFFLINE_NOTICE = "📴 Offline answer: I can't reach my AI service right now, so here is the closest answer I gave before."
+
+# Request types whose answers are too specific to be served for another prompt
+UNINDEXED_REQUEST_TYPES = frozenset({'quiz_generation', 'history_summary'})
+
+class OfflineAnswerEngine:
+    """Serves previous answers while offline and queues deferred mutations."""
+
+    def __init__(self, storage_dir: Optional[str] = None, max_answers: Optional[int] = None,
+                 min_coverage: Optional[float] = None):
+        """
+        Initialize the offline engine.
+
+        Args:
+            storage_dir: Directory for the answer log and the pending mutation queue
+            max_answers: Maximum previous answers kept and indexed
+            min_coverage: Fraction of the question's terms a match must contain
+        """
+        self.config = Config()
+        self.storage_dir = storage_dir or self.config.OFFLINE_STORAGE_DIR
+        self.max_answers = max_answers or self.config.OFFLINE_MAX_ANSWERS
+        self.min_coverage = min_coverage if min_coverage is not None else self.config.OFFLINE_MIN_COVERAGE
+        self.answers_path = os.path.join(self.storage_dir, "answers.jsonl")
+        self.pending_path = os.path.join(self.storage_dir, "pending.jsonl")
+
+        self.index = NotesIndex(notes_dir=self.storage_dir, passage_words=400)
+        self._answers = {}  # doc_id -> (question, answer, session), oldest first; session None is shared
+        self._pending = deque()
+        self._log_lines = 0
+        self._lock = threading.RLock()
+        self._stats = {
+            'recorded': 0,
+            'served': 0,
+            'unanswered': 0,
+            'queued': 0,
+            'synced': 0
+        }
+
+        os.makedirs(self.storage_dir, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def _doc_id(question: str, session: Optional[str] = None) -> str:
+        key = ' '.join(question.lower().split())
+        if session is not None:
+            key = f"{session}\n{key}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        """Load the answer log and pending mutations from disk."""
+        entries = []
+        if os.path.exists(self.answers_path):
+            with open(self.answers_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._log_lines += 1
+                    try:
+                        entry = json.loads(line)
+                        # Logs from before answers were scoped belong to the default session
+                        entries.append((entry['question'], entry['answer'], entry.get('session', 'default')))
+                    except (ValueError, KeyError):
+                        continue
+        for question, answer, session in entries[-self.max_answers:]:
+            self._index(question, answer, session)
+
+        if os.path.exists(self.pending_path):
+            with open(self.pending_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._pending.append(json.loads(line))
+                    except ValueError:
+                        continue
+
+        if self._answers or self._pending:
+            logger.info(f"Offline engine loaded {len(self._answers)} answers, {len(self._pending)} pending mutations")
+
+    def load_response_cache(self, response_cache: ResponseCache):
+        """Index cached responses that were stored with their prompt."""
+        count = 0
+        for prompt, value in response_cache.iter_entries():
+            with self._lock:
+                if self._doc_id(prompt) not in self._answers:
+                    self._index(prompt, value)
+                    count += 1
+        if count:
+            logger.info(f"Offline engine indexed {count} cached responses")
+
+    def _index(self, question: str, answer: str, session: Optional[str] = None):
+        doc_id = self._doc_id(question, session)
+        self._answers.pop(doc_id, None)
+        self._answers[doc_id] = (question, answer, session)
+        # The question is repeated so it weighs more than the answer text
+        self.index.add_document(doc_id, f"{question}\n\n{question}\n\n{answer}")
+        while len(self._answers) > self.max_answers:
+            oldest = next(iter(self._answers))
+            del self._answers[oldest]
+            self.index.remove_document(oldest)
+
+    def record(self, question: str, answer: str, context: Optional[Dict[str, Any]] = None,
+               session: Optional[str] = None):
+        """
+        Keep an answer received from the API for offline use.
+
+        Args:
+            question: Prompt the answer was given for
+            answer: Answer text
+            context: Request context; some request types are never kept
+            session: Session whose history shaped the answer, which is then
+                only served to that session; None shares it with every session
+        """
+        if (context or {}).get('request_type') in UNINDEXED_REQUEST_TYPES:
+            return
+        with self._lock:
+            self._index(question, answer, session)
+            self._stats['recorded'] += 1
+            try:
+                with open(self.answers_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'question': question, 'answer': answer, 'session': session,
+                                        'time': time.time()}) + '\n')
+                self._log_lines += 1
+                if self._log_lines > 2 * self.max_answers:
+                    self._compact_log()
+            except OSError as e:
+                logger.error(f"Error writing offline answer log: {e}")
+
+    def _compact_log(self):
+        """Rewrite the answer log with only the answers still kept."""
+        tmp_path = f"{self.answers_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for question, answer, session in self._answers.values():
+                f.write(json.dumps({'question': question, 'answer': answer, 'session': session}) + '\n')
+        os.replace(tmp_path, self.answers_path)
+        self._log_lines = len(self._answers)
+
+    def find(self, message: str, session: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Find the shared or session answer best matching a message, or None."""
+        # Phrasing words like "explain" should not count against a match
+        terms = set(tokenize(normalize_question(message)))
+        if not terms:
+            return None
+        with self._lock:
+            checked = 0
+            for match in self.index.search(message, k=20):
+                entry = self._answers.get(match['source'])
+                if entry is None or entry[2] not in (None, session):
+                    continue
+                checked += 1
+                if checked > 3:
+                    break
+                question, answer, _ = entry
+                coverage = len(terms & set(tokenize(question))) / len(terms)
+                if coverage >= self.min_coverage:
+                    return {'question': question, 'answer': answer, 'score': match['score'], 'coverage': coverage}
+        return None
+
+    def answer(self, message: str, context: Optional[Dict[str, Any]] = None,
+               session: Optional[str] = None) -> Optional[str]:
+        """
+        Answer a message from previous answers, marked as offline.
+
+        Usable as ChatAssistant.fallback_handler. Only shared answers and
+        those recorded for session are considered. Returns None when nothing
+        close enough has been answered before.
+        """
+        match = self.find(message, session)
+        with self._lock:
+            self._stats['served' if match else 'unanswered'] += 1
+        if match is None:
+            return None
+        logger.info(f"Serving offline answer for message: {message[:50]}...")
+        return f"{OFFLINE_NOTICE}\n\n{match['answer']}"
+
+    def queue(self, session_id: Optional[str], kind: str, data: Dict[str, Any]):
+        """Queue a mutation to apply once the API is reachable again."""
+        mutation = {'session_id': session_id, 'kind': kind, 'data': data, 'queued_at': time.time()}
+        with self._lock:
+            self._pending.append(mutation)
+            self._stats['queued'] += 1
+            try:
+                with open(self.pending_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(mutation) + '\n')
+            except OSError as e:
+                logger.error(f"Error writing offline queue: {e}")
+
+    def drain(self, session_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Remove and return a session's queued mutations, oldest first."""
+        with self._lock:
+            if not any(mutation['session_id'] == session_id for mutation in self._pending):
+                return []
+            drained = [mutation for mutation in self._pending if mutation['session_id'] == session_id]
+            self._pending = deque(mutation for mutation in self._pending if mutation['session_id'] != session_id)
+            self._stats['synced'] += len(drained)
+            self._rewrite_pending()
+        return drained
+
+    def _rewrite_pending(self):
+        tmp_path = f"{self.pending_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for mutation in self._pending:
+                    f.write(json.dumps(mutation) + '\n')
+            os.replace(tmp_path, self.pending_path)
+        except OSError as e:
+            logger.error(f"Error writing offline queue: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get answer/queue sizes and serve counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['answers'] = len(self._answers)
+            stats['pending'] = len(self._pending)
+        return stats
+
+_offline_engine = None
+_offline_engine_lock = threading.Lock()
+
+def get_offline_engine(response_cache: Optional[ResponseCache] = None) -> OfflineAnswerEngine:
+    """Get the shared offline engine, indexing the response cache in the background on first use."""
+    global _offline_engine
+    if _offline_engine is None:
+        with _offline_engine_lock:
+            if _offline_engine is None:
+                _offline_engine = OfflineAnswerEngine()
+                if response_cache is not None:
+                    threading.Thread(target=_offline_engine.load_response_cache, args=(response_cache,),
+                                     name="offline-engine-load", daemon=True).start()
+    return _offline_engine
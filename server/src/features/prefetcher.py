@@ -0,0 +1,130 @@
+"""
+Speculative prefetch of answers to suggested prompts.
+
+While the user is idle, the chat widget asks the prefetcher to fetch
+answers for the suggestions and quick actions on screen. Requests run one
+at a time as background work, within a requests-per-minute budget, and
+results are kept for a short TTL so a click renders instantly. Hit rate and
+the share of prefetched answers that expire unused are tracked. Every
+prefetch is a real AI call, so it is off unless PREFETCH_ENABLED is set.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Iterable
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class SuggestionPrefetcher:
+    """Budgeted background prefetcher with a short-TTL answer cache."""
+
+    def __init__(self, assistant, ttl: Optional[float] = None, max_per_minute: Optional[int] = None):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            assistant: ChatAssistant used to fetch answers
+            ttl: Seconds a prefetched answer stays usable
+            max_per_minute: Maximum prefetch requests sent per minute
+        """
+        self.config = Config()
+        self.assistant = assistant
+        self.ttl = ttl or self.config.PREFETCH_TTL
+        self.max_per_minute = max_per_minute or self.config.PREFETCH_MAX_PER_MINUTE
+
+        self._answers = {}  # message -> (fetched_at, answer)
+        self._pending = set()
+        self._sent = deque()  # Send times within the last minute
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = {
+            'requested': 0,
+            'fetched': 0,
+            'failed': 0,
+            'budget_skipped': 0,
+            'hits': 0,
+            'misses': 0,
+            'wasted': 0
+        }
+
+    def _expire(self, now: float):
+        for message, (fetched_at, _) in list(self._answers.items()):
+            if now - fetched_at > self.ttl:
+                del self._answers[message]
+                self._stats['wasted'] += 1
+
+    def _take_budget(self, now: float) -> bool:
+        while self._sent and now - self._sent[0] > 60:
+            self._sent.popleft()
+        if len(self._sent) >= self.max_per_minute:
+            return False
+        self._sent.append(now)
+        return True
+
+    def prefetch(self, messages: Iterable[str]):
+        """Queue messages whose answers are not already cached or being fetched."""
+        with self._lock:
+            self._expire(time.monotonic())
+            for message in messages:
+                if message in self._answers or message in self._pending:
+                    continue
+                self._pending.add(message)
+                self._queue.put(message)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="suggestion-prefetch", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                message = self._queue.get(timeout=5)
+            except queue.Empty:
+                # Producers put under the lock, so nothing can be queued after this check
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+
+            with self._lock:
+                allowed = self._take_budget(time.monotonic())
+                if not allowed:
+                    # Out of budget: drop the rest, the next idle period retries them
+                    self._stats['budget_skipped'] += 1 + self._queue.qsize()
+                    self._pending.clear()
+                    while not self._queue.empty():
+                        self._queue.get_nowait()
+                    continue
+                self._stats['requested'] += 1
+
+            answer = self.assistant.prefetch_response(message)
+            with self._lock:
+                self._pending.discard(message)
+                if answer is None:
+                    self._stats['failed'] += 1
+                else:
+                    self._answers[message] = (time.monotonic(), answer)
+                    self._stats['fetched'] += 1
+
+    def take(self, message: str) -> Optional[str]:
+        """Remove and return a fresh prefetched answer, or None on a miss."""
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._answers.pop(message, None)
+            self._stats['hits' if entry else 'misses'] += 1
+        return entry[1] if entry else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get prefetch counters with hit rate and wasted-request ratio."""
+        with self._lock:
+            self._expire(time.monotonic())
+            stats = dict(self._stats)
+            stats['cached'] = len(self._answers)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['waste_ratio'] = stats['wasted'] / stats['fetched'] if stats['fetched'] else 0.0
+        return stats
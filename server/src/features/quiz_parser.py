@@ -0,0 +1,104 @@
+"""
+Parsing and validation of AI-generated quiz questions.
+"""
+from typing import Optional, Dict, List, Any, Iterable, Iterator
+from src.utils.json_extract import IncrementalJSONExtractor, extract_json, iter_json_objects, strip_code_fences
+
+# Wrapper keys models use around a question array
+QUESTION_LIST_KEYS = ('questions', 'quiz', 'items')
+
+def validate_question(item: Any) -> Optional[Dict[str, Any]]:
+    """
+    Normalize a quiz question object, or return None if it is unusable.
+
+    Accepts common variations in key names, options given as a letter-keyed
+    dict, and the correct answer given as an index, a letter or the option text.
+    """
+    if not isinstance(item, dict):
+        return None
+
+    question = item.get('question') or item.get('prompt')
+    if not isinstance(question, str) or not question.strip():
+        return None
+
+    options = item.get('options') or item.get('choices')
+    if isinstance(options, dict):
+        options = [options[key] for key in sorted(options)]
+    if not isinstance(options, list) or len(options) < 2:
+        return None
+    options = [str(option).strip() for option in options]
+
+    correct = item.get('correct')
+    if correct is None:
+        correct = item.get('answer', item.get('correct_answer', item.get('correctIndex')))
+
+    if isinstance(correct, str):
+        answer = correct.strip()
+        if answer.isdigit():
+            correct = int(answer)
+        elif len(answer) == 1 and answer.isalpha():
+            correct = ord(answer.upper()) - ord('A')
+        elif answer in options:
+            correct = options.index(answer)
+        else:
+            return None
+
+    if isinstance(correct, bool) or not isinstance(correct, int) or not 0 <= correct < len(options):
+        return None
+
+    explanation = item.get('explanation', '')
+    return {
+        'question': question.strip(),
+        'options': options,
+        'correct': correct,
+        'explanation': explanation.strip() if isinstance(explanation, str) else ''
+    }
+
+def _question_list(value: Any) -> Optional[List[Any]]:
+    """Get the list of question candidates from an array or a wrapper object."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        for key in QUESTION_LIST_KEYS:
+            if isinstance(value.get(key), list):
+                return value[key]
+    return None
+
+def parse_quiz_questions(text: str) -> List[Dict[str, Any]]:
+    """
+    Extract validated quiz questions from an AI response.
+
+    Handles code fences, surrounding prose, trailing text and truncated
+    output. Invalid question objects are dropped.
+    """
+    items = _question_list(extract_json(text))
+    if not items:
+        # Partial or malformed JSON: salvage every object that did close
+        items = []
+        for value in iter_json_objects(strip_code_fences(text)):
+            nested = _question_list(value)
+            if nested is not None:
+                items.extend(nested)
+            else:
+                items.append(value)
+
+    questions = []
+    for item in items:
+        question = validate_question(item)
+        if question is not None:
+            questions.append(question)
+    return questions
+
+def iter_streamed_questions(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield validated quiz questions from a streamed response as each one closes.
+
+    Accepts a bare array or one wrapped in an object, with surrounding prose.
+    Each chunk is scanned once, so parse cost stays linear in the response.
+    """
+    extractor = IncrementalJSONExtractor(keys=QUESTION_LIST_KEYS)
+    for chunk in chunks:
+        for _, item in extractor.feed(chunk):
+            question = validate_question(item)
+            if question is not None:
+                yield question
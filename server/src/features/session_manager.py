@@ -0,0 +1,180 @@
+"""
+Multi-session manager for the Chat Assistant.
+
+Hands out one ChatAssistant per user/study session. At most
+SESSION_MAX_RESIDENT sessions are kept in memory; least recently used and
+idle sessions are spilled to disk as JSON and reloaded lazily on access.
+
+Memory ceiling: a resident session holds at most HISTORY_TOKEN_BUDGET +
+HISTORY_SUMMARY_TOKENS estimated tokens of text (about 7 KB with the
+defaults), about 3 KB of fixed object overhead (the assistant, its history
+records and transcript handle) and 8 bytes per transcript message for the
+segment index. With default budgets and transcripts of a few hundred
+messages the ceiling is about 11 MB per 1k resident sessions;
+scripts/benchmark_sessions.py measures 10.0 MB per 1k with full histories
+recorded through the transcript. Spilled sessions hold no memory once
+dropped, since assistants are not part of reference cycles.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable
+from src.features.chat_assistant import ChatAssistant
+from src.features.transcript_store import get_transcript_store
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class ChatSessionManager:
+    """LRU/idle-time bounded pool of per-session chat assistants."""
+
+    def __init__(self, storage_dir: Optional[str] = None, max_resident: Optional[int] = None,
+                 idle_timeout: Optional[float] = None,
+                 assistant_factory: Callable[[str], ChatAssistant] = ChatAssistant):
+        """
+        Initialize the session manager.
+
+        Args:
+            storage_dir: Directory that spilled sessions are written to
+            max_resident: Maximum number of sessions kept in memory
+            idle_timeout: Seconds of inactivity before a session is spilled
+            assistant_factory: Callable creating an assistant for a session id
+        """
+        self.config = Config()
+        self.storage_dir = storage_dir or self.config.SESSION_STORAGE_DIR
+        self.max_resident = max_resident or self.config.SESSION_MAX_RESIDENT
+        self.idle_timeout = idle_timeout or self.config.SESSION_IDLE_TIMEOUT
+        self.assistant_factory = assistant_factory
+
+        self._sessions = OrderedDict()  # session_id -> (assistant, last_access), LRU first
+        self._lock = threading.RLock()
+        self._stats = {
+            'created': 0,
+            'loads': 0,
+            'spills': 0
+        }
+
+        os.makedirs(self.storage_dir, exist_ok=True)
+        logger.info(f"Chat session manager initialized (max_resident={self.max_resident})")
+
+    def _session_path(self, session_id: str) -> str:
+        digest = hashlib.sha1(session_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.storage_dir, f"{digest}.json")
+
+    def get(self, session_id: str) -> ChatAssistant:
+        """Get the assistant for a session, loading or creating it as needed."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                assistant = entry[0]
+                self._sessions[session_id] = (assistant, now)
+                self._sessions.move_to_end(session_id)
+                return assistant
+
+            assistant = self.assistant_factory(session_id)
+            state = self._read_state(session_id)
+            if state is not None:
+                assistant.load_state(state)
+                self._stats['loads'] += 1
+                # Resident state is now the truth; a stale spill must not bring back cleared history
+                self._remove_spill(session_id)
+            else:
+                self._stats['created'] += 1
+
+            self._sessions[session_id] = (assistant, now)
+            self._enforce_limits(now)
+            return assistant
+
+    def _enforce_limits(self, now: float):
+        """Spill idle sessions and any beyond the resident limit, oldest first."""
+        while self._sessions:
+            session_id, (assistant, last_access) = next(iter(self._sessions.items()))
+            over_limit = len(self._sessions) > self.max_resident
+            idle = now - last_access > self.idle_timeout
+            if not (over_limit or idle):
+                break
+            self._spill(session_id, assistant)
+
+    def evict_idle(self):
+        """Spill every session idle for longer than the idle timeout."""
+        with self._lock:
+            self._enforce_limits(time.monotonic())
+
+    def release(self, session_id: str):
+        """Spill a session to disk now, e.g. when its user logs out."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self._spill(session_id, entry[0])
+
+    def delete(self, session_id: str):
+        """Forget a session entirely, in memory and on disk, including its transcript."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            get_transcript_store(session_id).delete()
+            self._remove_spill(session_id)
+
+    def flush(self):
+        """Spill all resident sessions, e.g. on shutdown."""
+        with self._lock:
+            for session_id, (assistant, _) in list(self._sessions.items()):
+                self._spill(session_id, assistant)
+
+    def _spill(self, session_id: str, assistant: ChatAssistant):
+        """Write a session to disk and drop it from memory."""
+        self._sessions.pop(session_id, None)
+        path = self._session_path(session_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'session_id': session_id, 'state': assistant.export_state()}, f)
+            os.replace(tmp_path, path)
+            self._stats['spills'] += 1
+        except Exception as e:
+            logger.error(f"Error spilling chat session: {e}")
+
+    def _remove_spill(self, session_id: str):
+        try:
+            os.remove(self._session_path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def _read_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        path = self._session_path(session_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get('state')
+        except Exception as e:
+            logger.error(f"Error loading chat session: {e}")
+            return None
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions or os.path.exists(self._session_path(session_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get resident count and create/load/spill counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['resident'] = len(self._sessions)
+        return stats
+
+_session_manager = None
+_session_manager_lock = threading.Lock()
+
+def get_session_manager() -> ChatSessionManager:
+    """Get the shared session manager, creating it on first use."""
+    global _session_manager
+    if _session_manager is None:
+        with _session_manager_lock:
+            if _session_manager is None:
+                _session_manager = ChatSessionManager()
+    return _session_manager
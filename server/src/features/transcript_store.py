@@ -0,0 +1,300 @@
+"""
+Append-only persistent chat transcripts.
+
+Each session's transcript is a directory of JSONL segments, one message per
+line, named after the sequence number of their first message. Every segment
+has an ``.idx`` sidecar of uint64 line offsets, so opening a
+transcript loads only the offsets, never the messages: appends are O(1),
+and tail and range reads seek straight to the lines they need.
+
+Clearing a transcript only moves its logical start forward; a background
+compaction then deletes segments that fall entirely before the start and
+rewrites the one that straddles it.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import weakref
+from array import array
+from bisect import bisect_right
+from typing import Optional, Dict, List, Any
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class _Segment:
+    """One JSONL segment and its in-memory line offsets."""
+
+    __slots__ = ('base', 'path', 'index_path', 'offsets', 'size')
+
+    def __init__(self, directory: str, base: int):
+        self.base = base
+        self.path = os.path.join(directory, f"{base:012d}.jsonl")
+        self.index_path = os.path.join(directory, f"{base:012d}.idx")
+        self.offsets = array('Q')
+        self.size = 0
+
+    @property
+    def end(self) -> int:
+        """Sequence number one past the segment's last message."""
+        return self.base + len(self.offsets)
+
+class TranscriptStore:
+    """Segmented append-only message log for one chat session."""
+
+    def __init__(self, session_id: str, root: Optional[str] = None, segment_bytes: Optional[int] = None):
+        """
+        Open (or create) a session transcript.
+
+        Args:
+            session_id: Id of the user/study session
+            root: Directory holding all transcripts
+            segment_bytes: Size at which a new segment is started
+        """
+        self.config = Config()
+        self.session_id = session_id
+        root = root or self.config.TRANSCRIPT_DIR
+        self.directory = os.path.join(root, hashlib.sha1(session_id.encode('utf-8')).hexdigest())
+        self.segment_bytes = segment_bytes or self.config.TRANSCRIPT_SEGMENT_BYTES
+        self.meta_path = os.path.join(self.directory, "meta.json")
+
+        self._segments = []  # Ordered by base sequence number
+        self._start = 0  # First visible sequence number
+        self._lock = threading.RLock()
+        self._compaction_thread = None
+
+        self._open()
+
+    def _open(self):
+        """Load segment offsets and the logical start from disk."""
+        if not os.path.isdir(self.directory):
+            # Created on first write, so sessions that never chat leave nothing behind
+            return
+
+        if os.path.exists(self.meta_path):
+            try:
+                with open(self.meta_path, 'r', encoding='utf-8') as f:
+                    self._start = json.load(f).get('start', 0)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable transcript metadata: {e}")
+
+        bases = sorted(int(name[:-6]) for name in os.listdir(self.directory)
+                       if name.endswith('.jsonl') and name[:-6].isdigit())
+        for i, base in enumerate(bases):
+            segment = _Segment(self.directory, base)
+            segment.size = os.path.getsize(segment.path)
+            if not self._load_offsets(segment, verify_tail=i == len(bases) - 1):
+                self._rebuild_offsets(segment)
+            self._segments.append(segment)
+
+        if self._segments and self._segments[0].base < self._start:
+            self._schedule_compaction()
+
+    def _load_offsets(self, segment: _Segment, verify_tail: bool) -> bool:
+        """Read a segment's offset sidecar; False if it is missing or stale."""
+        try:
+            with open(segment.index_path, 'rb') as f:
+                segment.offsets.frombytes(f.read())
+        except (OSError, ValueError):
+            segment.offsets = array('Q')
+            return False
+
+        if not segment.offsets:
+            return segment.size == 0
+        if segment.offsets[-1] >= segment.size:
+            return False
+        if verify_tail:
+            # The last segment may have been cut short by a crash mid-append
+            with open(segment.path, 'rb') as f:
+                f.seek(segment.offsets[-1])
+                tail = f.read()
+            return tail.count(b'\n') == 1 and tail.endswith(b'\n')
+        return True
+
+    def _rebuild_offsets(self, segment: _Segment):
+        """Recompute offsets by scanning the segment, dropping a torn final line."""
+        offsets = array('Q')
+        position = 0
+        with open(segment.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offsets.append(position)
+                position += len(line)
+        if position != segment.size:
+            with open(segment.path, 'r+b') as f:
+                f.truncate(position)
+        segment.offsets = offsets
+        segment.size = position
+        with open(segment.index_path, 'wb') as f:
+            offsets.tofile(f)
+        logger.info(f"Rebuilt transcript index for segment {segment.base}")
+
+    def __len__(self) -> int:
+        """Sequence number the next message will get."""
+        with self._lock:
+            return self._segments[-1].end if self._segments else self._start
+
+    @property
+    def start(self) -> int:
+        """Sequence number of the first visible message."""
+        return self._start
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Append a message record.
+
+        Returns:
+            The record's sequence number
+        """
+        record = dict(record)
+        record.setdefault('time', time.time())
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+        with self._lock:
+            if not self._segments or self._segments[-1].size >= self.segment_bytes:
+                os.makedirs(self.directory, exist_ok=True)
+                self._segments.append(_Segment(self.directory, len(self)))
+            segment = self._segments[-1]
+            with open(segment.path, 'ab') as f:
+                f.write(line)
+            with open(segment.index_path, 'ab') as f:
+                f.write(array('Q', [segment.size]).tobytes())
+            segment.offsets.append(segment.size)
+            segment.size += len(line)
+            return segment.end - 1
+
+    def read(self, start: int, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Read messages with sequence numbers in [start, stop).
+
+        Each record is returned with its 'seq'. Messages before the logical
+        start are never returned.
+        """
+        with self._lock:
+            start = max(start, self._start)
+            stop = len(self) if stop is None else min(stop, len(self))
+            if start >= stop:
+                return []
+
+            records = []
+            bases = [segment.base for segment in self._segments]
+            position = max(bisect_right(bases, start) - 1, 0)
+            for segment in self._segments[position:]:
+                if segment.base >= stop:
+                    break
+                first = max(start, segment.base) - segment.base
+                last = min(stop, segment.end) - segment.base
+                if first >= last:
+                    continue
+                begin = segment.offsets[first]
+                end = segment.offsets[last] if last < len(segment.offsets) else segment.size
+                with open(segment.path, 'rb') as f:
+                    f.seek(begin)
+                    chunk = f.read(end - begin)
+                for seq, line in enumerate(chunk.splitlines(), segment.base + first):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    record['seq'] = seq
+                    records.append(record)
+            return records
+
+    def tail(self, count: int) -> List[Dict[str, Any]]:
+        """Read the last count messages, oldest first."""
+        end = len(self)
+        return self.read(end - count, end)
+
+    def truncate(self):
+        """Hide every message so far; their space is reclaimed in the background."""
+        with self._lock:
+            self._start = len(self)
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self.meta_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'session_id': self.session_id, 'start': self._start}, f)
+            os.replace(tmp_path, self.meta_path)
+        self._schedule_compaction()
+
+    def _schedule_compaction(self):
+        with self._lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            self._compaction_thread = threading.Thread(target=self.compact, name="transcript-compaction",
+                                                       daemon=True)
+            self._compaction_thread.start()
+
+    def compact(self):
+        """Delete segments before the logical start and rewrite the one straddling it."""
+        while True:
+            with self._lock:
+                if not self._segments or self._segments[0].base >= self._start:
+                    return
+                segment = self._segments[0]
+                if segment.end <= self._start and segment is not self._segments[-1]:
+                    self._segments.pop(0)
+                    self._remove_files(segment)
+                    continue
+                self._rewrite_from_start(segment)
+                return
+
+    def _rewrite_from_start(self, segment: _Segment):
+        """Replace a segment with a copy that begins at the logical start."""
+        skip = min(self._start, segment.end) - segment.base
+        begin = segment.offsets[skip] if skip < len(segment.offsets) else segment.size
+        replacement = _Segment(self.directory, segment.base + skip)
+        with open(segment.path, 'rb') as f:
+            f.seek(begin)
+            data = f.read()
+        replacement.offsets = array('Q', (offset - begin for offset in segment.offsets[skip:]))
+        replacement.size = len(data)
+
+        for path, content in ((replacement.path, data), (replacement.index_path, replacement.offsets.tobytes())):
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(content)
+            os.replace(f"{path}.tmp", path)
+        self._segments[0] = replacement
+        if replacement.base != segment.base:
+            self._remove_files(segment)
+        logger.info(f"Compacted transcript: dropped {skip} messages from segment {segment.base}")
+
+    def _remove_files(self, segment: _Segment):
+        for path in (segment.path, segment.index_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def delete(self):
+        """Delete the whole transcript from disk."""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._segments = []
+            self._start = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get message count, segment count and bytes on disk."""
+        with self._lock:
+            return {
+                'messages': len(self) - self._start,
+                'segments': len(self._segments),
+                'bytes': sum(segment.size for segment in self._segments),
+                'index_bytes': sum(len(segment.offsets) * 8 for segment in self._segments)
+            }
+
+_stores = weakref.WeakValueDictionary()
+_stores_lock = threading.Lock()
+
+def get_transcript_store(session_id: str) -> TranscriptStore:
+    """Get the open transcript for a session, shared while anyone holds it."""
+    with _stores_lock:
+        store = _stores.get(session_id)
+        if store is None:
+            store = TranscriptStore(session_id)
+            _stores[session_id] = store
+    return store
@@ -1,12 +1,12 @@
 import hashlib
 import time
-import requests
 import jwt
 import bcrypt
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, OperationFailure
+from src.services.http_client import get_transport
 from src.utils.config import Config
 from src.utils.logger import get_logger
 
@@ -21,6 +21,7 @@ class AuthService:
         self.mongodb_uri = getattr(self.config, 'MONGODB_URI', 'mongodb://localhost:27017/study-helper')
         self.nextauth_secret = getattr(self.config, 'NEXTAUTH_SECRET', '')
         self.nextjs_api_url = getattr(self.config, 'NEXTJS_API_URL', 'http://localhost:3000/api')
+        self.transport = get_transport()
         
         self.client = None
         self.db = None
@@ -142,7 +143,7 @@ class AuthService:
                 'password': password
             }
             
-            response = requests.post(
+            response = self.transport.post(
                 f"{self.nextjs_api_url}/auth/signin",
                 json=payload,
                 headers={'Content-Type': 'application/json'},
@@ -340,7 +341,7 @@ class AuthService:
             if not self.current_token:
                 return False
             
-            response = requests.get(
+            response = self.transport.get(
                 f"{self.nextjs_api_url}/auth/session",
                 headers={'Authorization': f'Bearer {self.current_token}'},
                 timeout=10
@@ -0,0 +1,172 @@
+"""
+Wire encoding of chat request bodies.
+
+Two optional modes shrink what each ``/ai/chat`` POST uploads:
+
+* Compression: bodies above a size threshold are sent gzip- or
+  deflate-compressed with a matching ``Content-Encoding`` header.
+* Delta history: instead of the full ``conversation_history``, the request
+  names a conversation id and the revision of the history the server last
+  acknowledged, and carries only what changed since then: how many entries
+  fell off the front of the verbatim turns and the summary, and which
+  entries were appended. The server rebuilds the identical history list.
+  It answers HTTP 409 when it does not know the base revision, and the
+  client then resends the whole history once.
+
+Delta encoding needs a server that implements the receiving side (see
+``scripts/mock_api.py``), so both modes are off by default.
+"""
+import gzip
+import hashlib
+import json
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Optional, Dict, List, Any, Tuple
+from src.features.conversation_history import ConversationHistory
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+COMPRESSORS = {
+    'gzip': gzip.compress,
+    'deflate': zlib.compress
+}
+
+def split_history(history: List[Dict[str, str]]) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Split a conversation_history payload into summary lines and verbatim turns."""
+    if history and history[0].get('human') == ConversationHistory.SUMMARY_LABEL:
+        return history[0]['assistant'].split('\n'), history[1:]
+    return [], list(history)
+
+def history_revision(summary: List[str], turns: List[Dict[str, str]]) -> str:
+    """Content hash identifying one state of a conversation history."""
+    data = json.dumps([summary, turns], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+def list_delta(old: List[Any], new: List[Any]) -> Optional[Dict[str, Any]]:
+    """
+    Express new as old with entries dropped from the front and appended at the end.
+
+    Returns:
+        {'drop': n, 'append': [...]}, or None if new is not of that form
+    """
+    for drop in range(len(old) + 1):
+        kept = len(old) - drop
+        if kept <= len(new) and old[drop:] == new[:kept]:
+            return {'drop': drop, 'append': new[kept:]}
+    return None
+
+class ChatWireEncoder:
+    """Encodes chat payloads for one conversation, tracking the acknowledged history."""
+
+    def __init__(self, compression: Optional[str] = None, compress_min_bytes: Optional[int] = None,
+                 delta: Optional[bool] = None):
+        """
+        Initialize the encoder.
+
+        Args:
+            compression: 'gzip', 'deflate' or '' for none
+            compress_min_bytes: Smallest body that is compressed
+            delta: Send history deltas against the last acknowledged revision
+        """
+        self.config = Config()
+        self.compression = self.config.AI_WIRE_COMPRESSION if compression is None else compression
+        self.compress_min_bytes = (self.config.AI_WIRE_COMPRESS_MIN_BYTES
+                                   if compress_min_bytes is None else compress_min_bytes)
+        self.delta = self.config.AI_WIRE_DELTA if delta is None else delta
+        if self.compression and self.compression not in COMPRESSORS:
+            logger.warning(f"Unknown wire compression '{self.compression}'; sending uncompressed")
+            self.compression = ''
+
+        self.conversation_id = uuid.uuid4().hex
+        self._acked = OrderedDict()  # revision -> (summary, turns), newest last
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'compressed': 0,
+            'deltas': 0,
+            'resyncs': 0,
+            'json_bytes': 0,
+            'sent_bytes': 0,
+            'last_sent_bytes': 0
+        }
+
+    def _conversation(self, history: List[Dict[str, str]], full: bool) -> Dict[str, Any]:
+        """Describe the history as a delta against the newest acknowledged revision."""
+        summary, turns = split_history(history)
+        revision = history_revision(summary, turns)
+        with self._lock:
+            base = next(reversed(self._acked), None) if not full else None
+            if base is not None:
+                base_summary, base_turns = self._acked[base]
+                turns_delta = list_delta(base_turns, turns)
+                summary_delta = list_delta(base_summary, summary)
+                if turns_delta is not None and summary_delta is not None:
+                    self._stats['deltas'] += 1
+                    return {'id': self.conversation_id, 'base': base, 'revision': revision,
+                            'turns': turns_delta, 'summary': summary_delta}
+        return {'id': self.conversation_id, 'base': None, 'revision': revision,
+                'turns': {'drop': 0, 'append': turns}, 'summary': {'drop': 0, 'append': summary}}
+
+    def encode(self, payload: Dict[str, Any], full: bool = False) -> Tuple[bytes, Dict[str, str], Optional[str]]:
+        """
+        Encode a chat payload for the wire.
+
+        Args:
+            payload: Payload as built by ChatAssistant._build_payload()
+            full: Send the whole history even if a delta is possible
+
+        Returns:
+            (body, headers, revision); revision is None unless delta mode is on
+        """
+        revision = None
+        if self.delta:
+            body = dict(payload)
+            conversation = self._conversation(body.pop('conversation_history', []), full)
+            body['conversation'] = conversation
+            revision = conversation['revision']
+        else:
+            body = payload
+        data = json.dumps(body).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+
+        with self._lock:
+            self._stats['requests'] += 1
+            # Baseline: what the request would weigh as plain JSON with the full history
+            self._stats['json_bytes'] += len(json.dumps(payload).encode('utf-8')) if self.delta else len(data)
+            if self.compression and len(data) >= self.compress_min_bytes:
+                data = COMPRESSORS[self.compression](data)
+                headers['Content-Encoding'] = self.compression
+                self._stats['compressed'] += 1
+            self._stats['sent_bytes'] += len(data)
+            self._stats['last_sent_bytes'] = len(data)
+        return data, headers, revision
+
+    def acknowledge(self, revision: Optional[str], payload: Dict[str, Any]):
+        """Remember a history revision the server has accepted."""
+        if revision is None:
+            return
+        summary, turns = split_history(payload.get('conversation_history', []))
+        with self._lock:
+            self._acked.pop(revision, None)
+            self._acked[revision] = (summary, turns)
+            while len(self._acked) > 4:
+                self._acked.popitem(last=False)
+
+    def reset(self):
+        """Forget acknowledged revisions after the server lost them."""
+        with self._lock:
+            self._acked.clear()
+            self._stats['resyncs'] += 1
+        logger.info("Chat history out of sync with the server; resending in full")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get request counts and uploaded bytes against the plain-JSON baseline."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['mode'] = '+'.join(filter(None, [self.compression, 'delta' if self.delta else ''])) or 'json'
+        stats['ratio'] = stats['sent_bytes'] / stats['json_bytes'] if stats['json_bytes'] else 1.0
+        return stats
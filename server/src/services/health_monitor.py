@@ -0,0 +1,218 @@
+"""
+Background health monitoring and circuit breaking for the AI backend.
+
+A HealthMonitor probes the Next.js ``/health`` endpoint on an interval and
+caches the result, so availability checks never block on the network. It
+drives a CircuitBreaker that chat calls consult before going upstream: once
+the backend fails repeatedly, calls fail fast instead of each waiting out
+the request timeout.
+"""
+import threading
+import time
+from typing import Optional, Dict, Any
+from src.services.http_client import HTTPTransport, get_transport
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: Optional[int] = None, recovery_timeout: Optional[float] = None):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before allowing a trial call
+        """
+        config = Config()
+        self.failure_threshold = failure_threshold or config.BREAKER_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or config.BREAKER_RECOVERY_TIMEOUT
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_thread = None  # Thread making the half-open trial call
+        self._lock = threading.Lock()
+        self._stats = {
+            'rejected': 0,
+            'opened': 0
+        }
+
+    @property
+    def state(self) -> str:
+        """Current breaker state, moving from open to half-open once the timeout passes."""
+        with self._lock:
+            self._update_state()
+            return self._state
+
+    def _update_state(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go upstream right now."""
+        with self._lock:
+            self._update_state()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                # Let exactly one trial call through to test recovery
+                self._trial_in_flight = True
+                self._trial_thread = threading.get_ident()
+                return True
+            self._stats['rejected'] += 1
+            return False
+
+    def release_trial(self):
+        """
+        End this thread's trial call if it was neither a success nor a failure
+        (throttled, past its deadline, cancelled), so the next call can try.
+        """
+        with self._lock:
+            if self._trial_in_flight and self._trial_thread == threading.get_ident():
+                self._trial_in_flight = False
+
+    def record_success(self):
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("AI backend recovered; circuit closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit past the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._stats['opened'] += 1
+                    logger.warning(f"AI backend failing ({self._failures} failures); circuit opened")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters."""
+        with self._lock:
+            self._update_state()
+            stats = dict(self._stats)
+            stats['state'] = self._state
+            stats['consecutive_failures'] = self._failures
+        return stats
+
+class HealthMonitor:
+    """Probes the API health endpoint in the background and caches the result."""
+
+    def __init__(self, api_base_url: str, interval: Optional[float] = None, timeout: float = 5,
+                 breaker: Optional[CircuitBreaker] = None, transport: Optional[HTTPTransport] = None):
+        """
+        Initialize the health monitor.
+
+        Args:
+            api_base_url: Base URL of the Next.js API
+            interval: Seconds between background probes
+            timeout: Timeout for a single probe
+            breaker: Circuit breaker to drive from probe results
+            transport: HTTP transport used for probes
+        """
+        self.config = Config()
+        self.api_base_url = api_base_url
+        self.interval = interval or self.config.HEALTH_CHECK_INTERVAL
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.transport = transport or get_transport()
+
+        self.healthy = None  # Unknown until the first probe completes
+        self.last_checked = None
+        self.last_error = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def probe(self) -> bool:
+        """Probe the health endpoint once and update the cached state."""
+        try:
+            response = self.transport.get(f"{self.api_base_url}/health", timeout=self.timeout)
+            healthy = response.status_code == 200
+            self.last_error = None if healthy else f"HTTP {response.status_code}"
+        except Exception as e:
+            healthy = False
+            self.last_error = str(e)
+
+        if healthy != self.healthy:
+            logger.info(f"AI backend health changed: {'healthy' if healthy else 'unhealthy'}")
+        self.healthy = healthy
+        self.last_checked = time.time()
+
+        if healthy:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        return healthy
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.probe()
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        """Start probing in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ai-health-monitor", daemon=True)
+        self._thread.start()
+        logger.info(f"Health monitor started (interval={self.interval}s)")
+
+    def stop(self):
+        """Stop background probing."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1)
+            self._thread = None
+
+    def is_healthy(self) -> bool:
+        """
+        Get the cached health state without blocking.
+
+        Before the first probe completes the backend is assumed healthy; an
+        open circuit always reports unhealthy.
+        """
+        if self.breaker.state == CircuitBreaker.OPEN:
+            return False
+        return self.healthy is not False
+
+    def status(self) -> Dict[str, Any]:
+        """Get the cached health state with its timestamp and breaker stats."""
+        return {
+            'healthy': self.healthy,
+            'last_checked': self.last_checked,
+            'last_error': self.last_error,
+            'breaker': self.breaker.stats()
+        }
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+def get_health_monitor(api_base_url: str) -> HealthMonitor:
+    """Get the shared, running health monitor for an API base URL."""
+    with _monitors_lock:
+        monitor = _monitors.get(api_base_url)
+        if monitor is None:
+            monitor = HealthMonitor(api_base_url)
+            monitor.start()
+            _monitors[api_base_url] = monitor
+    return monitor
@@ -0,0 +1,106 @@
+"""
+Shared HTTP transport for Study Helper API calls.
+
+All callers of the Next.js API go through one pooled, keep-alive
+``requests.Session`` so repeated calls reuse open TCP/TLS connections
+instead of paying a fresh handshake per request.
+"""
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class HTTPTransport:
+    """Pooled keep-alive HTTP session with a retry/backoff policy."""
+
+    # Only idempotent requests are retried automatically; chat POSTs are not
+    RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                 max_retries: Optional[int] = None, backoff_factor: Optional[float] = None,
+                 pool_block: Optional[bool] = None, timeout: Optional[float] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum open connections per host
+            max_retries: Retries for connection errors and idempotent requests
+            backoff_factor: Exponential backoff factor between retries
+            pool_block: Block instead of opening extra connections past pool_maxsize
+            timeout: Default request timeout in seconds
+        """
+        self.config = Config()
+        self.pool_connections = pool_connections or self.config.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or self.config.HTTP_POOL_MAXSIZE
+        self.max_retries = self.config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = self.config.HTTP_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self.pool_block = self.config.HTTP_POOL_BLOCK if pool_block is None else pool_block
+        self.timeout = timeout or self.config.API_TIMEOUT
+
+        self.session = self._create_session()
+
+        logger.info(f"HTTP transport initialized (pool_maxsize={self.pool_maxsize}, "
+                    f"max_retries={self.max_retries})")
+
+    def _create_session(self) -> requests.Session:
+        """Create a session with pooled adapters mounted for http and https."""
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=self.RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+            pool_block=self.pool_block
+        )
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Connection': 'keep-alive'})
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the pooled session."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request."""
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+        logger.info("HTTP transport closed")
+
+_transport = None
+_transport_lock = threading.Lock()
+
+def get_transport() -> HTTPTransport:
+    """Get the shared HTTP transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HTTPTransport()
+    return _transport
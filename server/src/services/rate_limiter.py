@@ -0,0 +1,215 @@
+"""
+Client-side adaptive rate limiting and retry scheduling for AI API calls.
+
+All AI calls draw from one token bucket. Its refill rate adapts AIMD-style:
+it creeps up while calls succeed and halves when the API throttles (HTTP
+429/503), pausing entirely for any ``Retry-After`` the API sends. Throttled
+calls are retried with capped, fully jittered exponential backoff, and every
+wait respects the caller's deadline.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Callable
+import requests
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when a request cannot be sent or retried before its deadline."""
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveRateLimiter:
+    """Token bucket with AIMD rate adaptation and throttle-aware retries."""
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None,
+                 min_rate: Optional[float] = None, max_rate: Optional[float] = None,
+                 max_retries: Optional[int] = None, backoff: Optional[float] = None,
+                 backoff_cap: Optional[float] = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Initial requests per second
+            burst: Bucket capacity, i.e. requests allowed back to back
+            min_rate: Floor the rate is never cut below
+            max_rate: Ceiling the rate never grows past
+            max_retries: Retries for a throttled request
+            backoff: Base delay of the exponential backoff in seconds
+            backoff_cap: Maximum delay between retries in seconds
+        """
+        self.config = Config()
+        self.rate = rate or self.config.AI_RATE_LIMIT
+        self.burst = burst or self.config.AI_RATE_BURST
+        self.min_rate = min_rate or self.config.AI_RATE_LIMIT_MIN
+        self.max_rate = max_rate or self.config.AI_RATE_LIMIT_MAX
+        self.max_retries = self.config.AI_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = backoff or self.config.AI_RETRY_BACKOFF
+        self.backoff_cap = backoff_cap or self.config.AI_RETRY_BACKOFF_CAP
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._error_rate = 0.0  # Exponentially weighted share of throttled calls
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'throttled': 0,
+            'retries': 0,
+            'deadline_exceeded': 0,
+            'wait_seconds': 0.0
+        }
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, deadline: Optional[float] = None):
+        """
+        Wait for a token.
+
+        Args:
+            deadline: time.monotonic() value by which the token is needed
+
+        Raises:
+            DeadlineExceeded: If no token is available before the deadline
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    self._stats['requests'] += 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+
+                if deadline is not None and now + wait > deadline:
+                    self._stats['deadline_exceeded'] += 1
+                    raise DeadlineExceeded("AI request deadline passed while waiting for rate limit")
+                self._stats['wait_seconds'] += wait
+            time.sleep(wait)
+
+    def record_success(self):
+        """Grow the rate additively after an unthrottled call."""
+        with self._lock:
+            self._error_rate *= 0.9
+            if self._error_rate < 0.1:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+    def record_throttle(self, retry_after: Optional[float] = None):
+        """Halve the rate after a throttled call and honor Retry-After."""
+        with self._lock:
+            now = time.monotonic()
+            self._stats['throttled'] += 1
+            self._error_rate = self._error_rate * 0.9 + 0.1
+            # Simultaneous rejections from one burst count as a single signal
+            if now - self._last_decrease >= 1 / self.rate:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._last_decrease = now
+                logger.warning(f"AI API throttled; rate limit lowered to {self.rate:.2f}/s")
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._tokens = min(self._tokens, 0.0)
+
+    def retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Capped, fully jittered exponential backoff, never shorter than Retry-After."""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff * 2 ** attempt))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.backoff_cap))
+        return delay
+
+    def call(self, send: Callable[[float], requests.Response], deadline: Optional[float] = None,
+             timeout: Optional[float] = None) -> requests.Response:
+        """
+        Send a request under the rate limit, retrying throttled responses.
+
+        Args:
+            send: Callable taking a timeout in seconds and returning a response
+            deadline: time.monotonic() value after which no attempt is started
+            timeout: Per-attempt timeout, shortened to fit the deadline; an
+                attempt that times out only because it was shortened raises
+                DeadlineExceeded
+
+        Returns:
+            The first unthrottled response, or the last throttled one once
+            retries or the deadline run out
+        """
+        timeout = timeout or self.config.API_TIMEOUT
+        attempt = 0
+        while True:
+            self.acquire(deadline)
+            attempt_timeout = timeout
+            if deadline is not None:
+                attempt_timeout = min(timeout, max(deadline - time.monotonic(), 0.1))
+
+            try:
+                response = send(attempt_timeout)
+            except requests.exceptions.Timeout as e:
+                if attempt_timeout < timeout:
+                    # Cut short by the caller's deadline, not a sign the backend is slow
+                    with self._lock:
+                        self._stats['deadline_exceeded'] += 1
+                    raise DeadlineExceeded("AI request deadline passed during the attempt") from e
+                raise
+            if response.status_code not in self.THROTTLE_STATUSES:
+                self.record_success()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.record_throttle(retry_after)
+            if attempt >= self.max_retries:
+                return response
+
+            delay = self.retry_delay(attempt, retry_after)
+            if deadline is not None and time.monotonic() + delay > deadline:
+                return response
+
+            logger.info(f"AI API returned {response.status_code}; retrying in {delay:.2f}s")
+            response.close()
+            with self._lock:
+                self._stats['retries'] += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the current rate, error rate and request counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['rate'] = round(self.rate, 3)
+            stats['error_rate'] = round(self._error_rate, 3)
+            stats['blocked_for'] = max(self._blocked_until - time.monotonic(), 0.0)
+        return stats
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Get the rate limiter shared by all AI calls, creating it on first use."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = AdaptiveRateLimiter()
+    return _rate_limiter
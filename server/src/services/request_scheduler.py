@@ -0,0 +1,203 @@
+"""
+Priority scheduling of upstream AI requests.
+
+Every AI call takes a slot from one RequestScheduler before going upstream.
+Calls are either foreground (interactive chat) or background (summaries,
+prefetch, quiz banks). Waiting foreground calls always go first, background
+calls are capped below the total so slots stay free for interactive work,
+and queued background calls can be cancelled in bulk when the user needs
+the capacity.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator
+from src.services.rate_limiter import DeadlineExceeded
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FOREGROUND = 'foreground'
+BACKGROUND = 'background'
+
+_current_priority = contextvars.ContextVar('ai_request_priority', default=FOREGROUND)
+
+class RequestCancelled(Exception):
+    """Raised when a queued request is cancelled before it gets a slot."""
+
+class _Ticket:
+    __slots__ = ('priority', 'queued_at', 'cancelled')
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.queued_at = time.monotonic()
+        self.cancelled = False
+
+class RequestScheduler:
+    """Two-class priority gate with per-class concurrency caps."""
+
+    def __init__(self, max_concurrency: Optional[int] = None, background_concurrency: Optional[int] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum requests running at once across both classes
+            background_concurrency: Maximum background requests running at once
+        """
+        self.config = Config()
+        self.max_concurrency = max_concurrency or self.config.AI_MAX_CONCURRENCY
+        background = background_concurrency or self.config.AI_BACKGROUND_CONCURRENCY
+        self.caps = {
+            FOREGROUND: self.max_concurrency,
+            BACKGROUND: max(1, min(background, self.max_concurrency - 1))
+        }
+
+        self._running = {FOREGROUND: 0, BACKGROUND: 0}
+        self._waiting = {FOREGROUND: deque(), BACKGROUND: deque()}
+        self._condition = threading.Condition()
+        self._stats = {
+            priority: {
+                'submitted': 0,
+                'completed': 0,
+                'cancelled': 0,
+                'timed_out': 0,
+                'max_queue_depth': 0,
+                'waits': deque(maxlen=1000)
+            }
+            for priority in (FOREGROUND, BACKGROUND)
+        }
+
+    @staticmethod
+    def current_priority() -> str:
+        """Priority class of requests made from the current context."""
+        return _current_priority.get()
+
+    @contextmanager
+    def priority(self, priority: str) -> Iterator[None]:
+        """Run the enclosed requests in the given priority class."""
+        token = _current_priority.set(priority)
+        try:
+            yield
+        finally:
+            _current_priority.reset(token)
+
+    def _can_start(self, ticket: _Ticket) -> bool:
+        priority = ticket.priority
+        if self._waiting[priority][0] is not ticket:
+            return False
+        if sum(self._running.values()) >= self.max_concurrency:
+            return False
+        if self._running[priority] >= self.caps[priority]:
+            return False
+        # Queued background work yields to any waiting foreground request
+        return priority == FOREGROUND or not self._waiting[FOREGROUND]
+
+    def acquire(self, priority: Optional[str] = None, deadline: Optional[float] = None) -> str:
+        """
+        Wait for a request slot.
+
+        Args:
+            priority: FOREGROUND or BACKGROUND (defaults to the current context's)
+            deadline: time.monotonic() value by which the slot is needed
+
+        Returns:
+            The priority class the slot was taken in
+
+        Raises:
+            RequestCancelled: If cancel_background() dropped the request
+            DeadlineExceeded: If no slot frees up before the deadline
+        """
+        priority = priority or self.current_priority()
+        ticket = _Ticket(priority)
+        stats = self._stats[priority]
+        with self._condition:
+            queue = self._waiting[priority]
+            queue.append(ticket)
+            stats['submitted'] += 1
+            stats['max_queue_depth'] = max(stats['max_queue_depth'], len(queue))
+
+            while not self._can_start(ticket):
+                if ticket.cancelled:
+                    queue.remove(ticket)
+                    stats['cancelled'] += 1
+                    self._condition.notify_all()
+                    raise RequestCancelled("Background AI request cancelled")
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        queue.remove(ticket)
+                        stats['timed_out'] += 1
+                        self._condition.notify_all()
+                        raise DeadlineExceeded("AI request deadline passed while queued")
+                self._condition.wait(timeout)
+
+            queue.popleft()
+            self._running[priority] += 1
+            stats['waits'].append(time.monotonic() - ticket.queued_at)
+            # The next ticket in line may be able to start as well
+            self._condition.notify_all()
+        return priority
+
+    def release(self, priority: str):
+        """Return a slot taken by acquire()."""
+        with self._condition:
+            self._running[priority] -= 1
+            self._stats[priority]['completed'] += 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None, deadline: Optional[float] = None) -> Iterator[str]:
+        """Hold a request slot for the duration of the block."""
+        priority = self.acquire(priority, deadline)
+        try:
+            yield priority
+        finally:
+            self.release(priority)
+
+    def cancel_background(self) -> int:
+        """
+        Cancel every queued background request; running ones finish normally.
+
+        Returns:
+            Number of requests cancelled
+        """
+        with self._condition:
+            tickets = [ticket for ticket in self._waiting[BACKGROUND] if not ticket.cancelled]
+            for ticket in tickets:
+                ticket.cancelled = True
+            self._condition.notify_all()
+        if tickets:
+            logger.info(f"Cancelled {len(tickets)} queued background AI requests")
+        return len(tickets)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-class queue depth, running count, counters and wait times in ms."""
+        result = {}
+        with self._condition:
+            for priority, stats in self._stats.items():
+                waits = sorted(stats['waits'])
+                entry = {key: value for key, value in stats.items() if key != 'waits'}
+                entry['queue_depth'] = len(self._waiting[priority])
+                entry['running'] = self._running[priority]
+                entry['cap'] = self.caps[priority]
+                entry['wait_ms_p50'] = round(waits[len(waits) // 2] * 1000, 2) if waits else 0.0
+                entry['wait_ms_p95'] = round(waits[int(len(waits) * 0.95)] * 1000, 2) if waits else 0.0
+                entry['wait_ms_max'] = round(waits[-1] * 1000, 2) if waits else 0.0
+                result[priority] = entry
+        return result
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_request_scheduler() -> RequestScheduler:
+    """Get the scheduler shared by all AI calls, creating it on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RequestScheduler()
+    return _scheduler
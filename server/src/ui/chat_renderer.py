@@ -0,0 +1,262 @@
+"""
+Rendering of assistant replies to chat HTML.
+
+Pure Python with no Qt calls, so replies can be rendered on the worker
+thread that fetched them; the GUI thread only inserts the finished HTML.
+Markdown is converted in one pass over the lines with precompiled
+patterns, and rendered HTML is cached by content hash and theme.
+"""
+import hashlib
+import html
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any
+from src.ui.styles import DARK_COLORS, LIGHT_COLORS
+from src.utils.json_extract import strip_code_fences
+
+_HEADING = re.compile(r'(#{1,6})\s+(.*)')
+_BULLET = re.compile(r'[-*+]\s+(.*)')
+_NUMBERED = re.compile(r'\d+[.)]\s+(.*)')
+_RULE = re.compile(r'(?:-{3,}|_{3,}|\*{3,})$')
+_FENCE = re.compile(r'```')
+# Inline spans: code, bold, italic, link
+_INLINE = re.compile(
+    r'`([^`]+)`'
+    r'|\*\*(.+?)\*\*|__(.+?)__'
+    r'|\*([^*\s](?:[^*]*[^*\s])?)\*'
+    r'|\[([^\]]+)\]\(([^)\s]+)\)'
+)
+
+PRIORITY_EMOJI = {
+    'high': '🔴',
+    'medium': '🟡',
+    'low': '🟢'
+}
+
+def _escape(text: Any) -> str:
+    return html.escape(str(text), quote=False)
+
+def render_inline(text: str) -> str:
+    """Escape a line of text and convert its inline Markdown spans."""
+    parts = []
+    position = 0
+    for match in _INLINE.finditer(text):
+        parts.append(_escape(text[position:match.start()]))
+        code, bold, bold_alt, italic, link_text, url = match.groups()
+        if code is not None:
+            parts.append(f"<code>{_escape(code)}</code>")
+        elif bold is not None or bold_alt is not None:
+            parts.append(f"<strong>{render_inline(bold if bold is not None else bold_alt)}</strong>")
+        elif italic is not None:
+            parts.append(f"<em>{render_inline(italic)}</em>")
+        else:
+            parts.append(f"<a href='{html.escape(url)}'>{render_inline(link_text)}</a>")
+        position = match.end()
+    parts.append(_escape(text[position:]))
+    return ''.join(parts)
+
+def render_markdown(text: str, colors: Dict[str, str]) -> str:
+    """Convert Markdown to HTML in a single pass over the lines."""
+    out = []
+    list_tag = None
+    code_lines = None
+
+    def close_list():
+        nonlocal list_tag
+        if list_tag:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+
+        if code_lines is not None:
+            if _FENCE.match(line):
+                out.append(f"<pre style='background-color: {colors['surface_hover']}; padding: 8px;'>"
+                           f"{_escape(chr(10).join(code_lines))}</pre>")
+                code_lines = None
+            else:
+                code_lines.append(raw_line)
+            continue
+
+        if _FENCE.match(line):
+            close_list()
+            code_lines = []
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            close_list()
+            level = min(len(heading.group(1)) + 1, 6)  # h1 is too large inside a chat bubble
+            out.append(f"<h{level}>{render_inline(heading.group(2))}</h{level}>")
+            continue
+
+        if _RULE.match(line):
+            close_list()
+            out.append("<hr>")
+            continue
+
+        bullet = _BULLET.match(line)
+        numbered = None if bullet else _NUMBERED.match(line)
+        if bullet or numbered:
+            tag = 'ul' if bullet else 'ol'
+            if list_tag != tag:
+                close_list()
+                out.append(f"<{tag}>")
+                list_tag = tag
+            out.append(f"<li>{render_inline((bullet or numbered).group(1))}</li>")
+            continue
+
+        close_list()
+        out.append(f"<p>{render_inline(line)}</p>" if line else "<br>")
+
+    if code_lines is not None:
+        # Unterminated fence: show what arrived
+        out.append(f"<pre>{_escape(chr(10).join(code_lines))}</pre>")
+    close_list()
+    return ''.join(out)
+
+def _render_items(title: str, items: List[Any]) -> str:
+    parts = [f"<br><strong>{title}</strong><ul>"]
+    for item in items:
+        if isinstance(item, dict):
+            parts.append(f"<li>{_escape(item.get('title') or item.get('name') or item)}</li>")
+        else:
+            parts.append(f"<li>{_escape(item)}</li>")
+    parts.append("</ul>")
+    return ''.join(parts)
+
+def render_structured(data: Dict[str, Any]) -> str:
+    """Format a structured JSON reply into HTML."""
+    html_parts = []
+
+    # Handle different possible message keys
+    message_content = data.get('message') or data.get('content') or data.get('response') or data.get('text', '')
+    if message_content:
+        html_parts.append(f"<p>{_escape(message_content)}</p>")
+
+    if data.get('suggestions'):
+        html_parts.append(_render_items("💡 Study Tips:", data['suggestions']))
+
+    if data.get('actionItems'):
+        html_parts.append("<br><strong>📋 Action Items:</strong><ul>")
+        for item in data['actionItems']:
+            if isinstance(item, dict):
+                priority_emoji = PRIORITY_EMOJI.get(str(item.get('priority', 'medium')).lower(), '🔵')
+                item_text = f"{priority_emoji} <strong>{_escape(item.get('title', 'Task'))}</strong>"
+                if item.get('description'):
+                    item_text += f": {_escape(item['description'])}"
+                if item.get('estimatedTime'):
+                    item_text += f" <em>({_escape(item['estimatedTime'])} min)</em>"
+                html_parts.append(f"<li>{item_text}</li>")
+            else:
+                html_parts.append(f"<li>{_escape(item)}</li>")
+        html_parts.append("</ul>")
+
+    # Study tips (alternative to suggestions)
+    if data.get('tips'):
+        html_parts.append(_render_items("📚 Study Tips:", data['tips']))
+
+    if data.get('resources'):
+        html_parts.append("<br><strong>📖 Resources:</strong><ul>")
+        for resource in data['resources']:
+            if isinstance(resource, dict) and 'name' in resource:
+                name = _escape(resource['name'])
+                url = resource.get('url', '')
+                html_parts.append(f"<li><a href='{html.escape(url)}'>{name}</a></li>" if url else f"<li>{name}</li>")
+            elif isinstance(resource, str):
+                html_parts.append(f"<li>{_escape(resource)}</li>")
+        html_parts.append("</ul>")
+
+    confidence = data.get('confidence')
+    if isinstance(confidence, (int, float)) and confidence < 0.7:
+        html_parts.append("<br><small><em>Note: This response has lower confidence. "
+                          "Please verify the information.</em></small>")
+
+    return "".join(html_parts) if html_parts else "<p>No content available</p>"
+
+def render_list(data_list: List[Any]) -> str:
+    """Format a list reply into HTML."""
+    html_parts = ["<ul>"]
+    for item in data_list:
+        if isinstance(item, dict):
+            title = _escape(item.get('title') or item.get('name') or item)
+            description = item.get('description', '')
+            html_parts.append(f"<li><strong>{title}</strong>: {_escape(description)}</li>" if description
+                              else f"<li>{title}</li>")
+        else:
+            html_parts.append(f"<li>{_escape(item)}</li>")
+    html_parts.append("</ul>")
+    return "".join(html_parts)
+
+def render_response(response: str, theme: str = 'dark') -> str:
+    """Render a reply (JSON, Markdown or plain text) to the HTML shown in its bubble."""
+    colors = DARK_COLORS if theme == 'dark' else LIGHT_COLORS
+    stripped = strip_code_fences(response)
+    if stripped[:1] in ('{', '[') and stripped[-1:] in ('}', ']'):
+        try:
+            data = json.loads(stripped)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            if 'message' in data or 'content' in data or 'response' in data:
+                return render_structured(data)
+            if 'text' in data:
+                response = str(data['text'])
+        elif isinstance(data, list) and data:
+            return render_list(data)
+    return render_markdown(response, colors)
+
+class ResponseRenderer:
+    """Thread-safe LRU cache of rendered replies, keyed by content hash and theme."""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the renderer.
+
+        Args:
+            max_entries: Maximum rendered replies kept
+        """
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def render(self, response: str, theme: str = 'dark') -> str:
+        """Render a reply, reusing the cached HTML if it was rendered before."""
+        key = (hashlib.sha1(response.encode('utf-8')).hexdigest(), theme)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats['hits'] += 1
+                return cached
+            self._stats['misses'] += 1
+
+        rendered = render_response(response, theme)
+        with self._lock:
+            self._cache[key] = rendered
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return rendered
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._cache)
+        return stats
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+def get_response_renderer() -> ResponseRenderer:
+    """Get the shared renderer, creating it on first use."""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = ResponseRenderer()
+    return _renderer
@@ -1,4 +1,5 @@
 import sys
+import time
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QStackedWidget,
     QFrame, QPushButton, QLabel, QScrollArea, QSplitter, QApplication
@@ -6,28 +7,187 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QIcon
 from src.utils.config import Config
-from src.ui.styles import (
-    get_main_window_style, get_sidebar_button_style, 
-    get_button_style, get_label_style, DARK_COLORS, LIGHT_COLORS
-)
+from src.utils.logger import get_logger
+from src.ui.theme import register_stylesheet, apply_theme, set_theme_root
 from src.ui.widgets.dashboard import DashboardWidget
 from src.ui.widgets.voice_assistant import VoiceAssistantWidget
 from src.ui.widgets.scheduler import SchedulerWidget
 from src.ui.widgets.chat_assistant import ChatAssistantWidget
 from src.ui.widgets.settings import SettingsWidget
 
+logger = get_logger(__name__)
+
+STYLESHEET = """
+    MainWindow {{
+        background-color: {background};
+        color: {text_primary};
+    }}
+
+    QWidget {{
+        background-color: transparent;
+        color: {text_primary};
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }}
+
+    /* Sidebar */
+    QFrame#sidebar {{
+        background-color: {surface};
+        border-right: 1px solid {border};
+    }}
+
+    /* Content area */
+    QFrame#content {{
+        background-color: {background};
+    }}
+
+    /* Cards */
+    QFrame.card {{
+        background-color: {surface};
+        border: 1px solid {border};
+        border-radius: 12px;
+        padding: 16px;
+    }}
+
+    QFrame.card:hover {{
+        background-color: {surface_hover};
+        border-color: {border_light};
+    }}
+
+    /* Sidebar styles */
+    QFrame#sidebar {{
+        background-color: {surface};
+        border-right: 1px solid {border};
+    }}
+
+    QLabel#appTitle {{
+        color: {text_primary};
+        font-size: 20px;
+        font-weight: 600;
+        margin-bottom: 4px;
+    }}
+
+    QLabel#userLabel {{
+        color: {text_secondary};
+        font-size: 12px;
+        font-weight: 400;
+    }}
+
+    QPushButton#navButton {{
+        background-color: transparent;
+        color: {text_secondary};
+        border: none;
+        border-radius: 8px;
+        padding: 12px 16px;
+        text-align: left;
+        font-size: 14px;
+        font-weight: 400;
+        min-height: 20px;
+    }}
+
+    QPushButton#navButton:hover {{
+        background-color: {surface_hover};
+        color: {text_primary};
+    }}
+
+    QPushButton#navButton:checked {{
+        background-color: {primary};
+        color: #FFFFFF;
+    }}
+
+    QPushButton#navButton:checked:hover {{
+        background-color: {primary_hover};
+    }}
+    QLabel#versionLabel, QLabel#statusLabel {{
+        color: {text_secondary};
+        font-size: 11px;
+    }}
+
+    QFrame#userFrame {{
+        background-color: {background};
+        border: 1px solid {border};
+        border-radius: 8px;
+    }}
+
+    QLabel#userAvatar {{
+        background-color: {primary};
+        color: #FFFFFF;
+        border-radius: 16px;
+        font-size: 12px;
+        font-weight: 600;
+    }}
+
+    QLabel#userName {{
+        color: {text_primary};
+        font-size: 13px;
+        font-weight: 500;
+    }}
+
+    QLabel#userEmail {{
+        color: {text_secondary};
+        font-size: 11px;
+        font-weight: 400;
+    }}
+
+    /* Content area styles */
+    QFrame#content {{
+        background-color: {background};
+    }}
+
+    QLabel#pageTitle {{
+        color: {text_primary};
+        font-size: 28px;
+        font-weight: 600;
+    }}
+
+    QPushButton#quickActionBtn {{
+        background-color: {primary};
+        color: #FFFFFF;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-size: 13px;
+        font-weight: 500;
+    }}
+
+    QPushButton#quickActionBtn:hover {{
+        background-color: {primary_hover};
+    }}
+
+    QPushButton#iconBtn {{
+        background-color: {surface};
+        color: {text_secondary};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-size: 14px;
+        min-width: 20px;
+    }}
+
+    QPushButton#iconBtn:hover {{
+        background-color: {surface_hover};
+        color: {text_primary};
+    }}
+"""
+
+register_stylesheet("MainWindow", STYLESHEET, base=True)
+
 class MainWindow(QMainWindow):
     """Modern main window for Study Helper."""
     
     def __init__(self, auth_token=None, auth_service=None):
         super().__init__()
+        self.started_at = time.perf_counter()
+        self.startup_timeline = []
+        self.first_frame_shown = False
         self.auth_token = auth_token
         self.auth_service = auth_service
         self.current_page = "dashboard"
         self.current_theme = "dark"  # Default to dark mode
+        set_theme_root(self)
         self.setup_ui()
         self.setup_styles()
         self.setup_connections()
+        self.mark_startup("window constructed")
         
     def setup_ui(self):
         """Setup the user interface."""
@@ -173,17 +333,18 @@ class MainWindow(QMainWindow):
         
         # Stacked widget for different pages
         self.stacked_widget = QStackedWidget()
-          # Create and add page widgets
-        self.pages = {
-            "dashboard": DashboardWidget(self.auth_token),
-            "voice": VoiceAssistantWidget(),
-            "scheduler": SchedulerWidget(),
-            "chat": ChatAssistantWidget(),
-            "settings": SettingsWidget()
-        }
         
-        for page_widget in self.pages.values():
-            self.stacked_widget.addWidget(page_widget)
+        # Pages are built on first use; the voice page alone opens the
+        # microphone and calibrates for ambient noise for about a second
+        self.page_factories = {
+            "dashboard": lambda: DashboardWidget(self.auth_token),
+            "voice": VoiceAssistantWidget,
+            "scheduler": SchedulerWidget,
+            "chat": ChatAssistantWidget,
+            "settings": SettingsWidget
+        }
+        self.pages = {}
+        self.get_page(self.current_page)
         
         layout.addWidget(self.stacked_widget)
         
@@ -222,133 +383,73 @@ class MainWindow(QMainWindow):
         return header_frame
     def setup_styles(self):
         """Apply modern styling."""
-        colors = DARK_COLORS if self.current_theme == 'dark' else LIGHT_COLORS
-        
-        # Main window style
-        self.setStyleSheet(get_main_window_style(self.current_theme) + f"""
-            
-            /* Sidebar styles */
-            QFrame#sidebar {{
-                background-color: {colors['surface']};
-                border-right: 1px solid {colors['border']};
-            }}
-            
-            QLabel#appTitle {{
-                color: {colors['text_primary']};
-                font-size: 20px;
-                font-weight: 600;
-                margin-bottom: 4px;
-            }}
-            
-            QLabel#userLabel {{
-                color: {colors['text_secondary']};
-                font-size: 12px;
-                font-weight: 400;
-            }}
-            
-            QPushButton#navButton {{
-                background-color: transparent;
-                color: {colors['text_secondary']};
-                border: none;
-                border-radius: 8px;
-                padding: 12px 16px;
-                text-align: left;
-                font-size: 14px;
-                font-weight: 400;
-                min-height: 20px;
-            }}
-            
-            QPushButton#navButton:hover {{
-                background-color: {colors['surface_hover']};
-                color: {colors['text_primary']};
-            }}
-            
-            QPushButton#navButton:checked {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-            }}
-            
-            QPushButton#navButton:checked:hover {{
-                background-color: {colors['primary_hover']};
-            }}
-              QLabel#versionLabel, QLabel#statusLabel {{
-                color: {colors['text_secondary']};
-                font-size: 11px;
-            }}
-            
-            QFrame#userFrame {{
-                background-color: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-            }}
-            
-            QLabel#userAvatar {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-                border-radius: 16px;
-                font-size: 12px;
-                font-weight: 600;
-            }}
-            
-            QLabel#userName {{
-                color: {colors['text_primary']};
-                font-size: 13px;
-                font-weight: 500;
-            }}
-            
-            QLabel#userEmail {{
-                color: {colors['text_secondary']};
-                font-size: 11px;
-                font-weight: 400;
-            }}
-            
-            /* Content area styles */
-            QFrame#content {{
-                background-color: {colors['background']};
-            }}
-            
-            QLabel#pageTitle {{
-                color: {colors['text_primary']};
-                font-size: 28px;
-                font-weight: 600;
-            }}
-            
-            QPushButton#quickActionBtn {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-size: 13px;
-                font-weight: 500;
-            }}
-            
-            QPushButton#quickActionBtn:hover {{
-                background-color: {colors['primary_hover']};
-            }}
-            
-            QPushButton#iconBtn {{
-                background-color: {colors['surface']};
-                color: {colors['text_secondary']};
-                border: 1px solid {colors['border']};
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-size: 14px;
-                min-width: 20px;
-            }}
-            
-            QPushButton#iconBtn:hover {{
-                background-color: {colors['surface_hover']};
-                color: {colors['text_primary']};
-            }}
-        """)
+        apply_theme(self.current_theme)
     
     def setup_connections(self):
         pass
     
+    def mark_startup(self, event, cost_ms=None):
+        """Record an event on the startup timeline."""
+        self.startup_timeline.append({
+            'event': event,
+            'at_ms': (time.perf_counter() - self.started_at) * 1000,
+            'cost_ms': cost_ms
+        })
+    
+    def startup_report(self):
+        """Format the startup timeline as one line per event."""
+        lines = []
+        for entry in self.startup_timeline:
+            cost = f" ({entry['cost_ms']:.1f} ms)" if entry['cost_ms'] is not None else ""
+            lines.append(f"{entry['at_ms']:9.1f} ms  {entry['event']}{cost}")
+        return "\n".join(lines)
+    
+    def get_page(self, page_key, reason="opened"):
+        """Get a page widget, building it on first use."""
+        page_widget = self.pages.get(page_key)
+        if page_widget is not None:
+            return page_widget
+        
+        start = time.perf_counter()
+        page_widget = self.page_factories[page_key]()
+        if hasattr(page_widget, 'update_theme') and page_widget.current_theme != self.current_theme:
+            page_widget.update_theme(self.current_theme)
+        self.pages[page_key] = page_widget
+        self.stacked_widget.addWidget(page_widget)
+        cost_ms = (time.perf_counter() - start) * 1000
+        
+        self.mark_startup(f"{page_key} page {reason}", cost_ms)
+        logger.info(f"Built {page_key} page in {cost_ms:.1f} ms ({reason})")
+        return page_widget
+    
+    def showEvent(self, event):
+        """Schedule the post-startup work once the first frame is up."""
+        super().showEvent(event)
+        if not self.first_frame_shown:
+            self.first_frame_shown = True
+            QTimer.singleShot(0, self.on_first_frame)
+    
+    def on_first_frame(self):
+        """Log the startup timeline and start pre-warming pages."""
+        self.mark_startup("first frame")
+        logger.info(f"Startup timeline:\n{self.startup_report()}")
+        self.prewarm_queue = [key for key in Config.PAGE_PREWARM if key in self.page_factories]
+        if self.prewarm_queue:
+            QTimer.singleShot(Config.PAGE_PREWARM_DELAY_MS, self.prewarm_next_page)
+    
+    def prewarm_next_page(self):
+        """Build one queued page, then yield to the event loop before the next."""
+        while self.prewarm_queue:
+            page_key = self.prewarm_queue.pop(0)
+            if page_key not in self.pages:
+                self.get_page(page_key, reason="pre-warmed")
+                break
+        if self.prewarm_queue:
+            QTimer.singleShot(0, self.prewarm_next_page)
+    
     def switch_page(self, page_key):
         """Switch to a different page."""
-        if page_key not in self.pages:
+        if page_key not in self.page_factories:
             return
         
         for key, button in self.nav_buttons.items():
@@ -364,7 +465,7 @@ class MainWindow(QMainWindow):
         }
         self.page_title.setText(titles.get(page_key, "Unknown"))
         
-        page_widget = self.pages[page_key]
+        page_widget = self.get_page(page_key)
         self.stacked_widget.setCurrentWidget(page_widget)
         self.current_page = page_key
         
@@ -381,7 +482,7 @@ class MainWindow(QMainWindow):
         # Reapply styles with new theme
         self.setup_styles()
         
-        # Update all page widgets if they support theme switching
+        # Update the built page widgets; the rest pick up the theme when built
         for page_widget in self.pages.values():
             if hasattr(page_widget, 'update_theme'):
                 page_widget.update_theme(self.current_theme)
@@ -0,0 +1,211 @@
+"""
+Event-loop stall detection for the GUI thread.
+
+A heartbeat QTimer on the GUI thread records when the event loop last ran
+it, and the gap between beats gives the event-loop latency. A monitor
+thread checks the heartbeat; while it is overdue by more than the stall
+threshold, the monitor samples the GUI thread's Python stack every sample
+interval. Each sample is charged to its stall site, the innermost frame in
+the application's own code, so time spent inside requests, json or Qt is
+attributed to the call that made it. Once the loop recovers, the stall is
+closed with its full duration.
+
+The aggregated report (sites by total stalled time, with a sample stack
+for each) is shown in the Settings advanced tab.
+"""
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Optional, Dict, List, Any
+from PyQt5.QtCore import QTimer
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Frames under this directory are the application's own code
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+def _stall_site(stack: List[traceback.FrameSummary]) -> str:
+    """Innermost application frame of a stack, as 'path:line in function'."""
+    for frame in reversed(stack):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(_APP_ROOT) and filename != _THIS_FILE:
+            return f"{os.path.relpath(filename, _APP_ROOT)}:{frame.lineno} in {frame.name}"
+    if stack:
+        frame = stack[-1]
+        return f"{os.path.basename(frame.filename)}:{frame.lineno} in {frame.name}"
+    return "<no Python frame>"
+
+class StallWatchdog:
+    """Heartbeat-based stall detector with a sampling profile of stall sites."""
+
+    def __init__(self, interval_ms: Optional[int] = None, threshold_ms: Optional[int] = None,
+                 sample_ms: Optional[int] = None):
+        """
+        Initialize the watchdog.
+
+        Args:
+            interval_ms: Heartbeat period on the GUI thread
+            threshold_ms: Overdue time after which the loop counts as stalled
+            sample_ms: Stack sampling period while a stall lasts
+        """
+        self.config = Config()
+        self.interval_ms = interval_ms or self.config.STALL_HEARTBEAT_MS
+        self.threshold_ms = threshold_ms or self.config.STALL_THRESHOLD_MS
+        self.sample_ms = sample_ms or self.config.STALL_SAMPLE_MS
+
+        self._timer = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._gui_thread_id = None
+        self._last_beat = 0.0
+        self._current = None  # Samples of the stall in progress: {site: count}
+        self._sites = {}  # site -> {'stalls', 'samples', 'total_ms', 'max_ms', 'stack'}
+        self._recent = deque(maxlen=20)  # (ended_at, duration_ms, top site)
+        self._latency = deque(maxlen=600)  # Heartbeat lateness in ms
+        self._stats = {'beats': 0, 'stalls': 0, 'stalled_ms': 0.0, 'max_stall_ms': 0.0}
+
+    @property
+    def running(self) -> bool:
+        """Whether the heartbeat and monitor are active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the heartbeat and monitor. Call from the GUI thread."""
+        if self.running:
+            return
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._timer = QTimer()
+        self._timer.setInterval(self.interval_ms)
+        self._timer.timeout.connect(self._beat)
+        self._timer.start()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._monitor, name="stall-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Stall watchdog started (heartbeat={self.interval_ms}ms, threshold={self.threshold_ms}ms)")
+
+    def stop(self):
+        """Stop the heartbeat and monitor."""
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self._stop.set()
+
+    def _beat(self):
+        now = time.monotonic()
+        with self._lock:
+            gap_ms = (now - self._last_beat) * 1000
+            self._last_beat = now
+            self._stats['beats'] += 1
+            self._latency.append(max(gap_ms - self.interval_ms, 0.0))
+            if self._current is not None:
+                self._close_stall(max(gap_ms - self.interval_ms, 0.0))
+
+    def _close_stall(self, duration_ms: float):
+        """Charge a finished stall to the sites sampled during it."""
+        samples = self._current
+        self._current = None
+        total = sum(samples.values())
+        for site, count in samples.items():
+            entry = self._sites[site]
+            entry['stalls'] += 1
+            entry['total_ms'] += duration_ms * count / total
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+        top_site = max(samples, key=samples.get)
+        self._recent.append((time.time(), duration_ms, top_site))
+        self._stats['stalls'] += 1
+        self._stats['stalled_ms'] += duration_ms
+        self._stats['max_stall_ms'] = max(self._stats['max_stall_ms'], duration_ms)
+        logger.warning(f"GUI thread stalled for {duration_ms:.0f} ms at {top_site}")
+
+    def _monitor(self):
+        while not self._stop.wait(self.sample_ms / 1000):
+            with self._lock:
+                overdue_ms = (time.monotonic() - self._last_beat) * 1000 - self.interval_ms
+            if overdue_ms >= self.threshold_ms:
+                self._sample()
+
+    def _sample(self):
+        """Record the GUI thread's current stack against the stall in progress."""
+        frame = sys._current_frames().get(self._gui_thread_id)
+        stack = traceback.extract_stack(frame) if frame is not None else []
+        site = _stall_site(stack)
+        with self._lock:
+            if self._current is None:
+                self._current = {}
+            self._current[site] = self._current.get(site, 0) + 1
+            entry = self._sites.setdefault(site, {'stalls': 0, 'samples': 0, 'total_ms': 0.0,
+                                                  'max_ms': 0.0, 'stack': None})
+            entry['samples'] += 1
+            entry['stack'] = ''.join(traceback.format_list(stack[-12:]))
+
+    def reset(self):
+        """Forget recorded stalls and latency."""
+        with self._lock:
+            self._current = None
+            self._sites.clear()
+            self._recent.clear()
+            self._latency.clear()
+            self._stats = {'beats': 0, 'stalls': 0, 'stalled_ms': 0.0, 'max_stall_ms': 0.0}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get stall counts and event-loop latency percentiles."""
+        with self._lock:
+            stats = dict(self._stats)
+            latency = sorted(self._latency)
+            stats['sites'] = len(self._sites)
+        stats['latency_p50_ms'] = latency[len(latency) // 2] if latency else 0.0
+        stats['latency_p95_ms'] = latency[int(len(latency) * 0.95)] if latency else 0.0
+        stats['latency_max_ms'] = latency[-1] if latency else 0.0
+        return stats
+
+    def report(self, top: int = 10) -> str:
+        """Format stall sites by total stalled time, with a sample stack for each."""
+        stats = self.stats()
+        with self._lock:
+            sites = sorted(self._sites.items(), key=lambda item: item[1]['total_ms'], reverse=True)[:top]
+            sites = [(site, dict(entry)) for site, entry in sites]
+            recent = list(self._recent)
+
+        lines = [
+            f"Event-loop latency: p50 {stats['latency_p50_ms']:.1f} ms, p95 {stats['latency_p95_ms']:.1f} ms, "
+            f"max {stats['latency_max_ms']:.1f} ms (last {self.interval_ms * 600 // 1000}s)",
+            f"Stalls over {self.threshold_ms} ms: {stats['stalls']}, {stats['stalled_ms']:.0f} ms in total, "
+            f"longest {stats['max_stall_ms']:.0f} ms",
+        ]
+        if not sites:
+            lines.append("\nNo stalls recorded.")
+            return '\n'.join(lines)
+
+        lines.append("\nStall sites by total time:")
+        for site, entry in sites:
+            lines.append(f"\n{entry['total_ms']:8.0f} ms  {entry['stalls']:3d} stalls  "
+                         f"{entry['samples']:4d} samples  max {entry['max_ms']:.0f} ms  {site}")
+            if entry['stack']:
+                lines.append(entry['stack'].rstrip())
+        if recent:
+            lines.append("\nRecent stalls:")
+            for ended_at, duration_ms, site in reversed(recent):
+                lines.append(f"  {time.strftime('%H:%M:%S', time.localtime(ended_at))}  "
+                             f"{duration_ms:6.0f} ms  {site}")
+        return '\n'.join(lines)
+
+_watchdog = None
+_watchdog_lock = threading.Lock()
+
+def get_stall_watchdog() -> StallWatchdog:
+    """Get the shared watchdog, creating it on first use."""
+    global _watchdog
+    if _watchdog is None:
+        with _watchdog_lock:
+            if _watchdog is None:
+                _watchdog = StallWatchdog()
+    return _watchdog
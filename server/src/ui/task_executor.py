@@ -0,0 +1,316 @@
+"""
+Shared background task executor for UI widgets.
+
+Widgets used to start a new QThread per request and keep only the latest
+one, so rapid clicks left earlier threads running unreferenced. Work now
+goes to one QThreadPool whose threads are reused between tasks. Each
+submitted task gets a Task handle on the GUI thread with a cancellation
+token and an optional timeout; results, progress and errors are routed
+back to the GUI thread through queued signals, and nothing is delivered
+after a task has been cancelled or has timed out. Cancelling runs no
+callbacks at all: the caller that cancels a task restores its own state,
+so a superseded task cannot undo the state set up for its replacement.
+
+A running Python function cannot be interrupted, so cancellation is
+cooperative: the function calls task.token.check() (or passes
+task.token.deadline to calls that accept one) and stops early.
+"""
+import threading
+import time
+from typing import Optional, Dict, Any, Callable
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, QCoreApplication, pyqtSignal
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TaskCancelled(Exception):
+    """Raised inside a task once its token has been cancelled or has timed out."""
+
+class CancellationToken:
+    """Thread-safe cancellation flag with an optional deadline."""
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Initialize the token.
+
+        Args:
+            timeout: Seconds after which the token counts as cancelled
+        """
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.reason = None
+        self._event = threading.Event()
+
+    def cancel(self, reason: str = 'cancelled'):
+        """Cancel the token; the first reason given is kept."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token was cancelled or its deadline has passed."""
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel('timeout')
+        return self._event.is_set()
+
+    def check(self):
+        """Raise TaskCancelled if the token has been cancelled."""
+        if self.cancelled:
+            raise TaskCancelled(self.reason)
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to seconds, returning early with True if cancelled."""
+        return self._event.wait(seconds) or self.cancelled
+
+class Task(QObject):
+    """GUI-thread handle of one submitted task."""
+
+    _progress = pyqtSignal(tuple)
+    _succeeded = pyqtSignal(object)
+    _failed = pyqtSignal(str)
+    _stopped = pyqtSignal()
+    _exited = pyqtSignal()
+    exited = pyqtSignal()  # On the GUI thread, once the function has returned
+
+    def __init__(self, executor, name: str, token: CancellationToken,
+                 on_result: Optional[Callable] = None, on_error: Optional[Callable] = None,
+                 on_progress: Optional[Callable] = None, on_finished: Optional[Callable] = None):
+        super().__init__()
+        self.executor = executor
+        self.name = name
+        self.token = token
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.outcome = None  # Set once: completed, failed, cancelled or timed_out
+        self._alive = True
+
+        # Emitted from the pool thread, delivered on the GUI thread
+        self._progress.connect(self._deliver_progress)
+        self._succeeded.connect(self._deliver_result)
+        self._failed.connect(self._deliver_error)
+        self._stopped.connect(self._deliver_stop)
+        self._exited.connect(self._release)
+
+    def report(self, *values):
+        """Send progress values to the GUI thread; call from the task function."""
+        self._progress.emit(values)
+
+    def cancel(self):
+        """Cancel the task without running any callback; later results are dropped."""
+        if self.outcome is None:
+            self.token.cancel()
+            self._finish('cancelled', notify=False)
+
+    def is_running(self) -> bool:
+        """Whether the task is queued or running and not yet finished or cancelled."""
+        return self.outcome is None
+
+    def is_alive(self) -> bool:
+        """Whether the function is still queued or running, even if the task was cancelled."""
+        return self._alive
+
+    def _finish(self, outcome: str, notify: bool = True):
+        self.outcome = outcome
+        self.executor._record_outcome(outcome)
+        if notify and self.on_finished:
+            self.on_finished()
+
+    def _deliver_progress(self, values):
+        if self.outcome is None and self.on_progress:
+            self.on_progress(*values)
+
+    def _deliver_result(self, value):
+        if self.outcome is None:
+            if self.on_result:
+                self.on_result(value)
+            self._finish('completed')
+
+    def _deliver_error(self, message: str):
+        if self.outcome is None:
+            if self.on_error:
+                self.on_error(message)
+            self._finish('failed')
+
+    def _deliver_stop(self):
+        # The function noticed the token itself, before the GUI-side timer fired
+        if self.outcome is None:
+            if self.token.reason == 'timeout':
+                self._time_out()
+            else:
+                self._finish('cancelled')
+
+    def _time_out(self):
+        if self.outcome is None:
+            self.token.cancel('timeout')
+            if self.on_error:
+                self.on_error(f"{self.name} timed out")
+            self._finish('timed_out')
+
+    def _release(self):
+        self._alive = False
+        self.executor._release(self)
+        self.exited.emit()
+
+class _TaskRunnable(QRunnable):
+    """Pool-side half of a task; owned and deleted by the QThreadPool."""
+
+    def __init__(self, task: Task, fn: Callable, args: tuple, kwargs: Dict[str, Any]):
+        super().__init__()
+        self.task = task
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.queued_at = time.monotonic()
+
+    def run(self):
+        task = self.task
+        started_at = time.monotonic()
+        task.executor._record_start(started_at - self.queued_at)
+        try:
+            task.token.check()
+            result = self.fn(task, *self.args, **self.kwargs)
+            task._succeeded.emit(result)
+        except TaskCancelled:
+            task._stopped.emit()
+        except Exception as e:
+            logger.error(f"Task {task.name} failed: {e}")
+            task._failed.emit(str(e))
+        finally:
+            task.executor._record_stop(time.monotonic() - started_at)
+            task._exited.emit()
+
+class TaskExecutor:
+    """QThreadPool wrapper with cancellation, timeouts and queue metrics."""
+
+    def __init__(self, max_threads: Optional[int] = None, expiry_ms: Optional[int] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            max_threads: Maximum pool threads running tasks at once
+            expiry_ms: Idle time after which a pool thread exits
+        """
+        self.config = Config()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads or self.config.TASK_POOL_MAX_THREADS)
+        self.pool.setExpiryTimeout(expiry_ms or self.config.TASK_POOL_EXPIRY_MS)
+
+        self._tasks = set()  # Handles kept alive until their function returns
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'timed_out': 0,
+            'peak_queued': 0,
+            'wait_seconds': 0.0,
+            'run_seconds': 0.0,
+            'runs': 0
+        }
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def submit(self, fn: Callable, *args, name: Optional[str] = None, timeout: Optional[float] = None,
+               on_result: Optional[Callable] = None, on_error: Optional[Callable] = None,
+               on_progress: Optional[Callable] = None, on_finished: Optional[Callable] = None,
+               **kwargs) -> Task:
+        """
+        Run fn(task, *args, **kwargs) on a pool thread. Call from the GUI thread.
+
+        Args:
+            fn: Function to run; receives the Task handle first
+            name: Label used in logs and timeout messages
+            timeout: Seconds before the task is abandoned with an error
+            on_result: Called with fn's return value
+            on_error: Called with the error message if fn raises or times out
+            on_progress: Called with the values passed to task.report()
+            on_finished: Called exactly once when the task completes, fails
+                or times out; not when it is cancelled through cancel()
+
+        Returns:
+            Task handle
+        """
+        task = Task(self, name or getattr(fn, '__name__', 'task'), CancellationToken(timeout),
+                    on_result, on_error, on_progress, on_finished)
+        with self._lock:
+            self._tasks.add(task)
+            self._queued += 1
+            self._stats['submitted'] += 1
+            self._stats['peak_queued'] = max(self._stats['peak_queued'], self._queued)
+        if timeout:
+            QTimer.singleShot(int(timeout * 1000), task._time_out)
+        self.pool.start(_TaskRunnable(task, fn, args, kwargs))
+        return task
+
+    def _record_start(self, waited: float):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._stats['wait_seconds'] += waited
+
+    def _record_stop(self, ran: float):
+        with self._lock:
+            self._active -= 1
+            self._stats['runs'] += 1
+            self._stats['run_seconds'] += ran
+
+    def _record_outcome(self, outcome: str):
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def _release(self, task: Task):
+        with self._lock:
+            self._tasks.discard(task)
+
+    def cancel_all(self):
+        """Cancel every queued and running task."""
+        with self._lock:
+            tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+
+    def shutdown(self, wait_ms: int = 3000):
+        """Cancel outstanding tasks and wait briefly for the pool threads to stop."""
+        self.cancel_all()
+        if not self.pool.waitForDone(wait_ms):
+            logger.warning("Background tasks still running at shutdown")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get task outcome counts, queue depth, active workers and average timings.
+
+        cancelled_running counts cancelled or timed-out tasks whose function
+        has not returned yet; they still hold a pool thread and are included
+        in queued or active.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['queued'] = self._queued
+            stats['active'] = self._active
+            stats['cancelled_running'] = sum(1 for task in self._tasks if task.outcome is not None)
+        stats['threads'] = self.pool.activeThreadCount()
+        stats['max_threads'] = self.pool.maxThreadCount()
+        runs = stats.pop('runs')
+        stats['avg_wait_ms'] = stats.pop('wait_seconds') * 1000 / runs if runs else 0.0
+        stats['avg_run_ms'] = stats.pop('run_seconds') * 1000 / runs if runs else 0.0
+        return stats
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_task_executor() -> TaskExecutor:
+    """Get the shared executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = TaskExecutor()
+    return _executor
@@ -0,0 +1,118 @@
+"""
+Application-wide theme stylesheets.
+
+Widgets register their stylesheet once, at import, as a template with
+color placeholders such as ``{surface}`` and ``{text_primary}``. Each rule
+is scoped to the widget's class name, so several widgets can style the same
+object name differently from one shared stylesheet. The complete stylesheet
+for a theme is compiled on first use and cached. Switching theme is then a
+single setStyleSheet() call on the top-level window (the theme root), which
+restyles every page in one pass, instead of every widget rebuilding and
+re-applying its own sheet. QApplication.setStyleSheet() is only the fallback
+when no root is set: it replaces the application style and re-polishes
+every widget in the process, which measured about twice as slow.
+
+State changes on a single widget (a button that starts listening, say) go
+through dynamic properties with set_state(), matched by selectors like
+``QPushButton#primaryButton[listening="true"]``, so nothing is recompiled.
+"""
+import re
+import time
+from typing import Dict, Any
+from PyQt5.QtWidgets import QApplication
+from src.ui.styles import DARK_COLORS, LIGHT_COLORS
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_RULE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+
+_templates = []  # (base, scope, template) in registration order
+_compiled = {}  # theme -> stylesheet
+_applied = None
+_root = None
+_stats = {'compiles': 0, 'applies': 0, 'skipped': 0, 'last_compile_ms': 0.0, 'last_apply_ms': 0.0}
+
+def scope_stylesheet(scope: str, stylesheet: str) -> str:
+    """Prefix every selector with the scope's class name, unless it already starts with it."""
+    rules = []
+    for selectors, body in _RULE.findall(_COMMENT.sub('', stylesheet)):
+        scoped = []
+        for selector in selectors.split(','):
+            selector = selector.strip()
+            if selector == scope or selector.startswith(scope + ' '):
+                scoped.append(selector)
+            else:
+                scoped.append(f"{scope} {selector}")
+        rules.append(f"{', '.join(scoped)} {{{body.rstrip()}\n}}")
+    return '\n'.join(rules)
+
+def register_stylesheet(scope: str, template: str, base: bool = False):
+    """
+    Register a widget class's stylesheet template.
+
+    Args:
+        scope: Class name the rules are scoped to
+        template: Stylesheet with {color} placeholders; literal braces doubled
+        base: Emit before the widget sheets, so those win ties (for the main window)
+    """
+    _templates.append((base, scope, template))
+    _compiled.clear()
+
+def compile_stylesheet(theme: str = 'dark') -> str:
+    """Get the complete stylesheet for a theme, compiling it on first use."""
+    stylesheet = _compiled.get(theme)
+    if stylesheet is None:
+        start = time.perf_counter()
+        colors = DARK_COLORS if theme == 'dark' else LIGHT_COLORS
+        ordered = [entry for entry in _templates if entry[0]] + [entry for entry in _templates if not entry[0]]
+        stylesheet = '\n'.join(scope_stylesheet(scope, template.format(**colors))
+                               for _, scope, template in ordered)
+        _compiled[theme] = stylesheet
+        _stats['compiles'] += 1
+        _stats['last_compile_ms'] = (time.perf_counter() - start) * 1000
+    return stylesheet
+
+def set_theme_root(widget):
+    """Apply themes to this top-level widget and everything inside it."""
+    global _root, _applied
+    _root = widget
+    _applied = None
+
+def apply_theme(theme: str = 'dark'):
+    """Apply a theme to the theme root; a no-op if it is already applied."""
+    global _applied
+    target = _root if _root is not None else QApplication.instance()
+    stylesheet = compile_stylesheet(theme)
+    if target is None or stylesheet is _applied:
+        _stats['skipped'] += 1
+        return
+    start = time.perf_counter()
+    target.setStyleSheet(stylesheet)
+    _applied = stylesheet
+    _stats['applies'] += 1
+    _stats['last_apply_ms'] = (time.perf_counter() - start) * 1000
+    logger.debug(f"Applied {theme} theme in {_stats['last_apply_ms']:.1f} ms")
+
+def ensure_theme(theme: str = 'dark'):
+    """Apply a theme only if none has been applied yet, e.g. for a widget shown on its own."""
+    if _applied is None:
+        apply_theme(theme)
+
+def set_state(widget, name: str, value: Any):
+    """Set a dynamic property and restyle just that widget."""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
+def theme_stats() -> Dict[str, Any]:
+    """Get compile and apply counters with the last timings."""
+    stats = dict(_stats)
+    stats['templates'] = len(_templates)
+    stats['cached_themes'] = sorted(_compiled)
+    return stats
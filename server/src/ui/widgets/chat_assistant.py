@@ -3,33 +3,185 @@ Chat Assistant widget for Study Helper application.
 """
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLabel, 
-    QPushButton, QTextEdit, QLineEdit, QScrollArea, QListWidget, QListWidgetItem
+    QPushButton, QLineEdit, QScrollArea, QListWidget, QListWidgetItem
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QTextCursor
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
 from src.features.chat_assistant import ChatAssistant
-from src.ui.styles import DARK_COLORS, LIGHT_COLORS
+from src.features.prefetcher import SuggestionPrefetcher
+from src.ui.chat_renderer import get_response_renderer
+from src.ui.task_executor import get_task_executor
+from src.ui.widgets.chat_view import ChatMessageModel, ChatListView, ChatBubbleDelegate
+from src.utils.json_extract import IncrementalJSONExtractor, starts_as_json
+from src.ui.theme import register_stylesheet, apply_theme, ensure_theme
 import datetime
-import json
+import html
 
-class ChatWorkerThread(QThread):
-    """Worker thread for chat processing."""
-    
-    response_ready = pyqtSignal(str)
-    error_occurred = pyqtSignal(str)
-    
-    def __init__(self, chat_assistant, message):
-        super().__init__()
-        self.chat_assistant = chat_assistant
-        self.message = message
+# List keys in structured replies whose entries are previewed while streaming
+STREAMED_LIST_KEYS = ('actionItems', 'suggestions', 'tips', 'questions')
+
+def run_chat_request(task, chat_assistant, message, stream=True, theme='dark'):
+    """
+    Fetch and render one chat reply on a pool thread.
     
-    def run(self):
-        """Process chat message."""
-        try:
-            response = self.chat_assistant.get_response(self.message)
-            self.response_ready.emit(response)
-        except Exception as e:
-            self.error_occurred.emit(str(e))
+    Streamed text is reported as ('delta', text) and previewed structured
+    entries as ('item', key, item). Returns the reply and its rendered HTML.
+    """
+    if stream:
+        parts = []
+        extractor = IncrementalJSONExtractor(keys=STREAMED_LIST_KEYS)
+        structured = None
+        for delta in chat_assistant.stream_response(message, deadline=task.token.deadline):
+            # Stops reading (and closes) the stream once the task is cancelled
+            task.token.check()
+            parts.append(delta)
+            if structured is None:
+                # JSON replies are previewed entry by entry instead of as raw text;
+                # text is held back until the first token tells which this is
+                structured = starts_as_json(''.join(parts))
+                if structured is None:
+                    continue
+                delta = ''.join(parts)
+            if structured:
+                for key, item in extractor.feed(delta):
+                    task.report('item', key or '', item)
+            else:
+                task.report('delta', delta)
+        response = ''.join(parts)
+        if structured is None and response:
+            task.report('delta', response)
+    else:
+        response = chat_assistant.get_response(message, deadline=task.token.deadline)
+    # Render here so the GUI thread only inserts finished HTML
+    return response, get_response_renderer().render(response, theme)
+
+STYLESHEET = """
+    QFrame#headerCard, QFrame#chatCard, QFrame#actionsCard {{
+        background-color: {surface};
+        border: 1px solid {border};
+        border-radius: 12px;
+    }}
+
+    QFrame#inputFrame {{
+        background-color: {background};
+        border: 1px solid {border};
+        border-radius: 8px;
+    }}
+
+    QLabel#headerTitle {{
+        color: {text_primary};
+        font-size: 20px;
+        font-weight: 600;
+    }}
+
+    QLabel#headerSubtitle {{
+        color: {text_secondary};
+        font-size: 14px;
+        font-weight: 400;
+    }}
+
+    QLabel#sectionTitle {{
+        color: {text_primary};
+        font-size: 14px;
+        font-weight: 600;
+        margin-bottom: 8px;
+    }}
+
+    QAbstractItemView#chatDisplay {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 16px;
+        font-size: 14px;
+        font-family: "Segoe UI", Arial, sans-serif;
+    }}
+
+    QLineEdit#messageInput {{
+        background-color: transparent;
+        color: {text_primary};
+        border: none;
+        padding: 8px 12px;
+        font-size: 14px;
+    }}
+
+    QPushButton#sendButton {{
+        background-color: {primary};
+        color: #FFFFFF;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-size: 14px;
+        font-weight: 500;
+        min-width: 60px;
+    }}
+
+    QPushButton#sendButton:hover {{
+        background-color: {primary_hover};
+    }}
+
+    QPushButton#clearButton {{
+        background-color: {secondary};
+        color: {text_primary};
+        border: none;
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-size: 14px;
+        font-weight: 500;
+    }}
+
+    QPushButton#clearButton:hover {{
+        background-color: {border_light};
+    }}
+
+    QPushButton#actionButton {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 10px 12px;
+        font-size: 13px;
+        font-weight: 400;
+        text-align: left;
+    }}
+
+    QPushButton#actionButton:hover {{
+        background-color: {surface_hover};
+        border-color: {primary};
+        color: {primary};
+    }}
+
+    QListWidget#suggestionsList {{
+        background-color: {background};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 8px;
+        outline: none;
+        max-height: 200px;
+    }}
+
+    QListWidget#suggestionsList::item {{
+        background-color: transparent;
+        color: {text_secondary};
+        padding: 8px 12px;
+        border-radius: 6px;
+        margin: 2px 0;
+        font-size: 12px;
+    }}
+
+    QListWidget#suggestionsList::item:hover {{
+        background-color: {surface_hover};
+        color: {text_primary};
+        cursor: pointer;
+    }}
+
+    QListWidget#suggestionsList::item:selected {{
+        background-color: {primary};
+        color: #FFFFFF;
+    }}
+"""
+
+register_stylesheet('ChatAssistantWidget', STYLESHEET)
 
 class ChatAssistantWidget(QWidget):
     """Chat assistant interface widget."""
@@ -37,12 +189,18 @@ class ChatAssistantWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.chat_assistant = ChatAssistant()
-        self.worker_thread = None
-        self.chat_history = []
+        self.executor = get_task_executor()
+        self.chat_task = None
+        self.stream_row = None
+        self.stream_parts = []
         self.current_theme = "dark"
+        self.quick_action_messages = []
+        self.prefetcher = SuggestionPrefetcher(self.chat_assistant) if self.chat_assistant.config.PREFETCH_ENABLED else None
         self.setup_ui()
         self.setup_styles()
         self.add_welcome_message()
+        self.restore_transcript()
+        self.setup_prefetch()
         
     def setup_ui(self):
         """Setup the user interface."""
@@ -95,10 +253,19 @@ class ChatAssistantWidget(QWidget):
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(16)
         
-        # Chat display
-        self.chat_display = QTextEdit()
+        # Chat display: only the visible messages are laid out and painted
+        self.chat_model = ChatMessageModel(self)
+        self.chat_display = ChatListView()
         self.chat_display.setObjectName("chatDisplay")
-        self.chat_display.setReadOnly(True)
+        self.chat_delegate = ChatBubbleDelegate(self.chat_display, self.current_theme)
+        self.chat_display.setItemDelegate(self.chat_delegate)
+        self.chat_display.setModel(self.chat_model)
+        
+        # Streamed text is flushed to the preview bubble at most every 50 ms
+        self.stream_timer = QTimer(self)
+        self.stream_timer.setSingleShot(True)
+        self.stream_timer.setInterval(50)
+        self.stream_timer.timeout.connect(self.flush_stream_preview)
         
         # Input area
         input_frame = self.create_input_area()
@@ -177,6 +344,7 @@ class ChatAssistantWidget(QWidget):
         ]
         
         for icon_text, message in actions:
+            self.quick_action_messages.append(message)
             button = QPushButton(icon_text)
             button.setObjectName("actionButton")
             button.clicked.connect(lambda checked, msg=message: self.send_quick_message(msg))
@@ -220,140 +388,37 @@ class ChatAssistantWidget(QWidget):
 
         return frame
     
+    def setup_prefetch(self):
+        """Prefetch answers for visible suggestions once the user has been idle."""
+        if self.prefetcher is None:
+            return
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(self.chat_assistant.config.PREFETCH_IDLE_MS)
+        self.prefetch_timer.timeout.connect(self.prefetch_suggestions)
+        self.message_input.textEdited.connect(self.schedule_prefetch)
+        self.schedule_prefetch()
+    
+    def schedule_prefetch(self, *args):
+        """Restart the idle countdown before prefetching."""
+        if self.prefetcher is not None:
+            self.prefetch_timer.start()
+    
+    def prefetch_suggestions(self):
+        """Prefetch answers for the suggestions and quick actions on screen."""
+        if self.chat_task is not None and self.chat_task.is_running():
+            return
+        suggestions = [self.suggestions_list.item(i).text().replace('💡 ', '')
+                       for i in range(self.suggestions_list.count())]
+        self.prefetcher.prefetch(suggestions + self.quick_action_messages)
+    
     def setup_styles(self):
         """Apply styling to the chat assistant widget."""
-        colors = DARK_COLORS if self.current_theme == 'dark' else LIGHT_COLORS
-        
-        self.setStyleSheet(f"""
-            QFrame#headerCard, QFrame#chatCard, QFrame#actionsCard {{
-                background-color: {colors['surface']};
-                border: 1px solid {colors['border']};
-                border-radius: 12px;
-            }}
-            
-            QFrame#inputFrame {{
-                background-color: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-            }}
-            
-            QLabel#headerTitle {{
-                color: {colors['text_primary']};
-                font-size: 20px;
-                font-weight: 600;
-            }}
-            
-            QLabel#headerSubtitle {{
-                color: {colors['text_secondary']};
-                font-size: 14px;
-                font-weight: 400;
-            }}
-            
-            QLabel#sectionTitle {{
-                color: {colors['text_primary']};
-                font-size: 14px;
-                font-weight: 600;
-                margin-bottom: 8px;
-            }}
-            
-            QTextEdit#chatDisplay {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 16px;
-                font-size: 14px;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }}
-            
-            QLineEdit#messageInput {{
-                background-color: transparent;
-                color: {colors['text_primary']};
-                border: none;
-                padding: 8px 12px;
-                font-size: 14px;
-            }}
-            
-            QPushButton#sendButton {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-size: 14px;
-                font-weight: 500;
-                min-width: 60px;
-            }}
-            
-            QPushButton#sendButton:hover {{
-                background-color: {colors['primary_hover']};
-            }}
-            
-            QPushButton#clearButton {{
-                background-color: {colors['secondary']};
-                color: {colors['text_primary']};
-                border: none;
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            
-            QPushButton#clearButton:hover {{
-                background-color: {colors['border_light']};
-            }}
-            
-            QPushButton#actionButton {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 10px 12px;
-                font-size: 13px;
-                font-weight: 400;
-                text-align: left;
-            }}
-            
-            QPushButton#actionButton:hover {{
-                background-color: {colors['surface_hover']};
-                border-color: {colors['primary']};
-                color: {colors['primary']};
-            }}
-            
-            QListWidget#suggestionsList {{
-                background-color: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 8px;
-                outline: none;
-                max-height: 200px;
-            }}
-            
-            QListWidget#suggestionsList::item {{
-                background-color: transparent;
-                color: {colors['text_secondary']};
-                padding: 8px 12px;
-                border-radius: 6px;
-                margin: 2px 0;
-                font-size: 12px;
-            }}
-            
-            QListWidget#suggestionsList::item:hover {{
-                background-color: {colors['surface_hover']};
-                color: {colors['text_primary']};
-                cursor: pointer;
-            }}
-            
-            QListWidget#suggestionsList::item:selected {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-            }}
-        """)
+        ensure_theme(self.current_theme)
     
     def add_welcome_message(self):
         """Add welcome message to chat."""
         welcome_msg = """
-        <div style='padding: 12px; background-color: #3B82F6; border-radius: 8px; margin-bottom: 16px; color: white;'>
         <strong>🤖 Study Assistant</strong><br>
         Hello! I'm here to help you with your studies. You can ask me questions about:
         <ul>
@@ -364,9 +429,8 @@ class ChatAssistantWidget(QWidget):
         <li>Learning strategies</li>
         </ul>
         How can I assist you today?
-        </div>
         """
-        self.chat_display.setHtml(welcome_msg)
+        self.chat_model.append_message(ChatMessageModel.NOTICE, welcome_msg)
     
     def send_message(self):
         """Send a message."""
@@ -379,256 +443,139 @@ class ChatAssistantWidget(QWidget):
     
     def send_quick_message(self, message):
         """Send a quick message."""
+        # A newer question supersedes one still in flight
+        if self.chat_task is not None and self.chat_task.is_running():
+            self.chat_task.cancel()
+            self.discard_stream_preview()
+        
         # Add user message to chat
         self.add_message_to_chat(message, is_user=True)
         
+        # A prefetched answer renders without a round trip
+        prefetched = self.prefetcher.take(message) if self.prefetcher is not None else None
+        if prefetched is not None:
+            self.chat_assistant.accept_prefetched(message, prefetched)
+            self.on_response_ready(prefetched)
+            self.on_response_finished()
+            return
+        
+        # The user is waiting now; queued prefetches and summaries give way
+        self.chat_assistant.scheduler.cancel_background()
+        
         # Disable input while processing
         self.message_input.setEnabled(False)
         self.send_button.setEnabled(False)
         self.send_button.setText("...")
-          # Start worker thread for AI response
-        self.worker_thread = ChatWorkerThread(self.chat_assistant, message)
-        self.worker_thread.response_ready.connect(self.on_response_ready)
-        self.worker_thread.error_occurred.connect(self.on_response_error)
-        self.worker_thread.finished.connect(self.on_response_finished)
-        self.worker_thread.start()
+        
+        # Fetch the AI response on the shared worker pool
+        self.chat_task = self.executor.submit(
+            run_chat_request, self.chat_assistant, message, theme=self.current_theme,
+            name="Chat request",
+            timeout=self.chat_assistant.config.CHAT_TASK_TIMEOUT,
+            on_progress=self.on_response_progress,
+            on_result=lambda result: self.on_response_ready(*result),
+            on_error=self.on_response_error,
+            on_finished=self.on_response_finished
+        )
     
-    def add_message_to_chat(self, message, is_user=True):
-        """Add a message to the chat display."""
-        timestamp = datetime.datetime.now().strftime("%H:%M")
+    def add_message_to_chat(self, message, is_user=True, timestamp=None):
+        """
+        Add a message to the chat display.
         
-        # Get theme colors
-        colors = DARK_COLORS if self.current_theme == 'dark' else LIGHT_COLORS
+        User messages are plain text; assistant messages may be HTML.
+        """
+        timestamp = timestamp or datetime.datetime.now().strftime("%H:%M")
         
         if is_user:
-            message_html = f"""
-            <div style='margin-bottom: 16px; text-align: right;'>
-                <div style='display: inline-block; background-color: {colors['primary']}; color: white; padding: 12px 16px; border-radius: 18px 18px 4px 18px; max-width: 70%; word-wrap: break-word;'>
-                    {message}
-                </div>
-                <div style='font-size: 11px; color: {colors['text_secondary']}; margin-top: 4px;'>
-                    You • {timestamp}
-                </div>
-            </div>
-            """
+            self.chat_model.append_message(ChatMessageModel.USER, html.escape(message), timestamp)
         else:
-            # For assistant messages, handle both plain text and HTML
             formatted_message = message
             if not ('<p>' in message or '<ul>' in message or '<strong>' in message):
                 # Plain text - wrap in paragraph
                 formatted_message = f"<p>{message}</p>"
-                
-            message_html = f"""
-            <div style='margin-bottom: 16px;'>
-                <div style='display: inline-block; background-color: {colors['surface']}; color: {colors['text_primary']}; padding: 12px 16px; border-radius: 18px 18px 18px 4px; max-width: 70%; word-wrap: break-word; border: 1px solid {colors['border']};'>
-                    {formatted_message}
-                </div>
-                <div style='font-size: 11px; color: {colors['text_secondary']}; margin-top: 4px;'>
-                    Assistant • {timestamp}
-                </div>
-            </div>
-            """
-          # Append to chat display
-        cursor = self.chat_display.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertHtml(message_html)
-        
-        # Scroll to bottom
-        scrollbar = self.chat_display.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
-        
-        # Store in history
-        self.chat_history.append({
-            'message': message,
-            'is_user': is_user,
-            'timestamp': timestamp
-        })
+            self.chat_model.append_message(ChatMessageModel.ASSISTANT, formatted_message, timestamp)
 
-    def on_response_ready(self, response):
-        """Handle AI response."""
-        # Try to parse as JSON first
-        try:
-            # Handle JSON responses (check for JSON structure)
-            response_stripped = response.strip()
-            if (response_stripped.startswith('{') and response_stripped.endswith('}')) or \
-               (response_stripped.startswith('[') and response_stripped.endswith(']')):
-                data = json.loads(response_stripped)
-                
-                # Handle different JSON response formats
-                if isinstance(data, dict):
-                    if 'message' in data or 'content' in data or 'response' in data:
-                        formatted_response = self.format_structured_response(data)
-                        self.add_message_to_chat(formatted_response, is_user=False)
-                        return
-                    elif 'text' in data:
-                        # Simple text response in JSON
-                        self.add_message_to_chat(data['text'], is_user=False)
-                        return
-                elif isinstance(data, list) and len(data) > 0:
-                    # Handle array responses
-                    formatted_response = self.format_list_response(data)
-                    self.add_message_to_chat(formatted_response, is_user=False)
-                    return
-        except (json.JSONDecodeError, KeyError, TypeError):
-            pass
-        
-        # Try to detect and format markdown-like responses
-        if self.has_markdown_elements(response):
-            formatted_response = self.format_markdown_response(response)
-            self.add_message_to_chat(formatted_response, is_user=False)
+    def on_response_progress(self, kind, *values):
+        """Route streamed progress from the worker to the preview."""
+        if kind == 'delta':
+            self.append_stream_delta(*values)
+        else:
+            self.append_stream_item(*values)
+    
+    def append_stream_delta(self, delta):
+        """Append a streamed text delta to the in-progress assistant message."""
+        if self.stream_row is None:
+            # First delta opens the in-progress bubble
+            timestamp = datetime.datetime.now().strftime("%H:%M")
+            self.stream_row = self.chat_model.append_message(ChatMessageModel.ASSISTANT, '', timestamp)
+            self.stream_parts = []
+        self.stream_parts.append(delta)
+        if not self.stream_timer.isActive():
+            self.stream_timer.start()
+    
+    def flush_stream_preview(self):
+        """Show the text streamed so far; the finished message is formatted once."""
+        if self.stream_row is None:
             return
-        
-        # Fallback to plain text response
-        self.add_message_to_chat(response, is_user=False)
+        text = html.escape(''.join(self.stream_parts)).replace('\n', '<br>')
+        self.chat_model.set_message_html(self.stream_row, f"<p>{text}</p>")
     
-    def format_structured_response(self, data):
-        """Format a structured JSON response into HTML."""
-        html_parts = []
-        
-        # Handle different possible message keys
-        message_content = data.get('message') or data.get('content') or data.get('response') or data.get('text', '')
-        if message_content:
-            html_parts.append(f"<p>{message_content}</p>")
+    def append_stream_item(self, key, item):
+        """Preview one completed entry of a streamed structured reply."""
+        if isinstance(item, dict):
+            text = item.get('title') or item.get('question') or item.get('name') or ''
+        else:
+            text = str(item)
+        if text:
+            self.append_stream_delta(f"• {text}\n")
+    
+    def discard_stream_preview(self):
+        """Remove the in-progress streamed text before the final message is added."""
+        if self.stream_row is None:
+            return
         
-        # Suggestions
-        if 'suggestions' in data and data['suggestions']:
-            html_parts.append("<br><strong>💡 Study Tips:</strong>")
-            html_parts.append("<ul>")
-            for suggestion in data['suggestions']:
-                html_parts.append(f"<li>{suggestion}</li>")
-            html_parts.append("</ul>")
-        
-        # Action Items
-        if 'actionItems' in data and data['actionItems']:
-            html_parts.append("<br><strong>📋 Action Items:</strong>")
-            html_parts.append("<ul>")
-            for item in data['actionItems']:
-                if isinstance(item, str):
-                    html_parts.append(f"<li>{item}</li>")
-                elif isinstance(item, dict):
-                    title = item.get('title', 'Task')
-                    description = item.get('description', '')
-                    priority = item.get('priority', 'medium')
-                    time_estimate = item.get('estimatedTime', '')
-                    
-                    priority_emoji = {
-                        'high': '🔴',
-                        'medium': '🟡', 
-                        'low': '🟢'
-                    }.get(priority.lower(), '🔵')
-                    
-                    item_text = f"{priority_emoji} <strong>{title}</strong>"
-                    if description:
-                        item_text += f": {description}"
-                    if time_estimate:
-                        item_text += f" <em>({time_estimate} min)</em>"
-                    
-                    html_parts.append(f"<li>{item_text}</li>")
-            html_parts.append("</ul>")
-        
-        # Study tips (alternative to suggestions)
-        if 'tips' in data and data['tips']:
-            html_parts.append("<br><strong>📚 Study Tips:</strong>")
-            html_parts.append("<ul>")
-            for tip in data['tips']:
-                html_parts.append(f"<li>{tip}</li>")
-            html_parts.append("</ul>")
-        
-        # Resources
-        if 'resources' in data and data['resources']:
-            html_parts.append("<br><strong>📖 Resources:</strong>")
-            html_parts.append("<ul>")
-            for resource in data['resources']:
-                if isinstance(resource, str):
-                    html_parts.append(f"<li>{resource}</li>")
-                elif isinstance(resource, dict) and 'name' in resource:
-                    name = resource['name']
-                    url = resource.get('url', '')
-                    if url:
-                        html_parts.append(f"<li><a href='{url}' target='_blank'>{name}</a></li>")
-                    else:
-                        html_parts.append(f"<li>{name}</li>")
-            html_parts.append("</ul>")
-        
-        # Confidence level (if available)
-        if 'confidence' in data and isinstance(data['confidence'], (int, float)) and data['confidence'] < 0.7:
-            html_parts.append("<br><small><em>Note: This response has lower confidence. Please verify the information.</em></small>")
-        
-        return "".join(html_parts) if html_parts else "<p>No content available</p>"
+        self.stream_timer.stop()
+        self.chat_model.remove_message(self.stream_row)
+        self.stream_row = None
+        self.stream_parts = []
     
-    def format_list_response(self, data_list):
-        """Format a list response into HTML."""
-        html_parts = ["<ul>"]
-        for item in data_list:
-            if isinstance(item, str):
-                html_parts.append(f"<li>{item}</li>")
-            elif isinstance(item, dict):
-                # Try to format structured list items
-                title = item.get('title') or item.get('name') or str(item)
-                description = item.get('description', '')
-                if description:
-                    html_parts.append(f"<li><strong>{title}</strong>: {description}</li>")
-                else:
-                    html_parts.append(f"<li>{title}</li>")
-        html_parts.append("</ul>")
-        return "".join(html_parts)
+    def restore_transcript(self):
+        """Show the end of the saved transcript from previous runs."""
+        for record in self.chat_assistant.get_transcript():
+            timestamp = datetime.datetime.fromtimestamp(record.get('time', 0)).strftime("%H:%M")
+            if record.get('role') == 'user':
+                self.add_message_to_chat(record.get('text', ''), is_user=True, timestamp=timestamp)
+            else:
+                self.add_assistant_response(record.get('text', ''), timestamp=timestamp)
     
-    def has_markdown_elements(self, text):
-        """Check if text contains markdown-like elements."""
-        markdown_patterns = [
-            '**', '*', '##', '#', '- ', '* ', '1. ', '2. ', '3. ',
-            '[', '](', '`', '```', '---', '___'
-        ]
-        return any(pattern in text for pattern in markdown_patterns)
+    def on_response_ready(self, response, html=None):
+        """Handle AI response."""
+        self.discard_stream_preview()
+        self.add_assistant_response(response, html=html)
+    
+    def add_assistant_response(self, response, timestamp=None, html=None):
+        """
+        Add an AI response to the chat display.
+        
+        Args:
+            response: Reply text (JSON, Markdown or plain text)
+            timestamp: Optional display time
+            html: Reply already rendered off the GUI thread, if available
+        """
+        if html is None:
+            html = get_response_renderer().render(response, self.current_theme)
+        self.add_message_to_chat(html, is_user=False, timestamp=timestamp)
     
-    def format_markdown_response(self, text):
-        """Convert basic markdown elements to HTML."""
-        # Convert headers
-        text = text.replace('### ', '<h3>').replace('## ', '<h2>').replace('# ', '<h1>')
-        
-        # Convert bold text
-        import re
-        text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
-        text = re.sub(r'\*(.*?)\*', r'<em>\1</em>', text)
-        
-        # Convert inline code
-        text = re.sub(r'`(.*?)`', r'<code>\1</code>', text)
-        
-        # Convert lists
-        lines = text.split('\n')
-        in_list = False
-        result_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('- ') or line.startswith('* '):
-                if not in_list:
-                    result_lines.append('<ul>')
-                    in_list = True
-                result_lines.append(f'<li>{line[2:]}</li>')
-            elif line.startswith(('1. ', '2. ', '3. ', '4. ', '5. ')):
-                if not in_list:
-                    result_lines.append('<ol>')
-                    in_list = True
-                result_lines.append(f'<li>{line[3:]}</li>')
-            else:
-                if in_list:
-                    result_lines.append('</ul>' if lines[result_lines.__len__()-1].startswith('<li>') else '</ol>')
-                    in_list = False
-                if line:
-                    result_lines.append(f'<p>{line}</p>')
-                else:
-                    result_lines.append('<br>')
-        
-        if in_list:
-            result_lines.append('</ul>')
-        
-        return ''.join(result_lines)
-
     def clear_chat(self):
-        """Clear the chat display."""
-        self.chat_display.clear()
-        self.chat_history.clear()
+        """Clear the chat display and the conversation behind it."""
+        if self.chat_task is not None and self.chat_task.is_running():
+            self.chat_task.cancel()
+            self.on_response_finished()
+        self.stream_timer.stop()
+        self.chat_model.clear()
+        self.chat_assistant.clear_history()
+        self.stream_row = None
+        self.stream_parts = []
         self.add_welcome_message()
     
     def refresh(self):
@@ -639,11 +586,14 @@ class ChatAssistantWidget(QWidget):
     def update_theme(self, theme):
         """Update the widget theme."""
         self.current_theme = theme
-        self.setup_styles()
+        self.chat_delegate.set_theme(theme)
+        apply_theme(theme)
+        self.chat_display.viewport().update()
         
     def on_response_error(self, error_msg):
         """Handle AI response error."""
-        error_response = f"Sorry, I encountered an error: {error_msg}"
+        self.discard_stream_preview()
+        error_response = f"Sorry, I encountered an error: {html.escape(str(error_msg))}"
         self.add_message_to_chat(error_response, is_user=False)
     
     def on_response_finished(self):
@@ -652,6 +602,7 @@ class ChatAssistantWidget(QWidget):
         self.send_button.setEnabled(True)
         self.send_button.setText("Send")
         self.message_input.setFocus()
+        self.schedule_prefetch()
 
     def on_suggestion_clicked(self, item):
         """Handle suggestion click."""
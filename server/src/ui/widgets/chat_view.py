@@ -0,0 +1,560 @@
+"""
+Virtualized chat message list for the Chat Assistant widget.
+
+Messages live in a ChatMessageModel as HTML strings. ChatListView lays out
+and paints only the rows in the viewport: row heights are kept in a Fenwick
+tree, so appending, scrolling and hit-testing cost O(log n) however long
+the session is. ChatBubbleDelegate draws each message as a bubble from a
+QTextDocument, and documents are kept in an LRU cache under a fixed memory
+budget, so off-screen rows cost only their HTML string. Right-click or
+Ctrl+C copies a message as plain text.
+"""
+import math
+from array import array
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+from PyQt5.QtWidgets import QAbstractItemView, QStyledItemDelegate, QStyleOptionViewItem, QApplication, QMenu
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize
+from PyQt5.QtGui import (
+    QPainter, QTextDocument, QAbstractTextDocumentLayout, QPalette, QColor, QFont, QFontMetrics, QPen, QRegion,
+    QKeySequence
+)
+from src.ui.styles import DARK_COLORS, LIGHT_COLORS
+from src.utils.config import Config
+
+class ChatMessageModel(QAbstractListModel):
+    """List model of chat messages: kind, HTML body and timestamp."""
+
+    USER = 'user'
+    ASSISTANT = 'assistant'
+    NOTICE = 'notice'  # Full-width banner such as the welcome message
+
+    KindRole = Qt.UserRole + 1
+    TimestampRole = Qt.UserRole + 2
+    KeyRole = Qt.UserRole + 3  # (message id, revision); changes whenever the HTML does
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._messages = []  # (kind, html, timestamp, message id, revision)
+        self._next_id = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._messages)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._messages):
+            return None
+        kind, html, timestamp, message_id, revision = self._messages[index.row()]
+        if role == Qt.DisplayRole:
+            return html
+        if role == self.KindRole:
+            return kind
+        if role == self.TimestampRole:
+            return timestamp
+        if role == self.KeyRole:
+            return (message_id, revision)
+        return None
+
+    def append_message(self, kind: str, html: str, timestamp: str = '') -> int:
+        """Append a message and return its row."""
+        row = len(self._messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._messages.append((kind, html, timestamp, self._next_id, 0))
+        self._next_id += 1
+        self.endInsertRows()
+        return row
+
+    def set_message_html(self, row: int, html: str):
+        """Replace the HTML of a message, e.g. while a reply streams in."""
+        kind, _, timestamp, message_id, revision = self._messages[row]
+        self._messages[row] = (kind, html, timestamp, message_id, revision + 1)
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def message_html(self, row: int) -> str:
+        """HTML body of a message."""
+        return self._messages[row][1]
+
+    def remove_message(self, row: int):
+        """Remove one message."""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._messages[row]
+        self.endRemoveRows()
+
+    def clear(self):
+        """Remove all messages."""
+        self.beginResetModel()
+        self._messages = []
+        self.endResetModel()
+
+class DocumentCache:
+    """LRU cache of laid-out QTextDocuments bounded by estimated memory."""
+
+    def __init__(self, budget_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            budget_bytes: Estimated memory all cached documents may use
+        """
+        self.budget_bytes = budget_bytes
+        self._documents = OrderedDict()  # key -> (document, cost)
+        self._bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def estimate_cost(document: QTextDocument) -> int:
+        """Rough memory held by a document's text, formats and layout."""
+        return 2048 + 64 * document.characterCount()
+
+    def get(self, key) -> Optional[QTextDocument]:
+        entry = self._documents.get(key)
+        if entry is None:
+            self._stats['misses'] += 1
+            return None
+        self._documents.move_to_end(key)
+        self._stats['hits'] += 1
+        return entry[0]
+
+    def put(self, key, document: QTextDocument):
+        cost = self.estimate_cost(document)
+        self._documents[key] = (document, cost)
+        self._bytes += cost
+        # Always keep the newest document, even if it alone exceeds the budget
+        while self._bytes > self.budget_bytes and len(self._documents) > 1:
+            _, (_, evicted_cost) = self._documents.popitem(last=False)
+            self._bytes -= evicted_cost
+            self._stats['evictions'] += 1
+
+    def clear(self):
+        self._documents.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get entry count, estimated bytes and hit/eviction counters."""
+        stats = dict(self._stats)
+        stats['entries'] = len(self._documents)
+        stats['bytes'] = self._bytes
+        stats['budget_bytes'] = self.budget_bytes
+        return stats
+
+class ChatBubbleDelegate(QStyledItemDelegate):
+    """Paints chat messages as bubbles from cached rich-text documents."""
+
+    PADDING_H = 16
+    PADDING_V = 12
+    SPACING = 16  # Gap below each message
+    RADIUS = 14
+    MAX_BUBBLE_RATIO = 0.7
+
+    def __init__(self, parent=None, theme: str = 'dark', cache_bytes: Optional[int] = None):
+        super().__init__(parent)
+        config = Config()
+        self.theme = theme
+        self.documents = DocumentCache(cache_bytes or config.CHAT_DOCUMENT_CACHE_MB * 1024 * 1024)
+        self.font = QFont()
+        self.meta_font = QFont()
+        self.meta_font.setPixelSize(11)
+        self.meta_height = QFontMetrics(self.meta_font).height() + 4
+
+    def set_theme(self, theme: str):
+        """Switch colors; documents for the other theme age out of the cache."""
+        self.theme = theme
+
+    @property
+    def colors(self) -> Dict[str, str]:
+        return DARK_COLORS if self.theme == 'dark' else LIGHT_COLORS
+
+    def _text_width(self, kind: str, row_width: int) -> int:
+        if kind == ChatMessageModel.NOTICE:
+            return max(row_width - 2 * self.PADDING_H, 1)
+        return max(int(row_width * self.MAX_BUBBLE_RATIO) - 2 * self.PADDING_H, 1)
+
+    def document(self, index: QModelIndex, row_width: int) -> QTextDocument:
+        """Get the laid-out document for a message at a row width."""
+        kind = index.data(ChatMessageModel.KindRole)
+        text_width = self._text_width(kind, row_width)
+        key = (index.data(ChatMessageModel.KeyRole), text_width, self.theme)
+        document = self.documents.get(key)
+        if document is not None:
+            return document
+
+        document = QTextDocument()
+        document.setDocumentMargin(0)
+        document.setDefaultFont(self.font)
+        document.setHtml(index.data(Qt.DisplayRole) or '')
+        document.setTextWidth(text_width)
+        if kind != ChatMessageModel.NOTICE:
+            # Short messages get a bubble that hugs the text
+            document.setTextWidth(min(text_width, math.ceil(document.idealWidth())))
+        self.documents.put(key, document)
+        return document
+
+    def sizeHint(self, option, index):
+        document = self.document(index, option.rect.width())
+        height = math.ceil(document.size().height()) + 2 * self.PADDING_V + self.SPACING
+        if index.data(ChatMessageModel.KindRole) != ChatMessageModel.NOTICE:
+            height += self.meta_height
+        return QSize(option.rect.width(), height)
+
+    def paint(self, painter, option, index):
+        kind = index.data(ChatMessageModel.KindRole)
+        colors = self.colors
+        document = self.document(index, option.rect.width())
+        size = document.size()
+
+        bubble_width = math.ceil(size.width()) + 2 * self.PADDING_H
+        bubble_height = math.ceil(size.height()) + 2 * self.PADDING_V
+        if kind == ChatMessageModel.USER:
+            x = option.rect.right() - bubble_width
+            background, border = colors['primary'], None
+        elif kind == ChatMessageModel.NOTICE:
+            x = option.rect.left()
+            bubble_width = option.rect.width()
+            background, border = colors['primary'], None
+        else:
+            x = option.rect.left()
+            background, border = colors['surface'], colors['border']
+        bubble = QRectF(x, option.rect.top(), bubble_width, bubble_height)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor(border)) if border else Qt.NoPen)
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(bubble.adjusted(0.5, 0.5, -0.5, -0.5), self.RADIUS, self.RADIUS)
+        painter.translate(x + self.PADDING_H, option.rect.top() + self.PADDING_V)
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.Text, QColor(colors['text_primary'] if kind == ChatMessageModel.ASSISTANT
+                                                       else '#FFFFFF'))
+        document.documentLayout().draw(painter, context)
+        painter.restore()
+
+        if kind != ChatMessageModel.NOTICE:
+            author = "You" if kind == ChatMessageModel.USER else "Assistant"
+            meta_rect = QRect(option.rect.left(), option.rect.top() + bubble_height + 4,
+                              option.rect.width(), self.meta_height)
+            painter.save()
+            painter.setFont(self.meta_font)
+            painter.setPen(QColor(colors['text_secondary']))
+            alignment = Qt.AlignRight if kind == ChatMessageModel.USER else Qt.AlignLeft
+            painter.drawText(meta_rect, alignment | Qt.AlignTop, f"{author} • {index.data(ChatMessageModel.TimestampRole)}")
+            painter.restore()
+
+class _OffsetTree:
+    """Fenwick tree over row heights: O(log n) append, update, prefix sum and search."""
+
+    def __init__(self):
+        self._tree = array('q', [0])  # 1-based
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def prefix(self, count: int) -> int:
+        """Sum of the first count heights."""
+        total = 0
+        tree = self._tree
+        while count > 0:
+            total += tree[count]
+            count &= count - 1
+        return total
+
+    def append(self, value: int):
+        position = self._size + 1
+        # Node position covers (position - lowbit, position]
+        value += self.prefix(position - 1) - self.prefix(position - (position & -position))
+        if position < len(self._tree):
+            self._tree[position] = value
+        else:
+            self._tree.append(value)
+        self._size = position
+
+    def pop(self):
+        self._size -= 1
+
+    def add(self, row: int, delta: int):
+        position = row + 1
+        tree = self._tree
+        while position <= self._size:
+            tree[position] += delta
+            position += position & -position
+
+    def find(self, offset: int) -> int:
+        """Row containing the given offset (clamped to the last row)."""
+        position = 0
+        step = 1 << self._size.bit_length()
+        tree = self._tree
+        while step:
+            next_position = position + step
+            if next_position <= self._size and tree[next_position] <= offset:
+                position = next_position
+                offset -= tree[next_position]
+            step >>= 1
+        return min(position, max(self._size - 1, 0))
+
+class ChatListView(QAbstractItemView):
+    """Item view that only measures and paints the rows it shows."""
+
+    ESTIMATED_ROW_HEIGHT = 80  # Used for rows not yet measured at the current width
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._heights = array('i')
+        self._measured = array('i')  # Layout generation each height was measured at
+        self._offsets = _OffsetTree()
+        self._generation = 0
+        self._layout_width = 0
+
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.verticalScrollBar().setSingleStep(24)
+
+    # Layout bookkeeping
+
+    def _row_option(self) -> QStyleOptionViewItem:
+        option = self.viewOptions()
+        option.rect = QRect(0, 0, self.viewport().width(), 0)
+        return option
+
+    def _measure(self, row: int, option: Optional[QStyleOptionViewItem] = None) -> int:
+        """Measure a row at the current width and update its offset."""
+        if option is None:
+            option = self._row_option()
+        height = self.itemDelegate().sizeHint(option, self.model().index(row, 0)).height()
+        self._offsets.add(row, height - self._heights[row])
+        self._heights[row] = height
+        self._measured[row] = self._generation
+        return height
+
+    def _rebuild(self):
+        """Forget all measurements; rows are re-measured as they are shown."""
+        count = self.model().rowCount() if self.model() is not None else 0
+        self._heights = array('i', [self.ESTIMATED_ROW_HEIGHT]) * count
+        self._measured = array('i', [-1]) * count
+        self._offsets = _OffsetTree()
+        for _ in range(count):
+            self._offsets.append(self.ESTIMATED_ROW_HEIGHT)
+        self._generation += 1
+        self.updateGeometries()
+        self.viewport().update()
+
+    def _at_bottom(self) -> bool:
+        scrollbar = self.verticalScrollBar()
+        return scrollbar.value() >= scrollbar.maximum() - 4
+
+    def total_height(self) -> int:
+        """Height of all rows, measured or estimated."""
+        return self._offsets.prefix(len(self._offsets))
+
+    # Model notifications
+
+    def setModel(self, model):
+        super().setModel(model)
+        self._rebuild()
+
+    def reset(self):
+        super().reset()
+        self._rebuild()
+
+    def rowsInserted(self, parent, start, end):
+        super().rowsInserted(parent, start, end)
+        if parent.isValid():
+            return
+        if start != len(self._heights):
+            self._rebuild()
+            return
+
+        stick = self._at_bottom()
+        option = self._row_option()
+        for row in range(start, end + 1):
+            self._heights.append(0)
+            self._measured.append(-1)
+            self._offsets.append(0)
+            self._measure(row, option)
+        self.updateGeometries()
+        if stick:
+            # Scrolling moves the existing pixels; only the exposed strip is repainted
+            self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        top = self._row_top(start) - self.verticalOffset()
+        self.viewport().update(QRect(0, top, self.viewport().width(), self.viewport().height() - top))
+
+    def rowsAboutToBeRemoved(self, parent, start, end):
+        super().rowsAboutToBeRemoved(parent, start, end)
+        if parent.isValid():
+            return
+        if end == len(self._heights) - 1:
+            for _ in range(start, end + 1):
+                self._offsets.pop()
+            del self._heights[start:]
+            del self._measured[start:]
+        else:
+            # Rare; rebuild the offsets from the surviving heights
+            heights = self._heights[:start] + self._heights[end + 1:]
+            measured = self._measured[:start] + self._measured[end + 1:]
+            self._offsets = _OffsetTree()
+            for height in heights:
+                self._offsets.append(height)
+            self._heights, self._measured = heights, measured
+        self.updateGeometries()
+        self.viewport().update()
+
+    def dataChanged(self, top_left, bottom_right, roles=()):
+        super().dataChanged(top_left, bottom_right, roles)
+        stick = self._at_bottom()
+        option = self._row_option()
+        for row in range(top_left.row(), min(bottom_right.row() + 1, len(self._heights))):
+            self._measure(row, option)
+        self.updateGeometries()
+        if stick:
+            self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        self.viewport().update()
+
+    # Geometry
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.viewport().width() != self._layout_width:
+            # Heights measured at the old width become estimates
+            self._layout_width = self.viewport().width()
+            self._generation += 1
+            self.updateGeometries()
+
+    def updateGeometries(self):
+        scrollbar = self.verticalScrollBar()
+        viewport_height = self.viewport().height()
+        scrollbar.setPageStep(viewport_height)
+        scrollbar.setRange(0, max(0, self.total_height() - viewport_height))
+        super().updateGeometries()
+
+    def verticalOffset(self):
+        return self.verticalScrollBar().value()
+
+    def horizontalOffset(self):
+        return 0
+
+    def _row_top(self, row: int) -> int:
+        return self._offsets.prefix(row)
+
+    def visualRect(self, index):
+        if not index.isValid() or index.row() >= len(self._heights):
+            return QRect()
+        row = index.row()
+        return QRect(0, self._row_top(row) - self.verticalOffset(), self.viewport().width(), self._heights[row])
+
+    def indexAt(self, point):
+        if not self._heights:
+            return QModelIndex()
+        offset = point.y() + self.verticalOffset()
+        if offset < 0 or offset >= self.total_height():
+            return QModelIndex()
+        return self.model().index(self._offsets.find(offset), 0)
+
+    def scrollTo(self, index, hint=QAbstractItemView.EnsureVisible):
+        if not index.isValid():
+            return
+        row = index.row()
+        if self._measured[row] != self._generation:
+            self._measure(row)
+            self.updateGeometries()
+        top = self._row_top(row)
+        bottom = top + self._heights[row]
+        scrollbar = self.verticalScrollBar()
+        viewport_height = self.viewport().height()
+        if hint == QAbstractItemView.PositionAtTop or top < scrollbar.value():
+            scrollbar.setValue(top)
+        elif hint == QAbstractItemView.PositionAtBottom or bottom > scrollbar.value() + viewport_height:
+            scrollbar.setValue(bottom - viewport_height)
+
+    def moveCursor(self, cursor_action, modifiers):
+        return self.currentIndex()
+
+    # Copying
+
+    def message_text(self, index: QModelIndex) -> str:
+        """Plain text of a message, as shown in its bubble."""
+        return self.itemDelegate().document(index, self.viewport().width()).toPlainText()
+
+    def copy_message(self, index: QModelIndex):
+        """Put a message's plain text on the clipboard."""
+        if index.isValid():
+            QApplication.clipboard().setText(self.message_text(index))
+
+    def contextMenuEvent(self, event):
+        index = self.indexAt(event.pos())
+        if not index.isValid():
+            return
+        self.setCurrentIndex(index)
+        menu = QMenu(self)
+        menu.addAction("Copy message", lambda: self.copy_message(index))
+        menu.exec_(event.globalPos())
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            self.copy_message(self.currentIndex())
+            return
+        super().keyPressEvent(event)
+
+    def isIndexHidden(self, index):
+        return False
+
+    def setSelection(self, rect, flags):
+        pass
+
+    def visualRegionForSelection(self, selection):
+        return QRegion()
+
+    # Painting
+
+    def _measure_visible(self):
+        """Measure stale rows in view, keeping the top row (or the bottom) anchored."""
+        if not self._heights:
+            return
+        scrollbar = self.verticalScrollBar()
+        stick = self._at_bottom()
+        first = self._offsets.find(self.verticalOffset())
+        first_offset = self.verticalOffset() - self._row_top(first)
+
+        option = self._row_option()
+        changed = False
+        bottom = self.verticalOffset() + self.viewport().height()
+        row = first
+        while row < len(self._heights):
+            if self._measured[row] != self._generation:
+                self._measure(row, option)
+                changed = True
+            if self._row_top(row) + self._heights[row] >= bottom:
+                break
+            row += 1
+
+        if changed:
+            self.updateGeometries()
+            if stick:
+                scrollbar.setValue(scrollbar.maximum())
+            else:
+                scrollbar.setValue(self._row_top(first) + first_offset)
+
+    def paintEvent(self, event):
+        model = self.model()
+        if model is None or not self._heights:
+            return
+        self._measure_visible()
+
+        painter = QPainter(self.viewport())
+        delegate = self.itemDelegate()
+        option = self._row_option()
+        width = self.viewport().width()
+        exposed = event.rect()
+        offset = self.verticalOffset()
+
+        # Paint only the rows intersecting the exposed area
+        row = self._offsets.find(offset + max(exposed.top(), 0))
+        y = self._row_top(row) - offset
+        while row < len(self._heights) and y <= exposed.bottom():
+            row_height = self._heights[row]
+            option.rect = QRect(0, y, width, row_height)
+            delegate.paint(painter, option, model.index(row, 0))
+            y += row_height
+            row += 1
+        painter.end()
@@ -8,9 +8,105 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 from src.utils.config import Config
-from src.ui.styles import DARK_COLORS, LIGHT_COLORS
+from src.ui.theme import register_stylesheet, apply_theme, ensure_theme
 import datetime
 
+STYLESHEET = """
+    QFrame#welcomeCard, QFrame#activityCard {{
+        background-color: {surface};
+        border: 1px solid {border};
+        border-radius: 12px;
+    }}
+
+    QFrame#statCard {{
+        background-color: {surface};
+        border: 1px solid {border};
+        border-radius: 12px;
+        min-height: 120px;
+    }}
+
+    QFrame#statCard:hover {{
+        background-color: {surface_hover};
+        border-color: {border_light};
+    }}
+
+    QLabel#greeting {{
+        color: {text_primary};
+        font-size: 24px;
+        font-weight: 600;
+    }}
+
+    QLabel#statusMessage {{
+        color: {text_secondary};
+        font-size: 16px;
+        font-weight: 400;
+    }}
+
+    QLabel#dateLabel {{
+        color: {text_secondary};
+        font-size: 14px;
+        font-weight: 400;
+    }}
+
+    QLabel#statValue {{
+        color: {primary};
+        font-size: 32px;
+        font-weight: 700;
+    }}
+
+    QLabel#statTitle {{
+        color: {text_primary};
+        font-size: 14px;
+        font-weight: 500;
+    }}
+
+    QLabel#statSubtitle {{
+        color: {text_secondary};
+        font-size: 12px;
+        font-weight: 400;
+    }}
+
+    QLabel#sectionTitle {{
+        color: {text_primary};
+        font-size: 18px;
+        font-weight: 600;
+    }}
+
+    QPushButton#linkButton {{
+        background-color: transparent;
+        color: {primary};
+        border: none;
+        font-size: 14px;
+        font-weight: 500;
+        padding: 4px 8px;
+    }}
+
+    QPushButton#linkButton:hover {{
+        color: {primary_hover};
+        text-decoration: underline;
+    }}
+
+    QLabel#activityIcon {{
+        color: {text_secondary};
+        font-size: 16px;
+        min-width: 24px;
+    }}
+
+    QLabel#activityText {{
+        color: {text_primary};
+        font-size: 14px;
+        font-weight: 400;
+    }}
+
+    QLabel#activityTime {{
+        color: {text_secondary};
+        font-size: 12px;
+        font-weight: 400;
+    }}
+"""
+
+register_stylesheet("DashboardWidget", STYLESHEET)
+
 class DashboardWidget(QWidget):
     """Modern dashboard widget with overview cards and statistics."""
     
@@ -30,7 +126,7 @@ class DashboardWidget(QWidget):
     def update_theme(self, theme):
         """Update widget theme."""
         self.current_theme = theme
-        self.setup_styles()
+        apply_theme(theme)
         
     def setup_ui(self):
         """Setup the user interface."""
@@ -205,101 +301,7 @@ class DashboardWidget(QWidget):
     
     def setup_styles(self):
         """Apply styling to the dashboard."""
-        colors = DARK_COLORS if self.current_theme == "dark" else LIGHT_COLORS
-        
-        self.setStyleSheet(f"""
-            QFrame#welcomeCard, QFrame#activityCard {{
-                background-color: {colors['surface']};
-                border: 1px solid {colors['border']};
-                border-radius: 12px;
-            }}
-            
-            QFrame#statCard {{
-                background-color: {colors['surface']};
-                border: 1px solid {colors['border']};
-                border-radius: 12px;
-                min-height: 120px;
-            }}
-            
-            QFrame#statCard:hover {{
-                background-color: {colors['surface_hover']};
-                border-color: {colors['border_light']};
-            }}
-            
-            QLabel#greeting {{
-                color: {colors['text_primary']};
-                font-size: 24px;
-                font-weight: 600;
-            }}
-            
-            QLabel#statusMessage {{
-                color: {colors['text_secondary']};
-                font-size: 16px;
-                font-weight: 400;
-            }}
-            
-            QLabel#dateLabel {{
-                color: {colors['text_secondary']};
-                font-size: 14px;
-                font-weight: 400;
-            }}
-            
-            QLabel#statValue {{
-                color: {colors['primary']};
-                font-size: 32px;
-                font-weight: 700;
-            }}
-            
-            QLabel#statTitle {{
-                color: {colors['text_primary']};
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            
-            QLabel#statSubtitle {{
-                color: {colors['text_secondary']};
-                font-size: 12px;
-                font-weight: 400;
-            }}
-            
-            QLabel#sectionTitle {{
-                color: {colors['text_primary']};
-                font-size: 18px;
-                font-weight: 600;
-            }}
-            
-            QPushButton#linkButton {{
-                background-color: transparent;
-                color: {colors['primary']};
-                border: none;
-                font-size: 14px;
-                font-weight: 500;
-                padding: 4px 8px;
-            }}
-            
-            QPushButton#linkButton:hover {{
-                color: {colors['primary_hover']};
-                text-decoration: underline;
-            }}
-            
-            QLabel#activityIcon {{
-                color: {colors['text_secondary']};
-                font-size: 16px;
-                min-width: 24px;
-            }}
-            
-            QLabel#activityText {{
-                color: {colors['text_primary']};
-                font-size: 14px;
-                font-weight: 400;
-            }}
-            
-            QLabel#activityTime {{
-                color: {colors['text_secondary']};
-                font-size: 12px;
-                font-weight: 400;
-            }}
-        """)
+        ensure_theme(self.current_theme)
     
     def load_data(self):
         """Load dashboard data."""
@@ -9,9 +9,181 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QDate, QTime, pyqtSignal
 from PyQt5.QtGui import QFont
 from src.features.scheduler import Scheduler
-from src.ui.styles import DARK_COLORS, LIGHT_COLORS
+from src.ui.theme import register_stylesheet, apply_theme, ensure_theme
 import datetime
 
+STYLESHEET = """
+    QFrame#leftPanel, QFrame#rightPanel {{
+        background-color: transparent;
+    }}
+
+    QFrame#calendarCard, QFrame#addTaskCard, QFrame#todayCard, QFrame#upcomingCard {{
+        background-color: {surface};
+        border: 1px solid {border};
+        border-radius: 12px;
+    }}
+
+    QLabel#sectionTitle {{
+        color: {text_primary};
+        font-size: 16px;
+        font-weight: 600;
+    }}
+
+    QLabel#dateLabel {{
+        color: {text_secondary};
+        font-size: 14px;
+        font-weight: 400;
+    }}
+
+    QLabel#fieldLabel {{
+        color: {text_primary};
+        font-size: 12px;
+        font-weight: 500;
+        margin-bottom: 4px;
+    }}
+
+    QCalendarWidget#calendar {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 8px;
+    }}
+
+    QCalendarWidget#calendar QAbstractItemView {{
+        background-color: {background};
+        color: {text_primary};
+        selection-background-color: {primary};
+    }}
+
+    QLineEdit#taskInput {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 10px 12px;
+        font-size: 14px;
+    }}
+
+    QLineEdit#taskInput:focus {{
+        border-color: {primary};
+    }}
+
+    QTextEdit#taskDescription {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 8px 12px;
+        font-size: 14px;
+    }}
+
+    QTextEdit#taskDescription:focus {{
+        border-color: {primary};
+    }}
+
+    QTimeEdit#timeEdit {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 6px 8px;
+        font-size: 14px;
+    }}
+
+    QComboBox#priorityCombo {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 6px 8px;
+        font-size: 14px;
+        min-width: 80px;
+    }}
+
+    QComboBox#priorityCombo::drop-down {{
+        border: none;
+        width: 20px;
+    }}
+
+    QComboBox#priorityCombo::down-arrow {{
+        image: none;
+        border: none;
+        width: 0px;
+        height: 0px;
+    }}
+
+    QPushButton#primaryButton {{
+        background-color: {primary};
+        color: #FFFFFF;
+        border: none;
+        border-radius: 8px;
+        padding: 12px 24px;
+        font-size: 14px;
+        font-weight: 500;
+        min-height: 20px;
+    }}
+
+    QPushButton#primaryButton:hover {{
+        background-color: {primary_hover};
+    }}
+
+    QPushButton#secondaryButton {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 8px 16px;
+        font-size: 14px;
+        font-weight: 500;
+    }}
+
+    QPushButton#secondaryButton:hover {{
+        background-color: {surface_hover};
+    }}
+
+    QPushButton#linkButton {{
+        background-color: transparent;
+        color: {primary};
+        border: none;
+        font-size: 12px;
+        font-weight: 500;
+        padding: 4px 8px;
+    }}
+
+    QPushButton#linkButton:hover {{
+        color: {primary_hover};
+        text-decoration: underline;
+    }}
+
+    QListWidget#tasksList {{
+        background-color: {background};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 8px;
+        outline: none;
+    }}
+
+    QListWidget#tasksList::item {{
+        background-color: transparent;
+        color: {text_primary};
+        padding: 12px;
+        border-radius: 6px;
+        margin: 2px 0;
+        border-left: 3px solid transparent;
+    }}
+
+    QListWidget#tasksList::item:hover {{
+        background-color: {surface_hover};
+    }}
+
+    QListWidget#tasksList::item:selected {{
+        background-color: {primary};
+        color: #FFFFFF;
+    }}
+"""
+
+register_stylesheet("SchedulerWidget", STYLESHEET)
+
 class SchedulerWidget(QWidget):
     """Scheduler interface widget."""
     
@@ -226,177 +398,7 @@ class SchedulerWidget(QWidget):
         return frame
     def setup_styles(self):
         """Apply styling to the scheduler widget."""
-        colors = DARK_COLORS if self.current_theme == 'dark' else LIGHT_COLORS
-        
-        self.setStyleSheet(f"""
-            QFrame#leftPanel, QFrame#rightPanel {{
-                background-color: transparent;
-            }}
-            
-            QFrame#calendarCard, QFrame#addTaskCard, QFrame#todayCard, QFrame#upcomingCard {{
-                background-color: {colors['surface']};
-                border: 1px solid {colors['border']};
-                border-radius: 12px;
-            }}
-            
-            QLabel#sectionTitle {{
-                color: {colors['text_primary']};
-                font-size: 16px;
-                font-weight: 600;
-            }}
-            
-            QLabel#dateLabel {{
-                color: {colors['text_secondary']};
-                font-size: 14px;
-                font-weight: 400;
-            }}
-            
-            QLabel#fieldLabel {{
-                color: {colors['text_primary']};
-                font-size: 12px;
-                font-weight: 500;
-                margin-bottom: 4px;
-            }}
-            
-            QCalendarWidget#calendar {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-            }}
-            
-            QCalendarWidget#calendar QAbstractItemView {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                selection-background-color: {colors['primary']};
-            }}
-            
-            QLineEdit#taskInput {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 10px 12px;
-                font-size: 14px;
-            }}
-            
-            QLineEdit#taskInput:focus {{
-                border-color: {colors['primary']};
-            }}
-            
-            QTextEdit#taskDescription {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-size: 14px;
-            }}
-            
-            QTextEdit#taskDescription:focus {{
-                border-color: {colors['primary']};
-            }}
-            
-            QTimeEdit#timeEdit {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 6px;
-                padding: 6px 8px;
-                font-size: 14px;
-            }}
-            
-            QComboBox#priorityCombo {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 6px;
-                padding: 6px 8px;
-                font-size: 14px;
-                min-width: 80px;
-            }}
-            
-            QComboBox#priorityCombo::drop-down {{
-                border: none;
-                width: 20px;
-            }}
-            
-            QComboBox#priorityCombo::down-arrow {{
-                image: none;
-                border: none;
-                width: 0px;
-                height: 0px;
-            }}
-            
-            QPushButton#primaryButton {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 14px;
-                font-weight: 500;
-                min-height: 20px;
-            }}
-            
-            QPushButton#primaryButton:hover {{
-                background-color: {colors['primary_hover']};
-            }}
-            
-            QPushButton#secondaryButton {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            
-            QPushButton#secondaryButton:hover {{
-                background-color: {colors['surface_hover']};
-            }}
-            
-            QPushButton#linkButton {{
-                background-color: transparent;
-                color: {colors['primary']};
-                border: none;
-                font-size: 12px;
-                font-weight: 500;
-                padding: 4px 8px;
-            }}
-            
-            QPushButton#linkButton:hover {{
-                color: {colors['primary_hover']};
-                text-decoration: underline;
-            }}
-            
-            QListWidget#tasksList {{
-                background-color: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 8px;
-                outline: none;
-            }}
-            
-            QListWidget#tasksList::item {{
-                background-color: transparent;
-                color: {colors['text_primary']};
-                padding: 12px;
-                border-radius: 6px;
-                margin: 2px 0;
-                border-left: 3px solid transparent;
-            }}
-            
-            QListWidget#tasksList::item:hover {{
-                background-color: {colors['surface_hover']};
-            }}
-            
-            QListWidget#tasksList::item:selected {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-            }}
-        """)
+        ensure_theme(self.current_theme)
     def load_schedule(self):
         """Load schedule data."""
         try:
@@ -520,4 +522,4 @@ class SchedulerWidget(QWidget):
     def update_theme(self, theme):
         """Update the widget theme."""
         self.current_theme = theme
-        self.setup_styles()
+        apply_theme(theme)
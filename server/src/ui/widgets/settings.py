@@ -9,7 +9,251 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 from src.utils.config import Config
-from src.ui.styles import DARK_COLORS, LIGHT_COLORS
+from src.ui.theme import register_stylesheet, apply_theme, ensure_theme
+from src.ui.stall_watchdog import get_stall_watchdog
+
+STYLESHEET = """
+    QFrame#headerCard {{
+        background-color: {surface};
+        border: 1px solid {border};
+        border-radius: 12px;
+    }}
+
+    QTabWidget#settingsTabs {{
+        background-color: transparent;
+        border: none;
+    }}
+
+    QTabWidget#settingsTabs::pane {{
+        background-color: {surface};
+        border: 1px solid {border};
+        border-radius: 12px;
+        margin-top: 8px;
+    }}
+
+    QTabWidget#settingsTabs::tab-bar {{
+        alignment: left;
+    }}
+
+    QTabBar::tab {{
+        background-color: {background};
+        color: {text_secondary};
+        border: 1px solid {border};
+        border-bottom: none;
+        border-radius: 8px 8px 0px 0px;
+        padding: 12px 20px;
+        margin-right: 4px;
+        font-size: 14px;
+        font-weight: 500;
+    }}
+
+    QTabBar::tab:selected {{
+        background-color: {surface};
+        color: {text_primary};
+        border-color: {border};
+    }}
+
+    QTabBar::tab:hover:!selected {{
+        background-color: {surface_hover};
+        color: {text_primary};
+    }}
+
+    QLabel#headerTitle {{
+        color: {text_primary};
+        font-size: 20px;
+        font-weight: 600;
+    }}
+
+    QLabel#headerSubtitle {{
+        color: {text_secondary};
+        font-size: 14px;
+        font-weight: 400;
+    }}
+
+    QFrame#settingsCard {{
+        background-color: {background};
+        border: 1px solid {border};
+        border-radius: 8px;
+    }}
+
+    QLabel#sectionTitle {{
+        color: {text_primary};
+        font-size: 16px;
+        font-weight: 600;
+        margin-bottom: 8px;
+    }}
+
+    QLabel#settingLabel {{
+        color: {text_primary};
+        font-size: 14px;
+        font-weight: 400;
+    }}
+
+    QCheckBox#settingCheckbox {{
+        color: {text_primary};
+        font-size: 14px;
+        spacing: 8px;
+    }}
+
+    QCheckBox#settingCheckbox::indicator {{
+        width: 16px;
+        height: 16px;
+        border: 1px solid {border};
+        border-radius: 3px;
+        background-color: {surface};
+    }}
+
+    QCheckBox#settingCheckbox::indicator:checked {{
+        background-color: {primary};
+        border-color: {primary};
+    }}
+
+    QSpinBox#settingSpinbox {{
+        background-color: {surface};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 6px 8px;
+        font-size: 14px;
+        min-width: 100px;
+    }}
+
+    QComboBox#settingCombo {{
+        background-color: {surface};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 6px 8px;
+        font-size: 14px;
+        min-width: 120px;
+    }}
+
+    QLineEdit#settingInput {{
+        background-color: {surface};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-size: 14px;
+    }}
+
+    QTextEdit#stallReport {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 8px;
+        font-family: monospace;
+        font-size: 12px;
+    }}
+
+    QLineEdit#settingInput:focus {{
+        border-color: {primary};
+    }}
+
+    QSlider#settingSlider {{
+        height: 20px;
+    }}
+
+    QSlider#settingSlider::groove:horizontal {{
+        background-color: {border};
+        height: 4px;
+        border-radius: 2px;
+    }}
+
+    QSlider#settingSlider::handle:horizontal {{
+        background-color: {primary};
+        width: 16px;
+        height: 16px;
+        border-radius: 8px;
+        margin: -6px 0;
+    }}
+
+    QSlider#settingSlider::sub-page:horizontal {{
+        background-color: {primary};
+        border-radius: 2px;
+    }}
+
+    QListWidget#settingsList {{
+        background-color: {surface};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 4px;
+        outline: none;
+    }}
+
+    QListWidget#settingsList::item {{
+        background-color: transparent;
+        color: {text_primary};
+        padding: 6px 8px;
+        border-radius: 4px;
+        margin: 1px 0;
+    }}
+
+    QListWidget#settingsList::item:hover {{
+        background-color: {surface_hover};
+    }}
+
+    QListWidget#settingsList::item:selected {{
+        background-color: {primary};
+        color: #FFFFFF;
+    }}
+
+    QPushButton#secondaryButton {{
+        background-color: {surface};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-size: 14px;
+        font-weight: 500;
+    }}
+
+    QPushButton#secondaryButton:hover {{
+        background-color: {surface_hover};
+    }}
+
+    QPushButton#addButton {{
+        background-color: {success};
+        color: #FFFFFF;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-size: 12px;
+        font-weight: 500;
+    }}
+
+    QPushButton#removeButton {{
+        background-color: {error};
+        color: #FFFFFF;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-size: 12px;
+        font-weight: 500;
+    }}
+
+    QPushButton#warningButton {{
+        background-color: {warning};
+        color: #FFFFFF;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-size: 12px;
+        font-weight: 500;
+    }}
+
+    QPushButton#colorButton {{
+        background-color: {primary};
+        color: #FFFFFF;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 16px;            font-size: 14px;
+        font-weight: 500;
+    }}
+"""
+
+register_stylesheet("SettingsWidget", STYLESHEET)
 
 class SettingsWidget(QWidget):
     """Settings interface widget."""
@@ -41,6 +285,7 @@ class SettingsWidget(QWidget):
         self.tabs.addTab(self.create_voice_tab(), "🎤 Voice")
         self.tabs.addTab(self.create_focus_tab(), "🎯 Focus Mode")
         self.tabs.addTab(self.create_appearance_tab(), "🎨 Appearance")
+        self.tabs.addTab(self.create_advanced_tab(), "🔧 Advanced")
         
         layout.addWidget(self.tabs)
         
@@ -640,247 +885,58 @@ class SettingsWidget(QWidget):
         buttons_layout.addWidget(clear_logs_button)
         buttons_layout.addStretch()
         
+        # Event-loop stall report
+        stalls_label = QLabel("GUI stalls:")
+        stalls_label.setObjectName("settingLabel")
+        
+        self.stall_report = QTextEdit()
+        self.stall_report.setObjectName("stallReport")
+        self.stall_report.setReadOnly(True)
+        self.stall_report.setLineWrapMode(QTextEdit.NoWrap)
+        self.stall_report.setMinimumHeight(220)
+        
+        stall_buttons_layout = QHBoxLayout()
+        
+        refresh_stalls_button = QPushButton("Refresh Report")
+        refresh_stalls_button.setObjectName("secondaryButton")
+        refresh_stalls_button.clicked.connect(self.refresh_stall_report)
+        
+        reset_stalls_button = QPushButton("Reset")
+        reset_stalls_button.setObjectName("secondaryButton")
+        reset_stalls_button.clicked.connect(self.reset_stall_report)
+        
+        stall_buttons_layout.addWidget(refresh_stalls_button)
+        stall_buttons_layout.addWidget(reset_stalls_button)
+        stall_buttons_layout.addStretch()
+        
         layout.addWidget(title_label)
         layout.addWidget(self.debug_checkbox)
         layout.addLayout(log_level_layout)
         layout.addLayout(buttons_layout)
+        layout.addWidget(stalls_label)
+        layout.addWidget(self.stall_report)
+        layout.addLayout(stall_buttons_layout)
+        
+        self.refresh_stall_report()
         
         return frame
     
+    def refresh_stall_report(self):
+        """Show the latest event-loop stall report."""
+        watchdog = get_stall_watchdog()
+        if watchdog.running:
+            self.stall_report.setPlainText(watchdog.report())
+        else:
+            self.stall_report.setPlainText("Stall watchdog is not running.")
+    
+    def reset_stall_report(self):
+        """Clear recorded stalls."""
+        get_stall_watchdog().reset()
+        self.refresh_stall_report()
+    
     def setup_styles(self):
         """Apply styling to the settings widget."""
-        colors = DARK_COLORS if self.current_theme == 'dark' else LIGHT_COLORS
-        
-        self.setStyleSheet(f"""
-            QFrame#headerCard {{
-                background-color: {colors['surface']};
-                border: 1px solid {colors['border']};
-                border-radius: 12px;
-            }}
-            
-            QTabWidget#settingsTabs {{
-                background-color: transparent;
-                border: none;
-            }}
-            
-            QTabWidget#settingsTabs::pane {{
-                background-color: {colors['surface']};
-                border: 1px solid {colors['border']};
-                border-radius: 12px;
-                margin-top: 8px;
-            }}
-            
-            QTabWidget#settingsTabs::tab-bar {{
-                alignment: left;
-            }}
-            
-            QTabBar::tab {{
-                background-color: {colors['background']};
-                color: {colors['text_secondary']};
-                border: 1px solid {colors['border']};
-                border-bottom: none;
-                border-radius: 8px 8px 0px 0px;
-                padding: 12px 20px;
-                margin-right: 4px;
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            
-            QTabBar::tab:selected {{
-                background-color: {colors['surface']};
-                color: {colors['text_primary']};
-                border-color: {colors['border']};
-            }}
-            
-            QTabBar::tab:hover:!selected {{
-                background-color: {colors['surface_hover']};
-                color: {colors['text_primary']};
-            }}
-            
-            QLabel#headerTitle {{
-                color: {colors['text_primary']};
-                font-size: 20px;
-                font-weight: 600;
-            }}
-            
-            QLabel#headerSubtitle {{
-                color: {colors['text_secondary']};
-                font-size: 14px;
-                font-weight: 400;
-            }}
-            
-            QFrame#settingsCard {{
-                background-color: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-            }}
-            
-            QLabel#sectionTitle {{
-                color: {colors['text_primary']};
-                font-size: 16px;
-                font-weight: 600;
-                margin-bottom: 8px;
-            }}
-            
-            QLabel#settingLabel {{
-                color: {colors['text_primary']};
-                font-size: 14px;
-                font-weight: 400;
-            }}
-            
-            QCheckBox#settingCheckbox {{
-                color: {colors['text_primary']};
-                font-size: 14px;
-                spacing: 8px;
-            }}
-            
-            QCheckBox#settingCheckbox::indicator {{
-                width: 16px;
-                height: 16px;
-                border: 1px solid {colors['border']};
-                border-radius: 3px;
-                background-color: {colors['surface']};
-            }}
-            
-            QCheckBox#settingCheckbox::indicator:checked {{
-                background-color: {colors['primary']};
-                border-color: {colors['primary']};
-            }}
-            
-            QSpinBox#settingSpinbox {{
-                background-color: {colors['surface']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 6px;
-                padding: 6px 8px;
-                font-size: 14px;
-                min-width: 100px;
-            }}
-            
-            QComboBox#settingCombo {{
-                background-color: {colors['surface']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 6px;
-                padding: 6px 8px;
-                font-size: 14px;
-                min-width: 120px;
-            }}
-            
-            QLineEdit#settingInput {{
-                background-color: {colors['surface']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-size: 14px;
-            }}
-            
-            QLineEdit#settingInput:focus {{
-                border-color: {colors['primary']};
-            }}
-            
-            QSlider#settingSlider {{
-                height: 20px;
-            }}
-            
-            QSlider#settingSlider::groove:horizontal {{
-                background-color: {colors['border']};
-                height: 4px;
-                border-radius: 2px;
-            }}
-            
-            QSlider#settingSlider::handle:horizontal {{
-                background-color: {colors['primary']};
-                width: 16px;
-                height: 16px;
-                border-radius: 8px;
-                margin: -6px 0;
-            }}
-            
-            QSlider#settingSlider::sub-page:horizontal {{
-                background-color: {colors['primary']};
-                border-radius: 2px;
-            }}
-            
-            QListWidget#settingsList {{
-                background-color: {colors['surface']};
-                border: 1px solid {colors['border']};
-                border-radius: 6px;
-                padding: 4px;
-                outline: none;
-            }}
-            
-            QListWidget#settingsList::item {{
-                background-color: transparent;
-                color: {colors['text_primary']};
-                padding: 6px 8px;
-                border-radius: 4px;
-                margin: 1px 0;
-            }}
-            
-            QListWidget#settingsList::item:hover {{
-                background-color: {colors['surface_hover']};
-            }}
-            
-            QListWidget#settingsList::item:selected {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-            }}
-            
-            QPushButton#secondaryButton {{
-                background-color: {colors['surface']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            
-            QPushButton#secondaryButton:hover {{
-                background-color: {colors['surface_hover']};
-            }}
-            
-            QPushButton#addButton {{
-                background-color: {colors['success']};
-                color: #FFFFFF;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-size: 12px;
-                font-weight: 500;
-            }}
-            
-            QPushButton#removeButton {{
-                background-color: {colors['error']};
-                color: #FFFFFF;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-size: 12px;
-                font-weight: 500;
-            }}
-            
-            QPushButton#warningButton {{
-                background-color: {colors['warning']};
-                color: #FFFFFF;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-size: 12px;
-                font-weight: 500;
-            }}
-            
-            QPushButton#colorButton {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;            font-size: 14px;
-                font-weight: 500;
-            }}
-        """)
+        ensure_theme(self.current_theme)
     
     def load_settings(self):
         """Load current settings."""
@@ -898,8 +954,9 @@ class SettingsWidget(QWidget):
     def refresh(self):
         """Refresh the settings."""
         self.load_settings()
+        self.refresh_stall_report()
     
     def update_theme(self, theme):
         """Update the widget theme."""
         self.current_theme = theme
-        self.setup_styles()
+        apply_theme(theme)
@@ -5,36 +5,153 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLabel, 
     QPushButton, QTextEdit, QScrollArea, QListWidget, QListWidgetItem
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 from src.features.voice_assistant import VoiceAssistant
-from src.ui.styles import DARK_COLORS, LIGHT_COLORS
+from src.ui.theme import register_stylesheet, apply_theme, ensure_theme, set_state
+from src.ui.task_executor import get_task_executor
 import threading
+import time
 
-class VoiceWorkerThread(QThread):
-    """Worker thread for voice recognition."""
-    
-    result_ready = pyqtSignal(str)
-    error_occurred = pyqtSignal(str)
-    
-    def __init__(self, voice_assistant):
-        super().__init__()
-        self.voice_assistant = voice_assistant
-        self.is_listening = False
-    
-    def run(self):
-        """Run voice recognition."""
-        try:
-            self.is_listening = True
-            result = self.voice_assistant.listen_for_speech()
-            if result:
-                self.result_ready.emit(result)
-            else:
-                self.error_occurred.emit("No speech detected")
-        except Exception as e:
-            self.error_occurred.emit(str(e))
-        finally:
-            self.is_listening = False
+# Longest wait for speech to start, in seconds
+LISTEN_TIMEOUT = 5
+
+def run_voice_recognition(task, voice_assistant):
+    """Listen for one phrase on a pool thread, giving up by the task's deadline."""
+    timeout = LISTEN_TIMEOUT
+    if task.token.deadline is not None:
+        timeout = max(1, min(timeout, int(task.token.deadline - time.monotonic())))
+    result = voice_assistant.listen(timeout=timeout)
+    task.token.check()
+    if not result:
+        raise RuntimeError("No speech detected")
+    return result
+
+STYLESHEET = """
+    QFrame#headerCard, QFrame#controlsCard, QFrame#historyCard {{
+        background-color: {surface};
+        border: 1px solid {border};
+        border-radius: 12px;
+    }}
+
+    QLabel#headerTitle {{
+        color: {text_primary};
+        font-size: 20px;
+        font-weight: 600;
+    }}
+
+    QLabel#headerSubtitle {{
+        color: {text_secondary};
+        font-size: 14px;
+        font-weight: 400;
+    }}
+
+    QLabel#statusLabel {{
+        color: {text_primary};
+        font-size: 16px;
+        font-weight: 500;
+        text-align: center;
+    }}
+
+    QLabel#statusIndicator {{
+        font-size: 24px;
+        padding: 8px;
+    }}
+
+    QPushButton#primaryButton {{
+        background-color: {primary};
+        color: #FFFFFF;
+        border: none;
+        border-radius: 8px;
+        padding: 12px 24px;
+        font-size: 14px;
+        font-weight: 500;
+        min-height: 20px;
+    }}
+
+    QPushButton#primaryButton:hover {{
+        background-color: {primary_hover};
+    }}
+
+    QPushButton#primaryButton[listening="true"] {{
+        background-color: {warning};
+    }}
+
+    QPushButton#primaryButton[listening="true"]:hover {{
+        background-color: #D97706;
+    }}
+
+    QPushButton#secondaryButton {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 12px 24px;
+        font-size: 14px;
+        font-weight: 500;
+        min-height: 20px;
+    }}
+
+    QPushButton#secondaryButton:hover {{
+        background-color: {surface_hover};
+    }}
+
+    QLabel#sectionLabel, QLabel#sectionTitle {{
+        color: {text_primary};
+        font-size: 14px;
+        font-weight: 500;
+    }}
+
+    QTextEdit#recognizedText {{
+        background-color: {background};
+        color: {text_primary};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 12px;
+        font-size: 14px;
+    }}
+
+    QPushButton#linkButton {{
+        background-color: transparent;
+        color: {primary};
+        border: none;
+        font-size: 12px;
+        font-weight: 500;
+        padding: 4px 8px;
+    }}
+
+    QPushButton#linkButton:hover {{
+        color: {primary_hover};
+        text-decoration: underline;
+    }}
+
+    QListWidget#historyList {{
+        background-color: {background};
+        border: 1px solid {border};
+        border-radius: 8px;
+        padding: 8px;
+        outline: none;
+    }}
+
+    QListWidget#historyList::item {{
+        background-color: transparent;
+        color: {text_primary};
+        padding: 8px 12px;
+        border-radius: 6px;
+        margin: 2px 0;
+    }}
+
+    QListWidget#historyList::item:hover {{
+        background-color: {surface_hover};
+    }}
+
+    QListWidget#historyList::item:selected {{
+        background-color: {primary};
+        color: #FFFFFF;
+    }}
+"""
+
+register_stylesheet("VoiceAssistantWidget", STYLESHEET)
 
 class VoiceAssistantWidget(QWidget):
     """Voice assistant interface widget."""
@@ -42,7 +159,8 @@ class VoiceAssistantWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.voice_assistant = VoiceAssistant()
-        self.worker_thread = None
+        self.executor = get_task_executor()
+        self.listen_task = None
         self.current_theme = "dark"
         self.setup_ui()
         self.setup_styles()
@@ -190,160 +308,60 @@ class VoiceAssistantWidget(QWidget):
     
     def setup_styles(self):
         """Apply styling to the voice assistant widget."""
-        colors = DARK_COLORS if self.current_theme == 'dark' else LIGHT_COLORS
-        
-        self.setStyleSheet(f"""
-            QFrame#headerCard, QFrame#controlsCard, QFrame#historyCard {{
-                background-color: {colors['surface']};
-                border: 1px solid {colors['border']};
-                border-radius: 12px;
-            }}
-            
-            QLabel#headerTitle {{
-                color: {colors['text_primary']};
-                font-size: 20px;
-                font-weight: 600;
-            }}
-            
-            QLabel#headerSubtitle {{
-                color: {colors['text_secondary']};
-                font-size: 14px;
-                font-weight: 400;
-            }}
-            
-            QLabel#statusLabel {{
-                color: {colors['text_primary']};
-                font-size: 16px;
-                font-weight: 500;
-                text-align: center;
-            }}
-            
-            QLabel#statusIndicator {{
-                font-size: 24px;
-                padding: 8px;
-            }}
-            
-            QPushButton#primaryButton {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 14px;
-                font-weight: 500;
-                min-height: 20px;
-            }}
-            
-            QPushButton#primaryButton:hover {{
-                background-color: {colors['primary_hover']};
-            }}
-            
-            QPushButton#secondaryButton {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 14px;
-                font-weight: 500;
-                min-height: 20px;
-            }}
-            
-            QPushButton#secondaryButton:hover {{
-                background-color: {colors['surface_hover']};
-            }}
-            
-            QLabel#sectionLabel, QLabel#sectionTitle {{
-                color: {colors['text_primary']};
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            
-            QTextEdit#recognizedText {{
-                background-color: {colors['background']};
-                color: {colors['text_primary']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 12px;
-                font-size: 14px;
-            }}
-            
-            QPushButton#linkButton {{
-                background-color: transparent;
-                color: {colors['primary']};
-                border: none;
-                font-size: 12px;
-                font-weight: 500;
-                padding: 4px 8px;
-            }}
-            
-            QPushButton#linkButton:hover {{
-                color: {colors['primary_hover']};
-                text-decoration: underline;
-            }}
-            
-            QListWidget#historyList {{
-                background-color: {colors['background']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                padding: 8px;
-                outline: none;
-            }}
-            
-            QListWidget#historyList::item {{
-                background-color: transparent;
-                color: {colors['text_primary']};
-                padding: 8px 12px;
-                border-radius: 6px;
-                margin: 2px 0;
-            }}
-            
-            QListWidget#historyList::item:hover {{
-                background-color: {colors['surface_hover']};
-            }}
-            
-            QListWidget#historyList::item:selected {{
-                background-color: {colors['primary']};
-                color: #FFFFFF;
-            }}        """)
+        ensure_theme(self.current_theme)
     
     def update_theme(self, theme):
         """Update the widget theme."""
         self.current_theme = theme
-        self.setup_styles()
+        apply_theme(theme)
     
     def toggle_listening(self):
         """Toggle voice listening."""
-        if self.worker_thread and self.worker_thread.is_listening:
+        if self.listen_task is not None and self.listen_task.is_running():
             self.stop_listening()
         else:
             self.start_listening()
     
     def start_listening(self):
         """Start voice recognition."""
+        if self.listen_task is not None and self.listen_task.is_alive():
+            # The microphone is not reentrant; wait for the cancelled read to return
+            return
         if not self.voice_assistant.is_available:
             self.recognized_text.setText("Voice recognition not available. Please check your microphone.")
             return
         
         self.listen_button.setText("🛑 Stop Listening")
-        self.listen_button.setObjectName("warningButton")
+        set_state(self.listen_button, "listening", True)
         self.status_label.setText("Listening...")
         self.status_indicator.setText("🟢")
         
-        # Start worker thread
-        self.worker_thread = VoiceWorkerThread(self.voice_assistant)
-        self.worker_thread.result_ready.connect(self.on_speech_recognized)
-        self.worker_thread.error_occurred.connect(self.on_speech_error)
-        self.worker_thread.finished.connect(self.on_listening_finished)
-        self.worker_thread.start()
+        # Listen on the shared worker pool
+        self.listen_task = self.executor.submit(
+            run_voice_recognition, self.voice_assistant,
+            name="Voice recognition",
+            timeout=self.voice_assistant.config.VOICE_TASK_TIMEOUT,
+            on_result=self.on_speech_recognized,
+            on_error=self.on_speech_error,
+            on_finished=self.on_listening_finished
+        )
     
     def stop_listening(self):
         """Stop voice recognition."""
-        if self.worker_thread:
-            self.worker_thread.terminate()
-            self.worker_thread.wait()
-        
-        self.on_listening_finished()
+        # The microphone read cannot be interrupted; its result is discarded,
+        # and listening can restart once the read has returned
+        if self.listen_task is not None and self.listen_task.is_running():
+            self.listen_task.cancel()
+            self.on_listening_finished()
+            if self.listen_task.is_alive():
+                self.listen_button.setEnabled(False)
+                self.status_label.setText("Stopping...")
+                self.listen_task.exited.connect(self.on_listener_exited)
+    
+    def on_listener_exited(self):
+        """Allow listening again once a cancelled microphone read has returned."""
+        self.listen_button.setEnabled(True)
+        self.status_label.setText("Ready to listen")
     
     def on_speech_recognized(self, text):
         """Handle recognized speech."""
@@ -363,12 +381,9 @@ class VoiceAssistantWidget(QWidget):
     def on_listening_finished(self):
         """Handle listening finished."""
         self.listen_button.setText("🎤 Start Listening")
-        self.listen_button.setObjectName("primaryButton")
+        set_state(self.listen_button, "listening", False)
         self.status_label.setText("Ready to listen")
         self.status_indicator.setText("🔴")
-        
-        # Reapply styles
-        self.setup_styles()
     
     def process_voice_command(self, command):
         """Process voice command."""
@@ -28,7 +28,88 @@ class Config:
     # API Configuration
     API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:3000/api")
     API_TIMEOUT = int(os.getenv("API_TIMEOUT", "30"))
-    
+
+    # HTTP Transport Settings
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+    HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.3"))
+
+    # AI Request Settings
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4"))
+    AI_BACKGROUND_CONCURRENCY = int(os.getenv("AI_BACKGROUND_CONCURRENCY", "2"))
+    HEALTH_CHECK_INTERVAL = int(os.getenv("HEALTH_CHECK_INTERVAL", "30"))
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+    BREAKER_RECOVERY_TIMEOUT = int(os.getenv("BREAKER_RECOVERY_TIMEOUT", "30"))
+    AI_RATE_LIMIT = float(os.getenv("AI_RATE_LIMIT", "2"))
+    AI_RATE_LIMIT_MIN = float(os.getenv("AI_RATE_LIMIT_MIN", "0.2"))
+    AI_RATE_LIMIT_MAX = float(os.getenv("AI_RATE_LIMIT_MAX", "10"))
+    AI_RATE_BURST = int(os.getenv("AI_RATE_BURST", "5"))
+    AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "3"))
+    AI_RETRY_BACKOFF = float(os.getenv("AI_RETRY_BACKOFF", "0.5"))
+    AI_RETRY_BACKOFF_CAP = float(os.getenv("AI_RETRY_BACKOFF_CAP", "8"))
+
+    # Chat Wire Settings
+    AI_WIRE_COMPRESSION = os.getenv("AI_WIRE_COMPRESSION", "")  # "gzip", "deflate" or "" for none
+    AI_WIRE_COMPRESS_MIN_BYTES = int(os.getenv("AI_WIRE_COMPRESS_MIN_BYTES", "1024"))
+    AI_WIRE_DELTA = os.getenv("AI_WIRE_DELTA", "false").lower() == "true"
+
+    # Prefetch Settings
+    PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "false").lower() == "true"
+    PREFETCH_TTL = int(os.getenv("PREFETCH_TTL", "120"))
+    PREFETCH_MAX_PER_MINUTE = int(os.getenv("PREFETCH_MAX_PER_MINUTE", "6"))
+    PREFETCH_IDLE_MS = int(os.getenv("PREFETCH_IDLE_MS", "3000"))
+
+    # Prompt Budget Settings
+    TOKEN_MODEL_FAMILY = os.getenv("TOKEN_MODEL_FAMILY", "gemini")
+    TOKEN_ESTIMATE_SCALE = float(os.getenv("TOKEN_ESTIMATE_SCALE", "1.0"))
+    AI_PROMPT_TOKEN_BUDGET = int(os.getenv("AI_PROMPT_TOKEN_BUDGET", "6000"))
+    AI_PROMPT_NOTES_SHARE = float(os.getenv("AI_PROMPT_NOTES_SHARE", "0.3"))
+
+    # Conversation History Settings
+    HISTORY_MAX_TURNS = int(os.getenv("HISTORY_MAX_TURNS", "10"))
+    HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "1500"))
+    HISTORY_SUMMARY_TOKENS = int(os.getenv("HISTORY_SUMMARY_TOKENS", "300"))
+
+    # Chat Session Settings
+    SESSION_STORAGE_DIR = os.getenv("SESSION_STORAGE_DIR", "data/sessions")
+    SESSION_MAX_RESIDENT = int(os.getenv("SESSION_MAX_RESIDENT", "1000"))
+    SESSION_IDLE_TIMEOUT = int(os.getenv("SESSION_IDLE_TIMEOUT", "1800"))
+
+    # Transcript Settings
+    TRANSCRIPT_ENABLED = os.getenv("TRANSCRIPT_ENABLED", "true").lower() == "true"
+    TRANSCRIPT_DIR = os.getenv("TRANSCRIPT_DIR", "data/transcripts")
+    TRANSCRIPT_SEGMENT_BYTES = int(os.getenv("TRANSCRIPT_SEGMENT_BYTES", str(1024 * 1024)))
+    TRANSCRIPT_RESTORE_MESSAGES = int(os.getenv("TRANSCRIPT_RESTORE_MESSAGES", "50"))
+
+    # Response Cache Settings
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", "data/cache/responses")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+    RESPONSE_CACHE_MEMORY_ENTRIES = int(os.getenv("RESPONSE_CACHE_MEMORY_ENTRIES", "256"))
+    RESPONSE_CACHE_DISK_ENTRIES = int(os.getenv("RESPONSE_CACHE_DISK_ENTRIES", "5000"))
+
+    # Semantic Cache Settings
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.8"))
+    SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "100000"))
+    SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", "86400"))
+
+    # Offline Fallback Settings
+    OFFLINE_FALLBACK_ENABLED = os.getenv("OFFLINE_FALLBACK_ENABLED", "true").lower() == "true"
+    OFFLINE_STORAGE_DIR = os.getenv("OFFLINE_STORAGE_DIR", "data/offline")
+    OFFLINE_MAX_ANSWERS = int(os.getenv("OFFLINE_MAX_ANSWERS", "5000"))
+    OFFLINE_MIN_COVERAGE = float(os.getenv("OFFLINE_MIN_COVERAGE", "0.6"))
+
+    # Notes Index Settings
+    NOTES_CONTEXT_ENABLED = os.getenv("NOTES_CONTEXT_ENABLED", "true").lower() == "true"
+    NOTES_DIR = os.getenv("NOTES_DIR", "data/notes")
+    NOTES_TOP_K = int(os.getenv("NOTES_TOP_K", "3"))
+    NOTES_QUERY_BUDGET_MS = float(os.getenv("NOTES_QUERY_BUDGET_MS", "50"))
+    NOTES_PASSAGE_WORDS = int(os.getenv("NOTES_PASSAGE_WORDS", "120"))
+    NOTES_SCAN_INTERVAL = int(os.getenv("NOTES_SCAN_INTERVAL", "60"))
+
     # Voice Settings
     VOICE_ENABLED = os.getenv("VOICE_ENABLED", "true").lower() == "true"
     VOICE_RATE = int(os.getenv("VOICE_RATE", "150"))
@@ -51,6 +132,23 @@ class Config:
     THEME_MODE = os.getenv("THEME_MODE", "dark")  # light, dark, auto
     WINDOW_WIDTH = int(os.getenv("WINDOW_WIDTH", "1200"))
     WINDOW_HEIGHT = int(os.getenv("WINDOW_HEIGHT", "800"))
+    CHAT_DOCUMENT_CACHE_MB = int(os.getenv("CHAT_DOCUMENT_CACHE_MB", "16"))
+    # Pages built in the background after startup, in order; the voice page
+    # is left out because building it opens the microphone
+    PAGE_PREWARM = [page for page in os.getenv("PAGE_PREWARM", "chat,scheduler,settings").split(",") if page]
+    PAGE_PREWARM_DELAY_MS = int(os.getenv("PAGE_PREWARM_DELAY_MS", "1500"))
+    
+    # Background Task Settings
+    TASK_POOL_MAX_THREADS = int(os.getenv("TASK_POOL_MAX_THREADS", "4"))
+    TASK_POOL_EXPIRY_MS = int(os.getenv("TASK_POOL_EXPIRY_MS", "60000"))
+    CHAT_TASK_TIMEOUT = float(os.getenv("CHAT_TASK_TIMEOUT", "90"))
+    VOICE_TASK_TIMEOUT = float(os.getenv("VOICE_TASK_TIMEOUT", "20"))
+    
+    # Stall Watchdog Settings
+    STALL_WATCHDOG_ENABLED = os.getenv("STALL_WATCHDOG_ENABLED", "true").lower() == "true"
+    STALL_HEARTBEAT_MS = int(os.getenv("STALL_HEARTBEAT_MS", "100"))
+    STALL_THRESHOLD_MS = int(os.getenv("STALL_THRESHOLD_MS", "200"))
+    STALL_SAMPLE_MS = int(os.getenv("STALL_SAMPLE_MS", "50"))
     
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
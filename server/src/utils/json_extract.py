@@ -0,0 +1,256 @@
+"""
+Tolerant JSON extraction from AI responses.
+
+Model replies often wrap JSON in Markdown code fences, surround it with
+prose, or get cut off part-way through. These helpers recover as much
+well-formed JSON as possible from such text.
+"""
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+_CODE_FENCE = re.compile(r'```[ \t]*(?:json|JSON)?[ \t]*\n?(.*?)(?:```|$)', re.DOTALL)
+_decoder = json.JSONDecoder()
+_ARRAY_SCALAR = re.compile(r'(?:-?\d[\d.eE+-]*|true|false|null)\s*')
+_FENCE_INFO_LIMIT = 20  # Longer text after ``` without a newline is not a language tag
+
+def starts_as_json(text: str) -> Optional[bool]:
+    """
+    Tell from the start of a streamed reply whether it is JSON.
+
+    A reply is JSON if it opens with an object ({ then a key or }), an
+    array whose first entry is a JSON value, or a ```json fence. Markdown
+    that merely starts with a bracket or a fence, such as a [link](...) or
+    a ```python block, is not. Returns None while the first token is still
+    ambiguous and more text is needed.
+    """
+    text = text.lstrip()
+    if not text:
+        return None
+    if text[0] == '`':
+        if not text.startswith('```'):
+            return None if '```'.startswith(text) else False
+        end = text.find('\n', 3)
+        if end == -1:
+            return None if len(text) - 3 <= _FENCE_INFO_LIMIT else False
+        return text[3:end].strip().lower() == 'json'
+    if text[0] == '{':
+        rest = text[1:].lstrip()
+        return rest[0] in '"}' if rest else None
+    if text[0] == '[':
+        rest = text[1:].lstrip()
+        if not rest:
+            return None
+        if rest[0] in '[{"]':
+            return True
+        match = _ARRAY_SCALAR.match(rest)
+        if match:
+            after = rest[match.end():]
+            # A number or literal is only an entry if a comma follows, or a
+            # ] that ends the reply (not "[1](url)" or "[1] footnote")
+            if not after:
+                return None
+            if after[0] == ']':
+                return None if not after[1:].strip() else False
+            return after[0] == ','
+        return None if any(word.startswith(rest) for word in ('true', 'false', 'null')) else False
+    return False
+
+def strip_code_fences(text: str) -> str:
+    """Return the contents of the first fenced code block, or the text unchanged."""
+    match = _CODE_FENCE.search(text)
+    if match and match.group(1).strip():
+        return match.group(1).strip()
+    return text.strip()
+
+def extract_json(text: str) -> Optional[Any]:
+    """
+    Decode the first complete JSON array or object in text.
+
+    Leading prose and trailing text are ignored. Returns None if no
+    complete value can be decoded.
+    """
+    text = strip_code_fences(text)
+    candidates = sorted(i for i in (text.find('['), text.find('{')) if i != -1)
+    for index in candidates:
+        try:
+            value, _ = _decoder.raw_decode(text, index)
+            return value
+        except json.JSONDecodeError:
+            continue
+    return None
+
+def iter_json_objects(text: str) -> Iterator[dict]:
+    """
+    Yield every complete outermost JSON object in text.
+
+    Works on truncated or otherwise invalid JSON: objects that close are
+    decoded, anything malformed or unterminated is skipped.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    start = None
+
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"' and depth > 0:
+            # Quotes in surrounding prose are not JSON strings
+            in_string = True
+        elif char == '{':
+            if depth == 0:
+                start = index
+            depth += 1
+        elif char == '}' and depth > 0:
+            depth -= 1
+            if depth == 0:
+                try:
+                    value = json.loads(text[start:index + 1])
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(value, dict):
+                    yield value
+
+class IncrementalJSONExtractor:
+    """
+    Extract list entries from JSON that arrives in pieces.
+
+    Feed text chunks as they stream in; each entry of a watched array is
+    returned as soon as it closes, without re-scanning earlier text. Watched
+    arrays are a top-level array and arrays stored under any of the given
+    keys, at any depth. Entries may be objects or strings. Prose and code
+    fences around the JSON are ignored.
+    """
+
+    def __init__(self, keys: Iterable[str] = (), top_level_array: bool = True):
+        """
+        Initialize the extractor.
+
+        Args:
+            keys: Object keys whose array values are watched, e.g. 'actionItems'
+            top_level_array: Whether entries of a top-level array are emitted
+        """
+        self.keys = set(keys)
+        self.top_level_array = top_level_array
+
+        self._buffer = ''
+        self._offset = 0  # Stream position of _buffer[0]
+        self._pos = 0  # Next stream position to scan
+        self._stack = []  # (container char, is watched array)
+        self._in_string = False
+        self._escaped = False
+        self._string_start = None
+        self._last_string = None  # Text of the last string closed inside an object
+        self._pending_key = None
+        self._entry_start = None
+        self._entry_depth = None
+        self._entry_key = None
+
+    def feed(self, chunk: str) -> List[Tuple[Optional[str], Any]]:
+        """
+        Consume a chunk of text.
+
+        Returns:
+            (key, entry) pairs for every entry completed by this chunk, where
+            key is the watched key or None for the top-level array
+        """
+        self._buffer += chunk
+        entries = []
+        end = self._offset + len(self._buffer)
+
+        while self._pos < end:
+            char = self._buffer[self._pos - self._offset]
+            position = self._pos
+            self._pos += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string(position, entries)
+                continue
+
+            if not self._stack:
+                # Outside JSON: only an opening bracket matters
+                if char == '[':
+                    self._stack.append(('[', self.top_level_array))
+                    self._entry_key = None
+                elif char == '{':
+                    self._stack.append(('{', False))
+                continue
+
+            container, watched = self._stack[-1]
+            if char == '"':
+                self._in_string = True
+                self._string_start = position
+                if watched and self._entry_start is None:
+                    self._start_entry(position)
+            elif char in '[{':
+                if watched and self._entry_start is None:
+                    self._start_entry(position)
+                is_watched = char == '[' and container == '{' and self._pending_key in self.keys
+                if is_watched and self._entry_start is None:
+                    self._entry_key = self._pending_key
+                self._stack.append((char, is_watched and self._entry_start is None))
+                self._pending_key = None
+            elif char in ']}':
+                self._stack.pop()
+                self._pending_key = None
+                if self._entry_start is not None and len(self._stack) == self._entry_depth:
+                    self._finish_entry(position, entries)
+            elif char == ':' and container == '{':
+                self._pending_key = self._last_string
+            elif char == ',':
+                self._pending_key = None
+            if not char.isspace():
+                self._last_string = None
+
+        self._compact()
+        return entries
+
+    def _start_entry(self, position: int):
+        self._entry_start = position
+        self._entry_depth = len(self._stack)
+
+    def _close_string(self, position: int, entries: List[Tuple[Optional[str], Any]]):
+        container, _ = self._stack[-1] if self._stack else (None, False)
+        if container == '{' and self._entry_start is None:
+            try:
+                self._last_string = json.loads(self._slice(self._string_start, position))
+            except json.JSONDecodeError:
+                self._last_string = None
+        self._string_start = None
+        if self._entry_start is not None and len(self._stack) == self._entry_depth:
+            self._finish_entry(position, entries)
+
+    def _finish_entry(self, position: int, entries: List[Tuple[Optional[str], Any]]):
+        try:
+            entries.append((self._entry_key, json.loads(self._slice(self._entry_start, position))))
+        except json.JSONDecodeError:
+            pass
+        self._entry_start = None
+        self._entry_depth = None
+
+    def _slice(self, start: int, end: int) -> str:
+        return self._buffer[start - self._offset:end - self._offset + 1]
+
+    def _compact(self):
+        """Drop scanned text that no open entry or key can still need."""
+        keep = self._pos
+        for start in (self._entry_start, self._string_start):
+            if start is not None:
+                keep = min(keep, start)
+        if keep > self._offset:
+            self._buffer = self._buffer[keep - self._offset:]
+            self._offset = keep
@@ -0,0 +1,87 @@
+"""
+Fitting outgoing chat requests into a token budget.
+
+The message and the non-notes context (the request's instructions) are
+kept first; an oversized message is truncated rather than dropped. The rest
+of the budget is shared between retrieved notes and conversation history:
+notes may use up to a configured share, history fills what remains from
+the newest exchange backwards, and notes then take any budget history left
+unused. Notes and exchanges are kept or dropped whole, in rank and recency
+order respectively.
+"""
+import json
+from typing import Optional, Dict, List, Any, Tuple
+from src.utils.config import Config
+from src.utils.token_estimator import estimate_tokens, truncate_to_tokens
+
+# Allowance for JSON structure and per-entry framing the model sees
+ENTRY_OVERHEAD_TOKENS = 4
+
+def _entry_tokens(entry: Dict[str, str]) -> int:
+    return sum(estimate_tokens(value) for value in entry.values()) + ENTRY_OVERHEAD_TOKENS
+
+def fit_prompt(message: str, context: Optional[Dict[str, Any]], history: List[Dict[str, str]],
+               budget: Optional[int] = None, notes_share: Optional[float] = None
+               ) -> Tuple[str, Optional[Dict[str, Any]], List[Dict[str, str]], Dict[str, int]]:
+    """
+    Trim a chat request to fit the token budget.
+
+    Args:
+        message: User's message
+        context: Request context; its 'notes' list is trimmable, the rest is not
+        history: conversation_history payload, oldest first
+        budget: Maximum estimated tokens for the whole request
+        notes_share: Fraction of the trimmable budget notes may claim before history
+
+    Returns:
+        (message, context, history, report); the report gives the estimated
+        tokens sent and how many notes and exchanges were dropped
+    """
+    config = Config()
+    budget = budget or config.AI_PROMPT_TOKEN_BUDGET
+    notes_share = config.AI_PROMPT_NOTES_SHARE if notes_share is None else notes_share
+
+    notes = list((context or {}).get('notes') or [])
+    fixed_context = {key: value for key, value in (context or {}).items() if key != 'notes'}
+    context_tokens = estimate_tokens(json.dumps(fixed_context)) if fixed_context else 0
+    report = {'budget': budget, 'tokens': 0, 'dropped_notes': 0, 'dropped_history': 0, 'truncated_message': 0}
+
+    message_tokens = estimate_tokens(message)
+    remaining = budget - context_tokens - message_tokens
+    if remaining < 0:
+        message = truncate_to_tokens(message, max(budget - context_tokens, 0))
+        message_tokens = estimate_tokens(message)
+        remaining = 0
+        report['truncated_message'] = 1
+
+    note_costs = [_entry_tokens(note) for note in notes]
+    note_cap = int(remaining * notes_share)
+    kept_notes = 0
+    notes_tokens = 0
+    while kept_notes < len(notes) and notes_tokens + note_costs[kept_notes] <= note_cap:
+        notes_tokens += note_costs[kept_notes]
+        kept_notes += 1
+
+    # Newest exchanges first; stop at the first that does not fit so the kept ones stay contiguous
+    history_tokens = 0
+    kept_history = 0
+    for entry in reversed(history):
+        cost = _entry_tokens(entry)
+        if notes_tokens + history_tokens + cost > remaining:
+            break
+        history_tokens += cost
+        kept_history += 1
+
+    while kept_notes < len(notes) and notes_tokens + history_tokens + note_costs[kept_notes] <= remaining:
+        notes_tokens += note_costs[kept_notes]
+        kept_notes += 1
+
+    if kept_notes < len(notes):
+        context = fixed_context
+        if kept_notes:
+            context['notes'] = notes[:kept_notes]
+
+    report['tokens'] = context_tokens + message_tokens + notes_tokens + history_tokens
+    report['dropped_notes'] = len(notes) - kept_notes
+    report['dropped_history'] = len(history) - kept_history
+    return message, context, history[len(history) - kept_history:], report
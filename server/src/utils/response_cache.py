@@ -0,0 +1,239 @@
+"""
+Two-tier response cache for deterministic AI prompts.
+
+Entries live in an in-memory LRU and in a persistent on-disk tier (one JSON
+file per entry). Both tiers expire entries after a TTL and evict the oldest
+entries once they hold more than their configured size.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, List, Any, Iterator, Tuple
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+class ResponseCache:
+    """In-memory LRU backed by a persistent on-disk cache."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_entries: Optional[int] = None,
+                 max_disk_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory for the on-disk tier (None disables it)
+            max_memory_entries: Maximum entries kept in memory
+            max_disk_entries: Maximum entries kept on disk
+            ttl: Seconds before an entry expires
+        """
+        self.config = Config()
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries or self.config.RESPONSE_CACHE_MEMORY_ENTRIES
+        self.max_disk_entries = max_disk_entries or self.config.RESPONSE_CACHE_DISK_ENTRIES
+        self.ttl = ttl or self.config.RESPONSE_CACHE_TTL
+
+        self._memory = OrderedDict()  # key -> (created_at, value)
+        self._disk_index = OrderedDict()  # key -> created_at, oldest first
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(prompt: str, context: Optional[Dict[str, Any]] = None,
+                 history: Optional[List[Dict[str, str]]] = None) -> str:
+        """
+        Build a cache key from a normalized prompt, context and history.
+
+        Whitespace and letter case in the prompt are normalized, context keys
+        with empty values are dropped, and key order does not matter.
+        """
+        normalized = {
+            'prompt': _WHITESPACE.sub(' ', prompt).strip().lower(),
+            'context': {k: v for k, v in (context or {}).items() if v not in (None, '', [], {})},
+            'history': history or []
+        }
+        encoded = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _load_disk_index(self):
+        """Index entries already on disk, oldest first."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        entries.append((os.path.getmtime(path), name[:-5]))
+                    except OSError:
+                        continue
+
+        for created_at, key in sorted(entries):
+            self._disk_index[key] = created_at
+
+        logger.info(f"Response cache loaded {len(self._disk_index)} disk entries")
+
+    def _is_expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached value, or None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if not self._is_expired(created_at):
+                    self._memory.move_to_end(key)
+                    self._stats['hits'] += 1
+                    self._stats['memory_hits'] += 1
+                    return value
+                del self._memory[key]
+                self._stats['expirations'] += 1
+
+            value = self._read_disk(key)
+            if value is not None:
+                self._store_memory(key, self._disk_index[key], value)
+                self._stats['hits'] += 1
+                self._stats['disk_hits'] += 1
+                return value
+
+            self._stats['misses'] += 1
+            return None
+
+    def set(self, key: str, value: str, prompt: Optional[str] = None):
+        """
+        Store a value in both tiers.
+
+        The prompt is optional and only kept on disk, so entries can be
+        re-indexed later (see iter_entries()).
+        """
+        created_at = time.time()
+        with self._lock:
+            self._store_memory(key, created_at, value)
+            self._write_disk(key, created_at, value, prompt)
+
+    def invalidate(self, key: str):
+        """Remove a single entry from both tiers."""
+        with self._lock:
+            self._memory.pop(key, None)
+            self._remove_disk(key)
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk_index):
+                self._remove_disk(key)
+        logger.info("Response cache cleared")
+
+    def iter_entries(self) -> Iterator[Tuple[str, str]]:
+        """Yield (prompt, value) for unexpired disk entries stored with their prompt."""
+        with self._lock:
+            keys = [key for key, created_at in self._disk_index.items() if not self._is_expired(created_at)]
+        for key in keys:
+            try:
+                with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if entry.get('prompt'):
+                yield entry['prompt'], entry['value']
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and tier sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+            stats['disk_entries'] = len(self._disk_index)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _store_memory(self, key: str, created_at: float, value: str):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        created_at = self._disk_index.get(key)
+        if created_at is None:
+            return None
+        if self._is_expired(created_at):
+            self._remove_disk(key)
+            self._stats['expirations'] += 1
+            return None
+
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)['value']
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key[:12]}: {e}")
+            self._remove_disk(key)
+            return None
+
+    def _write_disk(self, key: str, created_at: float, value: str, prompt: Optional[str] = None):
+        if not self.cache_dir:
+            return
+
+        path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'created_at': created_at, 'value': value, 'prompt': prompt}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Error writing cache entry: {e}")
+            return
+
+        self._disk_index.pop(key, None)
+        self._disk_index[key] = created_at
+        while len(self._disk_index) > self.max_disk_entries:
+            oldest_key = next(iter(self._disk_index))
+            self._remove_disk(oldest_key)
+            self._stats['evictions'] += 1
+
+    def _remove_disk(self, key: str):
+        self._disk_index.pop(key, None)
+        if not self.cache_dir:
+            return
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Error removing cache entry: {e}")
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Get the shared response cache, creating it on first use."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(cache_dir=Config.RESPONSE_CACHE_DIR)
+    return _response_cache
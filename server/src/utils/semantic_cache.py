@@ -0,0 +1,247 @@
+"""
+Approximate-match cache for rephrased chat questions.
+
+Questions are normalized (case, punctuation and filler words such as
+"explain" or "simply" are dropped; numbers and operators are kept), split
+into character n-grams and summarized as a MinHash signature.
+Locality-sensitive hashing over bands of the signature finds candidate
+entries without scanning the cache; the best candidate is served when its
+estimated Jaccard similarity clears the threshold and its numbers and
+symbols match the question's exactly, since "2+2" and "2*2" or "World War
+1" and "World War 2" differ in little text but ask different things.
+"""
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional, Dict, List, Any, Tuple
+import numpy as np
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_TOKEN = re.compile(r"\d+(?:\.\d+)?|[^\W\d_]+|[^\w\s?!.,;:'\"`]")
+_MERSENNE_PRIME = (1 << 31) - 1
+
+# Words that change how a question is phrased but not what it asks
+FILLER_WORDS = frozenset("""
+a an the is are was what whats s explain explanation describe define definition meaning mean means
+tell me us about please can could would you give simply simple briefly brief terms in of
+quick quickly short overview i want to know understand help with
+""".split())
+
+def normalize_question(text: str) -> str:
+    """Reduce a question to its content words, numbers and symbols."""
+    words = _TOKEN.findall(text.lower())
+    content = [word for word in words if word not in FILLER_WORDS]
+    return ' '.join(content or words)
+
+def _exact_tokens(normalized: str) -> Tuple[str, ...]:
+    """Numbers and symbols of a normalized question, in order; these must match for a hit."""
+    return tuple(token for token in normalized.split() if not token.isalpha())
+
+class SemanticCache:
+    """MinHash/LSH cache mapping near-duplicate questions to one answer."""
+
+    def __init__(self, threshold: Optional[float] = None, max_entries: Optional[int] = None,
+                 ttl: Optional[float] = None, num_perm: int = 64, bands: int = 16, ngram: int = 3,
+                 seed: int = 1):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity for a hit
+            max_entries: Maximum entries before the least recently used is evicted
+            ttl: Seconds before an entry expires
+            num_perm: MinHash signature length
+            bands: LSH bands; num_perm must divide evenly into them
+            ngram: Character n-gram size used for shingling
+            seed: Seed for the MinHash permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.config = Config()
+        self.threshold = threshold if threshold is not None else self.config.SEMANTIC_CACHE_THRESHOLD
+        self.max_entries = max_entries or self.config.SEMANTIC_CACHE_MAX_ENTRIES
+        self.ttl = ttl or self.config.SEMANTIC_CACHE_TTL
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=(num_perm, 1)).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=(num_perm, 1)).astype(np.uint64)
+
+        self._signatures = np.zeros((min(self.max_entries, 1024), num_perm), dtype=np.uint32)
+        self._entries = OrderedDict()  # slot -> (scope, question, answer, created_at, exact tokens), LRU first
+        self._free_slots = []
+        self._next_slot = 0
+        self._buckets = [{} for _ in range(bands)]  # band -> {(scope, band bytes): {slot, ...}}
+        self._lock = threading.Lock()
+        self._stats = {
+            'lookups': 0,
+            'hits': 0,
+            'misses': 0,
+            'no_candidates': 0,
+            'candidates_checked': 0,
+            'near_misses': 0,
+            'false_hits': 0,
+            'evictions': 0
+        }
+        self._score_histogram = [0] * 10  # Best candidate similarity per lookup
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a question."""
+        return self._signature(normalize_question(text))
+
+    def _signature(self, normalized: str) -> np.ndarray:
+        normalized = f" {normalized} "
+        if len(normalized) <= self.ngram:
+            shingles = {normalized}
+        else:
+            shingles = {normalized[i:i + self.ngram] for i in range(len(normalized) - self.ngram + 1)}
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles)) % _MERSENNE_PRIME
+        return ((self._a * hashes + self._b) % _MERSENNE_PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, scope: str, signature: np.ndarray) -> List[Tuple[str, bytes]]:
+        return [(scope, signature[i * self.rows:(i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+
+    def get(self, question: str, scope: str = '') -> Optional[str]:
+        """
+        Get the answer cached for a near-duplicate question, or None.
+
+        Args:
+            question: The question as asked
+            scope: Partition key, e.g. subject; entries only match within a scope
+        """
+        normalized = normalize_question(question)
+        signature = self._signature(normalized)
+        exact = _exact_tokens(normalized)
+        now = time.time()
+        with self._lock:
+            self._stats['lookups'] += 1
+            candidates = set()
+            for band, key in enumerate(self._band_keys(scope, signature)):
+                slots = self._buckets[band].get(key)
+                if slots:
+                    candidates.update(slots)
+
+            if not candidates:
+                self._stats['no_candidates'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            similarities = (self._signatures[slots] == signature).mean(axis=1)
+            self._stats['candidates_checked'] += len(slots)
+            best = int(similarities.argmax())
+            slot, score = int(slots[best]), float(similarities[best])
+            self._score_histogram[min(int(score * 10), 9)] += 1
+
+            _, _, answer, created_at, entry_exact = self._entries[slot]
+            if now - created_at > self.ttl:
+                self._remove(slot)
+                score = 0.0
+
+            if score < self.threshold:
+                if score >= self.threshold - 0.1:
+                    self._stats['near_misses'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            if entry_exact != exact:
+                # Similar wording, different numbers or operators
+                self._stats['false_hits'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(slot)
+            self._stats['hits'] += 1
+            return answer
+
+    def set(self, question: str, answer: str, scope: str = ''):
+        """Cache the answer to a question."""
+        normalized = normalize_question(question)
+        signature = self._signature(normalized)
+        with self._lock:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = self._next_slot
+                self._next_slot += 1
+                if slot >= len(self._signatures):
+                    grown = np.zeros((min(len(self._signatures) * 2, self.max_entries + 1), self.num_perm),
+                                     dtype=np.uint32)
+                    grown[:len(self._signatures)] = self._signatures
+                    self._signatures = grown
+
+            self._signatures[slot] = signature
+            self._entries[slot] = (scope, question, answer, time.time(), _exact_tokens(normalized))
+            for band, key in enumerate(self._band_keys(scope, signature)):
+                self._buckets[band].setdefault(key, set()).add(slot)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def _remove(self, slot: int):
+        scope = self._entries.pop(slot)[0]
+        for band, key in enumerate(self._band_keys(scope, self._signatures[slot])):
+            slots = self._buckets[band].get(key)
+            if slots is not None:
+                slots.discard(slot)
+                if not slots:
+                    del self._buckets[band][key]
+        self._free_slots.append(slot)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._free_slots = []
+            self._next_slot = 0
+            self._buckets = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters and threshold tuning data.
+
+        score_histogram counts the best candidate similarity per lookup in
+        tenths; near_misses are lookups that scored just under the threshold.
+        false_hits are lookups whose best candidate cleared the threshold but
+        was refused because its numbers or symbols differ; precision is the
+        share of threshold-clearing matches that were served, so a falling
+        value means the threshold is too low (see
+        scripts/benchmark_semantic_cache.py). lsh_recall_at_threshold is the
+        probability that a pair at exactly the threshold becomes a candidate.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['score_histogram'] = list(self._score_histogram)
+        stats['threshold'] = self.threshold
+        stats['hit_rate'] = stats['hits'] / stats['lookups'] if stats['lookups'] else 0.0
+        matched = stats['hits'] + stats['false_hits']
+        stats['precision'] = stats['hits'] / matched if matched else None
+        stats['lsh_recall_at_threshold'] = 1 - (1 - self.threshold ** self.rows) ** self.bands
+        return stats
+
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+def get_semantic_cache() -> SemanticCache:
+    """Get the shared semantic cache, creating it on first use."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticCache()
+    return _semantic_cache
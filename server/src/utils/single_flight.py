@@ -0,0 +1,84 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+While a call for a key is in flight, further calls with the same key wait
+for it and receive its result instead of starting their own.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class _Call:
+    """An in-flight call shared by its leader and any waiters."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution."""
+
+    def __init__(self):
+        """Initialize the single-flight group."""
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'calls': 0,
+            'executions': 0,
+            'coalesced': 0
+        }
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func once per key at a time and share its outcome.
+
+        Args:
+            key: Identity of the call; calls with equal keys are coalesced
+            func: Callable to execute if no call for key is in flight
+
+        Returns:
+            The result of the (possibly shared) execution. Exceptions raised
+            by the execution are re-raised in every caller.
+        """
+        with self._lock:
+            self._stats['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._stats['coalesced'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get call, execution and coalescing counters."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['coalesced_ratio'] = stats['coalesced'] / stats['calls'] if stats['calls'] else 0.0
+        return stats
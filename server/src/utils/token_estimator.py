@@ -0,0 +1,107 @@
+"""
+Token-count estimation for outgoing prompts.
+
+A fixed characters-per-token ratio is badly off for anything but plain
+prose: digits, punctuation and non-Latin text all cost more tokens per
+character. The estimate here counts those character classes separately
+and weights each one per model family. The counts come from a handful of
+bytes.translate() passes over the UTF-8 text, so an estimate costs a few
+microseconds per message.
+
+The profile weights are approximations of each family's tokenizer. Use
+calibrate() with real counts from the API (e.g. Gemini's countTokens) to
+fit a correction factor, and set it as TOKEN_ESTIMATE_SCALE.
+"""
+from collections import namedtuple
+from typing import Optional, Iterable, Tuple
+from src.utils.config import Config
+
+# Average characters per token for English prose
+CHARS_PER_TOKEN = 4
+
+ModelProfile = namedtuple('ModelProfile', [
+    'chars_per_token',  # Letters per token inside words
+    'word_cost',  # Extra tokens per word boundary
+    'punct_cost',  # Tokens per punctuation or symbol character
+    'digit_cost',  # Tokens per digit
+    'non_ascii_cost'  # Tokens per non-ASCII character
+])
+
+MODEL_PROFILES = {
+    # SentencePiece vocabulary; splits numbers into single digits
+    'gemini': ModelProfile(6.0, 0.45, 0.8, 1.0, 0.7),
+    # Byte-level BPE; groups digits in threes
+    'gpt': ModelProfile(6.0, 0.4, 0.8, 0.34, 0.9),
+    # The flat four-characters-per-token rule
+    'generic': ModelProfile(CHARS_PER_TOKEN, 1 / CHARS_PER_TOKEN, 1 / CHARS_PER_TOKEN,
+                            1 / CHARS_PER_TOKEN, 1 / CHARS_PER_TOKEN)
+}
+
+# Bytes deleted to count each character class
+_NOT_LETTERS = bytes(b for b in range(256) if not (65 <= b <= 90 or 97 <= b <= 122))
+_DIGITS = b'0123456789'
+_WHITESPACE = b' \t\n\r\x0b\x0c'
+_NON_ASCII_BYTES = bytes(range(128, 256))
+
+_config = Config()
+_profile = MODEL_PROFILES.get(_config.TOKEN_MODEL_FAMILY, MODEL_PROFILES['gemini'])
+_scale = _config.TOKEN_ESTIMATE_SCALE
+
+def _raw_estimate(text: str, profile: ModelProfile) -> float:
+    data = text.encode('utf-8')
+    ascii_chars = len(data.translate(None, _NON_ASCII_BYTES))
+    letters = len(data.translate(None, _NOT_LETTERS))
+    digits = len(data) - len(data.translate(None, _DIGITS))
+    whitespace = len(data) - len(data.translate(None, _WHITESPACE))
+    non_ascii = len(text) - ascii_chars
+    punct = ascii_chars - letters - digits - whitespace
+    # Each whitespace character approximates one word boundary
+    words = whitespace + 1
+    return (letters / profile.chars_per_token + words * profile.word_cost + punct * profile.punct_cost +
+            digits * profile.digit_cost + non_ascii * profile.non_ascii_cost)
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    return max(1, int(_raw_estimate(text, _profile) * _scale + 0.5))
+
+def set_model_family(family: str, scale: float = 1.0):
+    """Switch the profile used by estimate_tokens()."""
+    global _profile, _scale
+    if family not in MODEL_PROFILES:
+        raise ValueError(f"Unknown model family: {family}")
+    _profile = MODEL_PROFILES[family]
+    _scale = scale
+
+def calibrate(samples: Iterable[Tuple[str, int]], family: Optional[str] = None) -> float:
+    """
+    Fit the scale factor that best maps estimates onto real token counts.
+
+    Args:
+        samples: (text, actual token count) pairs
+        family: Profile to calibrate; defaults to the active one
+
+    Returns:
+        Least-squares scale factor, suitable for TOKEN_ESTIMATE_SCALE
+    """
+    profile = MODEL_PROFILES[family] if family else _profile
+    numerator = denominator = 0.0
+    for text, actual in samples:
+        estimate = _raw_estimate(text, profile)
+        numerator += estimate * actual
+        denominator += estimate * estimate
+    return numerator / denominator if denominator else 1.0
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " …") -> str:
+    """Cut text so its estimate fits max_tokens, marking the cut."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    # Cut proportionally, then shrink until it fits
+    budget = max_tokens - estimate_tokens(marker)
+    end = max(int(len(text) * budget / estimate_tokens(text)), 0)
+    while end > 0 and estimate_tokens(text[:end]) > budget:
+        end = int(end * 0.9)
+    return text[:end].rstrip() + marker if end > 0 else ""